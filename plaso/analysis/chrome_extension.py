@@ -19,6 +19,8 @@ class ChromeExtensionPlugin(interface.AnalysisPlugin):
   # Indicate that we can run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = True
 
+  EVENT_DATA_TYPES = frozenset([u'fs:stat'])
+
   _TITLE_RE = re.compile(r'<title>([^<]+)</title>')
   _WEB_STORE_URL = u'https://chrome.google.com/webstore/detail/{xid}?hl=en-US'
 
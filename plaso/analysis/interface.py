@@ -51,6 +51,10 @@ class AnalysisPlugin(object):
   # should be able to run during the extraction phase.
   ENABLE_IN_EXTRACTION = False
 
+  # The data types of the events the plugin examines, where None represents
+  # all data types. Events of other data types are not passed to the plugin.
+  EVENT_DATA_TYPES = None
+
   def __init__(self):
     """Initializes an analysis plugin."""
     super(AnalysisPlugin, self).__init__()
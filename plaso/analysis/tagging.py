@@ -13,6 +13,7 @@ from efilter import query as efilter_query
 from plaso.analysis import interface
 from plaso.analysis import manager
 from plaso.containers import reports
+from plaso.lib import py2to3
 
 
 class TaggingAnalysisPlugin(interface.AnalysisPlugin):
@@ -41,7 +42,8 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
     super(TaggingAnalysisPlugin, self).__init__()
     self._autodetect_tag_file_attempt = False
     self._number_of_event_tags = 0
-    self._tag_rules = None
+    self._tag_rules_per_data_type = {}
+    self._tag_rules_without_data_type = None
     self._tagging_file_name = None
 
   def _AttemptAutoDetectTagFile(self, analysis_mediator):
@@ -132,26 +134,22 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
           u'Unable to build query from rule: "{0:s}" with error: {1:s}'.format(
               stripped_rule, exception.message))
 
-  def _ParseTaggingFile(self, tag_file_path):
-    """Parses tag definitions from the source.
+  def _CreateTagsExpression(self, tag_rules):
+    """Creates an efilter expression that evaluates to the matching labels.
 
     Args:
-      tag_file_path (str): path to the tag file.
+      tag_rules (list[tuple[str, list[efilter.ast.Expression]]]): label names
+          and the root expressions of their rules.
 
     Returns:
       efilter.ast.Expression: efilter abstract syntax tree (AST), containing the
           tagging rules.
     """
     tags = []
-    for label_name, rules in self._ParseDefinitions(tag_file_path):
-      if not rules:
-        logging.warning(u'All rules for label "{0:s}" are invalid.'.format(
-            label_name))
-        continue
-
+    for label_name, rules in tag_rules:
       tag = efilter_ast.IfElse(
           # Union will be true if any of the 'rules' match.
-          efilter_ast.Union(*[rule.root for rule in rules]),
+          efilter_ast.Union(*rules),
           # If so then evaluate to a string with the name of the tag.
           efilter_ast.Literal(label_name),
           # Otherwise don't return anything.
@@ -161,6 +159,157 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
     # Generate a repeated value with all the tags (None will be skipped).
     return efilter_ast.Repeat(*tags)
 
+  def _GetDataTypesOfRule(self, expression):
+    """Determines the data types an efilter expression can match.
+
+    Args:
+      expression (efilter.ast.Expression): efilter expression.
+
+    Returns:
+      set[str]: data types the expression can match or None if the expression
+          does not constrain the data type.
+    """
+    if isinstance(expression, efilter_ast.Equivalence):
+      children = expression.children
+      if len(children) != 2:
+        return
+
+      for variable, literal in (children, reversed(children)):
+        if (isinstance(variable, efilter_ast.Var) and
+            variable.value == u'data_type' and
+            isinstance(literal, efilter_ast.Literal) and
+            isinstance(literal.value, py2to3.STRING_TYPES)):
+          return set([literal.value])
+
+      return
+
+    if isinstance(expression, efilter_ast.Intersection):
+      # All children must match, hence any child that constrains the data type
+      # constrains the expression.
+      data_types = None
+      for child_expression in expression.children:
+        child_data_types = self._GetDataTypesOfRule(child_expression)
+        if child_data_types is None:
+          continue
+
+        if data_types is None:
+          data_types = child_data_types
+        else:
+          data_types = data_types.intersection(child_data_types)
+
+      return data_types
+
+    if isinstance(expression, efilter_ast.Union):
+      # Any child can match, hence all children must constrain the data type
+      # to constrain the expression.
+      data_types = set()
+      for child_expression in expression.children:
+        child_data_types = self._GetDataTypesOfRule(child_expression)
+        if child_data_types is None:
+          return
+
+        data_types.update(child_data_types)
+
+      return data_types
+
+  def _IndexTagRules(self, tag_rules):
+    """Indexes tagging rules per data type.
+
+    Every rule that constrains the data type is only evaluated for events of
+    the data types it can match. Rules that do not constrain the data type
+    are evaluated for every event.
+
+    Args:
+      tag_rules (list[tuple[str, list[efilter.ast.Expression]]]): label names
+          and the root expressions of their rules.
+
+    Returns:
+      tuple: containing:
+
+        dict[str, efilter.ast.Expression]: efilter abstract syntax tree (AST),
+            containing the tagging rules per data type.
+        efilter.ast.Expression: efilter abstract syntax tree (AST), containing
+            the tagging rules that do not constrain the data type or None if
+            there are no such rules.
+    """
+    data_types = set()
+    rules_per_label = []
+    for label_name, rules in tag_rules:
+      rules_without_data_type = []
+      rules_per_data_type = {}
+      for rule in rules:
+        rule_data_types = self._GetDataTypesOfRule(rule)
+        if rule_data_types is None:
+          rules_without_data_type.append(rule)
+          continue
+
+        for data_type in rule_data_types:
+          rules_per_data_type.setdefault(data_type, []).append(rule)
+
+        data_types.update(rule_data_types)
+
+      rules_per_label.append(
+          (label_name, rules_without_data_type, rules_per_data_type))
+
+    tags_per_data_type = {}
+    for data_type in data_types:
+      data_type_tag_rules = []
+      for label_name, rules_without_data_type, rules_per_data_type in (
+          rules_per_label):
+        rules = rules_per_data_type.get(data_type, [])
+        rules = rules + rules_without_data_type
+        if rules:
+          data_type_tag_rules.append((label_name, rules))
+
+      tags_per_data_type[data_type] = self._CreateTagsExpression(
+          data_type_tag_rules)
+
+    tag_rules_without_data_type = [
+        (label_name, rules_without_data_type)
+        for label_name, rules_without_data_type, _ in rules_per_label
+        if rules_without_data_type]
+
+    tags_without_data_type = None
+    if tag_rules_without_data_type:
+      tags_without_data_type = self._CreateTagsExpression(
+          tag_rules_without_data_type)
+
+    return tags_per_data_type, tags_without_data_type
+
+  def _ParseTaggingFile(self, tag_file_path):
+    """Parses tag definitions from the source.
+
+    Args:
+      tag_file_path (str): path to the tag file.
+
+    Returns:
+      efilter.ast.Expression: efilter abstract syntax tree (AST), containing the
+          tagging rules.
+    """
+    tag_rules = self._ReadTagRules(tag_file_path)
+    return self._CreateTagsExpression(tag_rules)
+
+  def _ReadTagRules(self, tag_file_path):
+    """Reads the valid tag rules from the source.
+
+    Args:
+      tag_file_path (str): path to the tag file.
+
+    Returns:
+      list[tuple[str, list[efilter.ast.Expression]]]: label names and
+          the root expressions of their rules.
+    """
+    tag_rules = []
+    for label_name, rules in self._ParseDefinitions(tag_file_path):
+      if not rules:
+        logging.warning(u'All rules for label "{0:s}" are invalid.'.format(
+            label_name))
+        continue
+
+      tag_rules.append((label_name, [rule.root for rule in rules]))
+
+    return tag_rules
+
   def CompileReport(self, mediator):
     """Compiles an analysis report.
 
@@ -183,7 +332,7 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
           plugins and other components, such as storage and dfvfs.
       event (EventObject): event to examine.
     """
-    if self._tag_rules is None:
+    if self._tagging_file_name is None:
       if self._autodetect_tag_file_attempt:
         # There's nothing to tag with, and we've already tried to find a good
         # tag file, so there's nothing we can do with this event (or any other).
@@ -195,8 +344,14 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
             u'no events will be tagged.')
         return
 
+    tag_rules = self._tag_rules_per_data_type.get(
+        getattr(event, u'data_type', None),
+        self._tag_rules_without_data_type)
+    if tag_rules is None:
+      return
+
     try:
-      matched_labels = efilter_api.apply(self._tag_rules, vars=event)
+      matched_labels = efilter_api.apply(tag_rules, vars=event)
     except efilter_errors.EfilterTypeError as exception:
       logging.warning(u'Unable to apply efilter query with error: {0:s}'.format(
           exception))
@@ -216,7 +371,13 @@ class TaggingAnalysisPlugin(interface.AnalysisPlugin):
       tagging_file_path (str): path of the tagging file.
     """
     self._tagging_file_name = tagging_file_path
-    self._tag_rules = self._ParseTaggingFile(self._tagging_file_name)
+
+    tag_rules = self._ReadTagRules(self._tagging_file_name)
+    tag_rules_per_data_type, tag_rules_without_data_type = (
+        self._IndexTagRules(tag_rules))
+
+    self._tag_rules_per_data_type = tag_rules_per_data_type
+    self._tag_rules_without_data_type = tag_rules_without_data_type
 
 
 manager.AnalysisPluginManager.RegisterPlugin(TaggingAnalysisPlugin)
@@ -26,7 +26,7 @@ class UniqueDomainsVisitedPlugin(interface.AnalysisPlugin):
   # Indicate that we can run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = True
 
-  _DATATYPES = frozenset([
+  EVENT_DATA_TYPES = frozenset([
       u'chrome:history:file_downloaded', u'chrome:history:page_visited',
       u'firefox:places:page_visited', u'firefox:downloads:download',
       u'macosx:lsquarantine', u'msiecf:redirected', u'msiecf:url',
@@ -48,7 +48,7 @@ class UniqueDomainsVisitedPlugin(interface.AnalysisPlugin):
           analysis plugins and other components, such as storage and dfvfs.
       event (EventObject): event to examine.
     """
-    if event.data_type not in self._DATATYPES:
+    if event.data_type not in self.EVENT_DATA_TYPES:
       return
 
     url = getattr(event, u'url', None)
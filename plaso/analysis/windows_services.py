@@ -197,6 +197,8 @@ class WindowsServicesAnalysisPlugin(interface.AnalysisPlugin):
   # Indicate that we can run this plugin during regular extraction.
   ENABLE_IN_EXTRACTION = True
 
+  EVENT_DATA_TYPES = frozenset([u'windows:registry:service'])
+
   def __init__(self):
     """Initializes the Windows Services plugin."""
     super(WindowsServicesAnalysisPlugin, self).__init__()
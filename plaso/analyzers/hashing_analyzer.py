@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """The hashing analyzer implementation."""
 
+import collections
 import logging
 
 from plaso.analyzers import interface
@@ -10,6 +11,56 @@ from plaso.containers import analyzer_result
 from plaso.lib import definitions
 
 
+class HashResultsCache(object):
+  """Class that implements a cache of hash results.
+
+  The hash results are keyed by an identifier of the data stream content,
+  which allows the digests of content that was already hashed, for example
+  in another VSS store, to be reused.
+  """
+
+  _MAXIMUM_NUMBER_OF_CACHED_RESULTS = 64 * 1024
+
+  def __init__(self):
+    """Initializes a hash results cache."""
+    super(HashResultsCache, self).__init__()
+    self._results = collections.OrderedDict()
+
+  def Close(self):
+    """Closes the cache."""
+    self._results = collections.OrderedDict()
+
+  def GetResults(self, identifier):
+    """Retrieves hash results.
+
+    Args:
+      identifier (str): identifier of the data stream content.
+
+    Returns:
+      list[tuple[str, str]]: attribute names and values of the hash results
+          or None if not available.
+    """
+    results = self._results.pop(identifier, None)
+    if results is not None:
+      # Re-insert the results to mark them as the most recently used.
+      self._results[identifier] = results
+    return results
+
+  def SetResults(self, identifier, results):
+    """Sets hash results.
+
+    Args:
+      identifier (str): identifier of the data stream content.
+      results (list[tuple[str, str]]): attribute names and values of
+          the hash results.
+    """
+    self._results.pop(identifier, None)
+    self._results[identifier] = results
+
+    if len(self._results) > self._MAXIMUM_NUMBER_OF_CACHED_RESULTS:
+      self._results.popitem(last=False)
+
+
 class HashingAnalyzer(interface.BaseAnalyzer):
   """This class contains code for calculating file hashes of input files."""
 
@@ -25,6 +76,7 @@ class HashingAnalyzer(interface.BaseAnalyzer):
     super(HashingAnalyzer, self).__init__()
     self._hasher_names_string = u''
     self._hashers = []
+    self._results_cache = None
 
   def Analyze(self, data):
     """Updates the internal state of the analyzer, processing a block of data.
@@ -38,6 +90,60 @@ class HashingAnalyzer(interface.BaseAnalyzer):
     for hasher in self._hashers:
       hasher.Update(data)
 
+  def _GetCacheIdentifier(self, file_identifier):
+    """Retrieves the identifier of the hash results in the results cache.
+
+    Args:
+      file_identifier (str): identifier of the data stream content.
+
+    Returns:
+      str: identifier of the hash results, which includes the names of
+          the enabled hashers.
+    """
+    hasher_names = sorted([hasher.NAME for hasher in self._hashers])
+    return u'{0:s}:{1:s}'.format(u','.join(hasher_names), file_identifier)
+
+  def CacheResults(self, file_identifier, results):
+    """Caches the results of the analysis of a data stream.
+
+    Args:
+      file_identifier (str): identifier of the data stream content.
+      results (list[AnalyzerResult]): results.
+    """
+    if not self._results_cache:
+      return
+
+    cache_identifier = self._GetCacheIdentifier(file_identifier)
+    self._results_cache.SetResults(cache_identifier, [
+        (result.attribute_name, result.attribute_value) for result in results])
+
+  def GetCachedResults(self, file_identifier):
+    """Retrieves the cached results of the analysis of a data stream.
+
+    Args:
+      file_identifier (str): identifier of the data stream content.
+
+    Returns:
+      list[AnalyzerResult]: results or None if not available.
+    """
+    if not self._results_cache:
+      return
+
+    cache_identifier = self._GetCacheIdentifier(file_identifier)
+    cached_results = self._results_cache.GetResults(cache_identifier)
+    if cached_results is None:
+      return
+
+    results = []
+    for attribute_name, attribute_value in cached_results:
+      result = analyzer_result.AnalyzerResult()
+      result.analyzer_name = self.NAME
+      result.attribute_name = attribute_name
+      result.attribute_value = attribute_value
+      results.append(result)
+
+    return results
+
   def GetResults(self):
     """Retrieves the hashing results.
 
@@ -74,5 +180,13 @@ class HashingAnalyzer(interface.BaseAnalyzer):
     self._hashers = hashers_manager.HashersManager.GetHashers(
         hasher_names)
 
+  def SetResultsCache(self, results_cache):
+    """Sets the cache used to reuse the hash results of the same content.
+
+    Args:
+      results_cache (HashResultsCache): hash results cache.
+    """
+    self._results_cache = results_cache
+
 
 manager.AnalyzersManager.RegisterAnalyzer(HashingAnalyzer)
@@ -26,6 +26,30 @@ class BaseAnalyzer(object):
       data(bytes): block of data to process.
     """
 
+  def CacheResults(self, unused_file_identifier, unused_results):
+    """Caches the results of the analysis of a data stream.
+
+    Analyzers whose results only depend on the content of the data stream
+    can override this function, together with GetCachedResults, to prevent
+    the same content from being analyzed again.
+
+    Args:
+      file_identifier (str): identifier of the data stream content.
+      results (list[AnalyzerResult]): results.
+    """
+    return
+
+  def GetCachedResults(self, unused_file_identifier):
+    """Retrieves the cached results of the analysis of a data stream.
+
+    Args:
+      file_identifier (str): identifier of the data stream content.
+
+    Returns:
+      list[AnalyzerResult]: results or None if not available.
+    """
+    return
+
   @abc.abstractmethod
   def GetResults(self):
     """Retrieves the results of the analysis.
@@ -58,6 +58,7 @@ class ExtractionTool(status_view_tool.StatusViewTool):
     self._profiling_sample_rate = self._DEFAULT_PROFILING_SAMPLE_RATE
     self._profiling_type = u'all'
     self._queue_size = self._DEFAULT_QUEUE_SIZE
+    self._reuse_hashes = False
     self._single_process_mode = False
     self._storage_serializer_format = definitions.SERIALIZER_FORMAT_JSON
     self._temporary_directory = None
@@ -82,6 +83,8 @@ class ExtractionTool(status_view_tool.StatusViewTool):
       if self._hasher_names_string.lower() == u'list':
         self.list_hashers = True
 
+    self._reuse_hashes = getattr(options, u'reuse_hashes', False)
+
     yara_rules_path = getattr(options, u'yara_rules_path', None)
     if yara_rules_path:
       try:
@@ -224,6 +227,14 @@ class ExtractionTool(status_view_tool.StatusViewTool):
             u'enabled. "none" disables all hashers. Use "--hashers list" or '
             u'"--info" to list the available hashers.'))
 
+    argument_group.add_argument(
+        u'--reuse_hashes', u'--reuse-hashes', dest=u'reuse_hashes',
+        action=u'store_true', default=False, help=(
+            u'Reuse the hashes of file content that was already hashed during '
+            u'extraction, such as a file that is reachable via multiple paths '
+            u'within the same volume. Files are matched by volume, inode, '
+            u'size and timestamps, not by content.'))
+
     argument_group.add_argument(
         u'--yara_rules', u'--yara-rules', dest=u'yara_rules_path',
         type=str, metavar=u'PATH', action=u'store', help=(
@@ -297,6 +308,15 @@ class ExtractionTool(status_view_tool.StatusViewTool):
             u'The maximum number of queued items per worker '
             u'(defaults to {0:d})').format(self._DEFAULT_QUEUE_SIZE))
 
+    argument_group.add_argument(
+        u'--serializer_format', u'--serializer-format',
+        dest=u'serializer_format', action=u'store',
+        default=definitions.SERIALIZER_FORMAT_JSON, metavar=u'FORMAT', help=(
+            u'The serializer format used to store the attribute containers, '
+            u'such as events, in the storage file: "binary" or "json" '
+            u'(defaults to "json"). The binary format is faster to read and '
+            u'write.'))
+
   def AddProfilingOptions(self, argument_group):
     """Adds the profiling options to the argument group.
 
@@ -24,6 +24,7 @@ class ElasticSearchOutputArgumentsHelper(interface.ArgumentsHelper):
   CATEGORY = u'output'
   DESCRIPTION = u'Argument helper for the Elastic Search output module.'
 
+  _DEFAULT_BULK_REQUESTS = 2
   _DEFAULT_INDEX_NAME = uuid4().hex
   _DEFAULT_DOC_TYPE = u'plaso_event'
   _DEFAULT_FLUSH_INTERVAL = 1000
@@ -52,6 +53,10 @@ class ElasticSearchOutputArgumentsHelper(interface.ArgumentsHelper):
         u'--flush_interval', dest=u'flush_interval', type=int,
         action=u'store', default=cls._DEFAULT_FLUSH_INTERVAL, help=(
             u'Events to queue up before bulk insert to ElasticSearch.'))
+    argument_group.add_argument(
+        u'--bulk_requests', dest=u'bulk_requests', type=int,
+        action=u'store', default=cls._DEFAULT_BULK_REQUESTS, help=(
+            u'Maximum number of concurrent bulk inserts to ElasticSearch.'))
     argument_group.add_argument(
         u'--raw_fields', dest=u'raw_fields', action=u'store_true',
         default=cls._DEFAULT_RAW_FIELDS, help=(
@@ -81,6 +86,12 @@ class ElasticSearchOutputArgumentsHelper(interface.ArgumentsHelper):
         options, u'doc_type', default_value=cls._DEFAULT_DOC_TYPE)
     flush_interval = cls._ParseIntegerOption(
         options, u'flush_interval', default_value=cls._DEFAULT_FLUSH_INTERVAL)
+    bulk_requests = cls._ParseIntegerOption(
+        options, u'bulk_requests', default_value=cls._DEFAULT_BULK_REQUESTS)
+    if bulk_requests < 1:
+      raise errors.BadConfigOption(
+          u'Invalid number of bulk requests: {0:d}.'.format(bulk_requests))
+
     raw_fields = getattr(
         options, u'raw_fields', cls._DEFAULT_RAW_FIELDS)
 
@@ -88,6 +99,7 @@ class ElasticSearchOutputArgumentsHelper(interface.ArgumentsHelper):
     output_module.SetIndexName(index_name)
     output_module.SetDocType(doc_type)
     output_module.SetFlushInterval(flush_interval)
+    output_module.SetNumberOfBulkRequests(bulk_requests)
     output_module.SetRawFields(raw_fields)
 
 
@@ -29,6 +29,14 @@ class SQLite4n6TimeOutputArgumentsHelper(interface.ArgumentsHelper):
     shared_4n6time_output.Shared4n6TimeOutputArgumentsHelper.AddArguments(
         argument_group)
 
+    argument_group.add_argument(
+        u'--fast_load', u'--fast-load', dest=u'fast_load',
+        action=u'store_true', default=False, help=(
+            u'Insert the events in batches, without journal and synchronous '
+            u'writes, and create the indices after all the events have been '
+            u'inserted. Note that an interrupted load can leave the database '
+            u'corrupted.'))
+
   @classmethod
   def ParseOptions(cls, options, output_module):
     """Parses and validates options.
@@ -55,5 +63,8 @@ class SQLite4n6TimeOutputArgumentsHelper(interface.ArgumentsHelper):
 
     output_module.SetFilename(filename)
 
+    fast_load = getattr(options, u'fast_load', False)
+    output_module.SetFastLoad(fast_load)
+
 
 manager.ArgumentHelperManager.RegisterHelper(SQLite4n6TimeOutputArgumentsHelper)
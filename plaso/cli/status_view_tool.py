@@ -127,6 +127,13 @@ class StatusViewTool(storage_media_tool.StorageMediaTool):
     self._output_writer.Write(u'\n'.join(status_table))
     self._output_writer.Write(u'\n')
 
+    if processing_status.tasks_status:
+      self._PrintTasksStatus(processing_status.tasks_status)
+
+    if processing_status.number_of_skipped_duplicate_files:
+      self._output_writer.Write(u'Skipped duplicate files: {0:d}\n\n'.format(
+          processing_status.number_of_skipped_duplicate_files))
+
     if processing_status.aborted:
       self._output_writer.Write(
           u'Processing aborted - waiting for clean up.\n\n')
@@ -154,6 +161,23 @@ class StatusViewTool(storage_media_tool.StorageMediaTool):
               worker_status.status not in definitions.PROCESSING_ERROR_STATUS)
       self._output_writer.Write(status_line)
 
+  def _PrintTasksStatus(self, tasks_status):
+    """Prints the status of the tasks.
+
+    Args:
+      tasks_status (TasksStatus): status information about the tasks.
+    """
+    tasks_status_line = (
+        u'Tasks: processing: {0:d} pending merge: {1:d} merging: {2:d} '
+        u'abandoned: {3:d} total: {4:d}\n').format(
+            tasks_status.number_of_tasks_processing,
+            tasks_status.number_of_tasks_pending_merge,
+            tasks_status.number_of_tasks_merging,
+            tasks_status.number_of_abandoned_tasks,
+            tasks_status.total_number_of_tasks)
+    self._output_writer.Write(tasks_status_line)
+    self._output_writer.Write(u'\n')
+
   def _PrintAnalysisReportsDetails(self, storage):
     """Prints the details of the analysis reports.
 
@@ -15,6 +15,8 @@ class EventSource(interface.AttributeContainer):
   Attributes:
     data_type (str): attribute container type indicator.
     file_entry_type (str): dfVFS file entry type.
+    file_size (int): size of the file the event source refers to in bytes
+        or None if not known.
     path_spec (dfvfs.PathSpec): path specification.
     storage_session (int): storage session number or 0 if not set.
   """
@@ -30,6 +32,7 @@ class EventSource(interface.AttributeContainer):
     super(EventSource, self).__init__()
     self.data_type = self.DATA_TYPE
     self.file_entry_type = None
+    self.file_size = None
     self.path_spec = path_spec
     self.storage_session = 0
 
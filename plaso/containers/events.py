@@ -56,9 +56,33 @@ class EventObject(interface.AttributeContainer):
       u'timestamp',
       u'uuid'])
 
+  # The attributes every event defines are stored in slots instead of in
+  # the instance dictionary, which only holds the attributes that are specific
+  # to the event data type. Since millions of events can be kept in memory,
+  # for example while sorting, this considerably reduces the memory overhead
+  # per event.
+  _SLOT_ATTRIBUTE_NAMES = (
+      u'data_type',
+      u'display_name',
+      u'filename',
+      u'hostname',
+      u'inode',
+      u'offset',
+      u'pathspec',
+      u'store_index',
+      u'store_number',
+      u'tag',
+      u'timestamp')
+
+  # The instance dictionary holds the attributes that are specific to the
+  # event data type and is only allocated once such an attribute is set.
+  __slots__ = _SLOT_ATTRIBUTE_NAMES + (u'_uuid', u'__dict__')
+
   def __init__(self):
     """Initializes an event object."""
     super(EventObject, self).__init__()
+    self._uuid = None
+
     self.data_type = self.DATA_TYPE
     self.display_name = None
     self.filename = None
@@ -70,7 +94,53 @@ class EventObject(interface.AttributeContainer):
     self.store_number = None
     self.tag = None
     self.timestamp = None
-    self.uuid = u'{0:s}'.format(uuid.uuid4().get_hex())
+
+  @property
+  def uuid(self):
+    """str: unique identifier (UUID).
+
+    The UUID is generated the first time it is accessed, since the majority
+    of the events is either serialized or read from storage, where the UUID
+    is overwritten, before it is used.
+    """
+    if self._uuid is None:
+      self._uuid = u'{0:s}'.format(uuid.uuid4().get_hex())
+    return self._uuid
+
+  @uuid.setter
+  def uuid(self, value):
+    """Sets the unique identifier (UUID).
+
+    Args:
+      value (str): unique identifier (UUID).
+    """
+    self._uuid = value
+
+  def __getstate__(self):
+    """Retrieves the state of the event object for pickling.
+
+    The UUID is generated, if not already, so that the unpickled event object
+    has the same UUID.
+
+    Returns:
+      dict[str, object]: attribute values, indexed by name.
+    """
+    state = dict(self.__dict__)
+    for attribute_name in self._SLOT_ATTRIBUTE_NAMES:
+      if attribute_name not in state:
+        state[attribute_name] = getattr(self, attribute_name, None)
+
+    state[u'_uuid'] = self.uuid
+    return state
+
+  def __setstate__(self, state):
+    """Sets the state of the event object when unpickling.
+
+    Args:
+      state (dict[str, object]): attribute values, indexed by name.
+    """
+    for attribute_name, attribute_value in iter(state.items()):
+      setattr(self, attribute_name, attribute_value)
 
   def __eq__(self, event_object):
     """Return a boolean indicating if two event objects are considered equal.
@@ -109,8 +179,8 @@ class EventObject(interface.AttributeContainer):
         self.data_type != event_object.data_type):
       return False
 
-    attribute_names = set(self.__dict__.keys())
-    if attribute_names != set(event_object.__dict__.keys()):
+    attribute_names = set(self._GetAttributeNames())
+    if attribute_names != set(event_object._GetAttributeNames()):
       return False
 
     # Here we have to deal with "near" duplicates, so not all attributes
@@ -150,7 +220,7 @@ class EventObject(interface.AttributeContainer):
       str: string representation of the event object that can be used for
           equality comparison.
     """
-    attribute_names = set(self.__dict__.keys())
+    attribute_names = set(self._GetAttributeNames())
     fields = sorted(list(attribute_names.difference(self.COMPARE_EXCLUDE)))
 
     # TODO: Review this (after 1.1.0 release). Is there a better/more clean
@@ -196,6 +266,24 @@ class EventObject(interface.AttributeContainer):
       # with another event.
       return self.uuid
 
+  def _GetAttributeNames(self):
+    """Retrieves the names of the attributes stored in the event object.
+
+    Returns:
+      list[str]: attribute names, including those of attributes that are
+          set to None.
+    """
+    attribute_names = list(self._SLOT_ATTRIBUTE_NAMES)
+    attribute_names.append(u'uuid')
+
+    # A subclass can define one of the slot attributes as a class attribute,
+    # in which case the value is stored in the instance dictionary.
+    for attribute_name in iter(self.__dict__.keys()):
+      if attribute_name not in attribute_names:
+        attribute_names.append(attribute_name)
+
+    return attribute_names
+
   def GetAttributeNames(self):
     """Retrieves the attribute names from the event object.
 
@@ -205,7 +293,7 @@ class EventObject(interface.AttributeContainer):
       list[str]: attribute names.
     """
     attribute_names = []
-    for attribute_name in iter(self.__dict__.keys()):
+    for attribute_name in self._GetAttributeNames():
       attribute_value = getattr(self, attribute_name, None)
       if attribute_value is not None:
         attribute_names.append(attribute_name)
@@ -16,6 +16,21 @@ class AttributeContainer(object):
   """
   CONTAINER_TYPE = None
 
+  # The attribute container does not define slots itself, so that subclasses
+  # that define slots, such as the event object, only have an instance
+  # dictionary if they ask for one. Subclasses without slots still have
+  # an instance dictionary.
+  __slots__ = ()
+
+  def _GetAttributeNames(self):
+    """Retrieves the names of the attributes stored in the container.
+
+    Returns:
+      list[str]: attribute names, including those of attributes that are
+          set to None.
+    """
+    return list(self.__dict__.keys())
+
   def CopyToDict(self):
     """Copies the attribute container to a dictionary.
 
@@ -23,7 +38,7 @@ class AttributeContainer(object):
       A dictionary containing the attribute container attributes.
     """
     dictionary = {}
-    for attribute_name in iter(self.__dict__.keys()):
+    for attribute_name in self._GetAttributeNames():
       attribute_value = getattr(self, attribute_name, None)
       if attribute_value is not None:
         dictionary[attribute_name] = attribute_value
@@ -38,7 +53,7 @@ class AttributeContainer(object):
     Yields:
       A tuple containing an attribute name and value.
     """
-    for attribute_name in iter(self.__dict__.keys()):
+    for attribute_name in self._GetAttributeNames():
       attribute_value = getattr(self, attribute_name, None)
       if attribute_value is not None:
         yield attribute_name, attribute_value
@@ -26,6 +26,9 @@ class Task(interface.AttributeContainer):
     merge_priority (int): priority used for the task storage file merge, where
         a lower value indicates a higher priority to merge.
     path_spec (dfvfs.PathSpec): path specification.
+    path_specs (list[dfvfs.PathSpec]): path specifications of a batch of
+        file entries that are processed by the task, where None represents
+        a task that only processes path_spec.
     session_identifier (str): the identifier of the session the task
         is part of.
     start_time (int): time that the task was started. Contains the number
@@ -49,6 +52,7 @@ class Task(interface.AttributeContainer):
     self.last_processing_time = None
     self.merge_priority = None
     self.path_spec = None
+    self.path_specs = None
     self.session_identifier = session_identifier
     self.start_time = int(time.time() * 1000000)
     self.storage_file_size = None
@@ -80,6 +84,20 @@ class Task(interface.AttributeContainer):
     task_start.timestamp = self.start_time
     return task_start
 
+  def GetPathSpecs(self):
+    """Retrieves the path specifications processed by the task.
+
+    Returns:
+      list[dfvfs.PathSpec]: path specifications.
+    """
+    if self.path_specs:
+      return list(self.path_specs)
+
+    if self.path_spec:
+      return [self.path_spec]
+
+    return []
+
   def UpdateProcessingTime(self):
     """Updates the processing time to now."""
     self.last_processing_time = int(time.time() * 1000000)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""The data stream block cache."""
+
+import collections
+import os
+
+
+class BlockCache(object):
+  """Class that implements a least recently used (LRU) block cache.
+
+  Attributes:
+    number_of_hits (int): number of block lookups that were served from
+        the cache.
+    number_of_misses (int): number of block lookups that were not served
+        from the cache.
+  """
+
+  _BLOCK_SIZE = 64 * 1024
+
+  _MAXIMUM_SIZE = 32 * 1024 * 1024
+
+  def __init__(self, block_size=None, maximum_size=None):
+    """Initializes a block cache.
+
+    Args:
+      block_size (Optional[int]): size of a block in bytes.
+      maximum_size (Optional[int]): maximum number of bytes of data kept
+          in the cache.
+    """
+    super(BlockCache, self).__init__()
+    self._blocks = collections.OrderedDict()
+    self._size = 0
+
+    self.block_size = block_size or self._BLOCK_SIZE
+    self.maximum_size = maximum_size or self._MAXIMUM_SIZE
+    self.number_of_hits = 0
+    self.number_of_misses = 0
+
+  def Empty(self):
+    """Removes all blocks from the cache."""
+    self._blocks = collections.OrderedDict()
+    self._size = 0
+
+  def GetBlock(self, block_index):
+    """Retrieves a block from the cache.
+
+    Args:
+      block_index (int): index of the block.
+
+    Returns:
+      bytes: data of the block or None if the block is not cached.
+    """
+    data = self._blocks.pop(block_index, None)
+    if data is None:
+      self.number_of_misses += 1
+      return
+
+    # Re-insert the block to mark it as the most recently used.
+    self._blocks[block_index] = data
+    self.number_of_hits += 1
+    return data
+
+  def SetBlock(self, block_index, data):
+    """Stores a block in the cache.
+
+    The least recently used blocks are removed from the cache when the size
+    of the cached data exceeds the maximum size.
+
+    Args:
+      block_index (int): index of the block.
+      data (bytes): data of the block.
+    """
+    existing_data = self._blocks.pop(block_index, None)
+    if existing_data is not None:
+      self._size -= len(existing_data)
+
+    self._blocks[block_index] = data
+    self._size += len(data)
+
+    while self._size > self.maximum_size and self._blocks:
+      _, evicted_data = self._blocks.popitem(last=False)
+      self._size -= len(evicted_data)
+
+
+class BlockCachedFileObject(object):
+  """Class that implements a file-like object that reads through a block cache.
+
+  The file-like object allows the analyzers, the signature scanner and
+  the parsers to share the data of a data stream that was already read,
+  instead of reading, and for compressed storage media images decompressing,
+  the same data multiple times.
+
+  Attributes:
+    block_cache (BlockCache): block cache.
+  """
+
+  def __init__(self, file_object, block_cache=None):
+    """Initializes a block cached file-like object.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object to read from.
+      block_cache (Optional[BlockCache]): block cache, where None represents
+          a block cache with the default block size and maximum size.
+    """
+    super(BlockCachedFileObject, self).__init__()
+    self._current_offset = 0
+    self._file_object = file_object
+    self._size = file_object.get_size()
+
+    self.block_cache = block_cache or BlockCache()
+
+  def _ReadBlock(self, block_index):
+    """Reads a block.
+
+    Args:
+      block_index (int): index of the block.
+
+    Returns:
+      bytes: data of the block.
+    """
+    data = self.block_cache.GetBlock(block_index)
+    if data is None:
+      self._file_object.seek(
+          block_index * self.block_cache.block_size, os.SEEK_SET)
+      data = self._file_object.read(self.block_cache.block_size)
+      self.block_cache.SetBlock(block_index, data)
+
+    return data
+
+  # Note: that the following functions do not follow the style guide
+  # because they are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Closes the file-like object."""
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+    self.block_cache.Empty()
+
+  def get_offset(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: current offset.
+    """
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the file-like object.
+
+    Returns:
+      int: size of the data stream.
+    """
+    return self._size
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object at the current offset.
+
+    Reads that are larger than the maximum size of the block cache bypass
+    the cache, so that they do not evict the blocks that are likely to be
+    read again, such as the file header.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None represents
+          all remaining bytes.
+
+    Returns:
+      bytes: data read.
+
+    Raises:
+      IOError: if the file-like object is closed or the read failed.
+    """
+    if not self._file_object:
+      raise IOError(u'File-like object not open.')
+
+    if size is None or size < 0:
+      size = self._size - self._current_offset
+
+    size = min(size, self._size - self._current_offset)
+    if size <= 0:
+      return b''
+
+    if size > self.block_cache.maximum_size:
+      self._file_object.seek(self._current_offset, os.SEEK_SET)
+      data = self._file_object.read(size)
+      self._current_offset += len(data)
+      return data
+
+    block_size = self.block_cache.block_size
+    end_offset = self._current_offset + size
+
+    data_segments = []
+    offset = self._current_offset
+    while offset < end_offset:
+      block_index, block_offset = divmod(offset, block_size)
+      block_data = self._ReadBlock(block_index)
+
+      data_segment = block_data[block_offset:block_offset + end_offset - offset]
+      if not data_segment:
+        break
+
+      data_segments.append(data_segment)
+      offset += len(data_segment)
+
+    data = b''.join(data_segments)
+    self._current_offset += len(data)
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks an offset within the file-like object.
+
+    Args:
+      offset (int): offset to seek.
+      whence (Optional[int]): value that indicates whether offset is an
+          absolute or relative position within the file.
+
+    Raises:
+      IOError: if the seek failed.
+    """
+    if not self._file_object:
+      raise IOError(u'File-like object not open.')
+
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._size
+    elif whence != os.SEEK_SET:
+      raise IOError(u'Unsupported whence.')
+
+    if offset < 0:
+      raise IOError(u'Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def tell(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: current offset.
+    """
+    return self._current_offset
@@ -7,6 +7,8 @@ An extractor is a class used to extract information from "raw" data.
 import copy
 import hashlib
 import logging
+import os
+import sqlite3
 
 import pysigscan
 
@@ -26,6 +28,10 @@ class EventExtractor(object):
   An event extractor extracts events from event sources.
   """
 
+  # Number of bytes of the file header that are used to determine which
+  # parsers without format specification can plausibly parse a data stream.
+  _FILE_HEADER_SIZE = 4096
+
   def __init__(self, resolver_context, parser_filter_expression=None):
     """Initializes an event extractor object.
 
@@ -73,6 +79,38 @@ class EventExtractor(object):
 
     return False
 
+  def _GetFileHeaderMatchParserNames(self, file_object, parser_names):
+    """Determines the parsers that can plausibly parse the file header.
+
+    The file header is read once and checked by every parser, which is
+    significantly cheaper than having every parser open and verify
+    the file-like object.
+
+    Args:
+      file_object (file): file-like object.
+      parser_names (list[str]): names of parsers.
+
+    Returns:
+      list[str]: names of the parsers that can plausibly parse the file-like
+          object.
+    """
+    file_object.seek(0, os.SEEK_SET)
+    file_header = file_object.read(self._FILE_HEADER_SIZE)
+    file_object.seek(0, os.SEEK_SET)
+
+    is_complete = len(file_header) < self._FILE_HEADER_SIZE
+
+    matching_parser_names = []
+    for parser_name in parser_names:
+      parser = self._parsers.get(parser_name, None)
+      if (isinstance(parser, parsers_interface.FileObjectParser) and
+          not parser.MatchesFileHeader(file_header, is_complete)):
+        continue
+
+      matching_parser_names.append(parser_name)
+
+    return matching_parser_names
+
   def _GetSignatureMatchParserNames(self, file_object):
     """Determines if a file-like object matches one of the known signatures.
 
@@ -253,21 +291,30 @@ class EventExtractor(object):
       self._ParseFileEntryWithParser(
           parser_mediator, parser, file_entry, file_object=file_object)
 
-  def ParseDataStream(self, parser_mediator, file_entry, data_stream_name):
+  def ParseDataStream(
+      self, parser_mediator, file_entry, data_stream_name, file_object=None):
     """Parses a data stream of a file entry with the enabled parsers.
 
     Args:
       parser_mediator (ParserMediator): parser mediator.
       file_entry (dfvfs.FileEntry): file entry.
       data_stream_name (str): data stream name.
+      file_object (Optional[file]): file-like object of the data stream.
+          If not set the data stream is opened, and closed afterwards,
+          by this function.
 
     Raises:
       RuntimeError: if the file-like object or the parser object is missing.
     """
-    file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
-    if not file_object:
-      raise RuntimeError(
-          u'Unable to retrieve file-like object from file entry.')
+    close_file_object = file_object is None
+    if close_file_object:
+      file_object = file_entry.GetFileObject(
+          data_stream_name=data_stream_name)
+      if not file_object:
+        raise RuntimeError(
+            u'Unable to retrieve file-like object from file entry.')
+    else:
+      file_object.seek(0, os.SEEK_SET)
 
     try:
       parser_names = self._GetSignatureMatchParserNames(file_object)
@@ -278,12 +325,15 @@ class EventExtractor(object):
             parser_mediator, parser_names, file_entry, file_object=file_object)
 
       if not result:
+        parser_names = self._GetFileHeaderMatchParserNames(
+            file_object, self._non_sigscan_parser_names)
         self._ParserFileEntryWithParsers(
-            parser_mediator, self._non_sigscan_parser_names, file_entry,
+            parser_mediator, parser_names, file_entry,
             file_object=file_object)
 
     finally:
-      file_object.close()
+      if close_file_object:
+        file_object.close()
 
   def ParseFileEntryMetadata(self, parser_mediator, file_entry):
     """Parses the file entry metadata e.g. file system data.
@@ -335,6 +385,97 @@ class EventExtractor(object):
     self._parsers_profiler = parsers_profiler
 
 
+class _DuplicateFileIndex(object):
+  """Class that implements an index of file identifiers of extracted files.
+
+  A file identifier consists of an inode and a 63-bit hash value calculated
+  from the timestamps of the file entry. The file identifiers are kept in
+  memory as single integers. Once the maximum number of file identifiers
+  kept in memory is reached, they are moved to a temporary on-disk SQLite
+  database, which is removed when the index is closed.
+  """
+
+  _MAXIMUM_NUMBER_OF_CACHED_IDENTIFIERS = 1024 * 1024
+
+  _CREATE_TABLE_QUERY = (
+      u'CREATE TABLE file_identifiers (inode INTEGER, hash_value INTEGER, '
+      u'PRIMARY KEY (inode, hash_value))')
+
+  _INSERT_QUERY = (
+      u'INSERT OR IGNORE INTO file_identifiers (inode, hash_value) '
+      u'VALUES (?, ?)')
+
+  _SELECT_QUERY = (
+      u'SELECT 1 FROM file_identifiers WHERE inode = ? AND hash_value = ?')
+
+  def __init__(self, maximum_number_of_cached_identifiers=None):
+    """Initializes a duplicate file index.
+
+    Args:
+      maximum_number_of_cached_identifiers (Optional[int]): maximum number
+          of file identifiers kept in memory.
+    """
+    super(_DuplicateFileIndex, self).__init__()
+    self._connection = None
+    self._identifiers = set()
+    self._maximum_number_of_cached_identifiers = (
+        maximum_number_of_cached_identifiers or
+        self._MAXIMUM_NUMBER_OF_CACHED_IDENTIFIERS)
+    self.number_of_identifiers = 0
+
+  def _FlushIdentifiers(self):
+    """Moves the file identifiers kept in memory to the on-disk database."""
+    if not self._connection:
+      # An empty filename creates a private temporary on-disk database.
+      self._connection = sqlite3.connect(u'')
+      self._connection.execute(self._CREATE_TABLE_QUERY)
+
+    self._connection.executemany(self._INSERT_QUERY, (
+        (identifier >> 64, identifier & 0xffffffffffffffff)
+        for identifier in self._identifiers))
+    self._connection.commit()
+
+    self._identifiers = set()
+
+  def AddFileIdentifier(self, inode, hash_value):
+    """Adds a file identifier to the index.
+
+    Args:
+      inode (int): inode of the file entry.
+      hash_value (int): 63-bit hash value calculated from the timestamps of
+          the file entry.
+
+    Returns:
+      bool: True if the file identifier was added, False if it already was
+          in the index.
+    """
+    identifier = (inode << 64) | hash_value
+    if identifier in self._identifiers:
+      return False
+
+    if self._connection:
+      cursor = self._connection.execute(
+          self._SELECT_QUERY, (inode, hash_value))
+      if cursor.fetchone():
+        return False
+
+    self._identifiers.add(identifier)
+    self.number_of_identifiers += 1
+
+    if len(self._identifiers) >= self._maximum_number_of_cached_identifiers:
+      self._FlushIdentifiers()
+
+    return True
+
+  def Close(self):
+    """Closes the index and removes the on-disk database if any."""
+    if self._connection:
+      self._connection.close()
+      self._connection = None
+
+    self._identifiers = set()
+
+
 class PathSpecExtractor(object):
   """Class that implements a path specification extractor object.
 
@@ -358,8 +499,9 @@ class PathSpecExtractor(object):
     """
     super(PathSpecExtractor, self).__init__()
     self._duplicate_file_check = duplicate_file_check
-    self._hashlist = {}
+    self._duplicate_file_index = None
     self._resolver_context = resolver_context
+    self.number_of_skipped_duplicate_files = 0
 
   def _CalculateNTFSTimeHash(self, file_entry):
     """Returns a hash value calculated from a NTFS file entry.
@@ -368,36 +510,71 @@ class PathSpecExtractor(object):
       file_entry (dfvfs.FileEntry): file entry.
 
     Returns:
-      str: hash value of the file entry.
+      int: 63-bit hash value of the file entry.
     """
     stat_object = file_entry.GetStat()
     ret_hash = hashlib.md5()
 
-    atime = getattr(stat_object, u'atime', None)
-    if not atime:
-      atime = 0
-    ret_hash.update(b'atime:{0:d}.{1:d}'.format(
-        atime, getattr(stat_object, u'atime_nano', 0)))
+    for attribute_name in (u'atime', u'crtime', u'mtime', u'ctime'):
+      timestamp = getattr(stat_object, attribute_name, None) or 0
+      timestamp_nano = getattr(
+          stat_object, u'{0:s}_nano'.format(attribute_name), None) or 0
+
+      # The dfVFS OS file system stores the times as floating point values
+      # without a separate fraction of a second.
+      if isinstance(timestamp, float):
+        timestamp, fraction = divmod(timestamp, 1)
+        timestamp_nano = int(fraction * 10000000)
+
+      ret_hash.update(u'{0:s}:{1:d}.{2:d}'.format(
+          attribute_name, int(timestamp), int(timestamp_nano)).encode(u'ascii'))
 
-    crtime = getattr(stat_object, u'crtime', None)
-    if not crtime:
-      crtime = 0
-    ret_hash.update(b'crtime:{0:d}.{1:d}'.format(
-        crtime, getattr(stat_object, u'crtime_nano', 0)))
+    # Use the first 63 bits of the MD5 so the hash value can be stored as
+    # a signed 64-bit SQLite integer.
+    return int(ret_hash.hexdigest()[:16], 16) >> 1
 
-    mtime = getattr(stat_object, u'mtime', None)
-    if not mtime:
-      mtime = 0
-    ret_hash.update(b'mtime:{0:d}.{1:d}'.format(
-        mtime, getattr(stat_object, u'mtime_nano', 0)))
+  def _GetFileIdentifier(self, file_entry):
+    """Retrieves an identifier used to detect duplicate files.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry.
+
+    Returns:
+      tuple[int, int]: inode and hash value calculated from the timestamps
+          of the file entry.
+    """
+    inode = getattr(file_entry.path_spec, u'inode', None)
+    if inode is None:
+      stat_object = file_entry.GetStat()
+      inode = getattr(stat_object, u'ino', None)
 
-    ctime = getattr(stat_object, u'ctime', None)
-    if not ctime:
-      ctime = 0
-    ret_hash.update(b'ctime:{0:d}.{1:d}'.format(
-        ctime, getattr(stat_object, u'ctime_nano', 0)))
+    if inode is None:
+      # Use a 63-bit hash of the location for file systems without inodes.
+      location = getattr(file_entry.path_spec, u'location', None) or u''
+      location_hash = hashlib.md5(location.encode(u'utf-8'))
+      inode = int(location_hash.hexdigest()[:16], 16) >> 1
 
-    return ret_hash.hexdigest()
+    return inode, self._CalculateNTFSTimeHash(file_entry)
+
+  def _IsDuplicateFile(self, file_identifier):
+    """Determines if a file was already extracted and otherwise records it.
+
+    Args:
+      file_identifier (tuple[int, int]): inode and hash value calculated from
+          the timestamps of the file entry.
+
+    Returns:
+      bool: True if the file was already extracted.
+    """
+    if not self._duplicate_file_index:
+      self._duplicate_file_index = _DuplicateFileIndex()
+
+    inode, hash_value = file_identifier
+    if self._duplicate_file_index.AddFileIdentifier(inode, hash_value):
+      return False
+
+    self.number_of_skipped_duplicate_files += 1
+    return True
 
   def _ExtractPathSpecs(
       self, path_spec, find_specs=None, recurse_file_system=True):
@@ -487,14 +664,9 @@ class PathSpecExtractor(object):
         # calculated hash values, and only include the file into the queue if
         # the hash does not match.
         if self._duplicate_file_check:
-          hash_value = self._CalculateNTFSTimeHash(sub_file_entry)
-
-          inode = getattr(sub_file_entry.path_spec, u'inode', 0)
-          if inode in self._hashlist:
-            if hash_value in self._hashlist[inode]:
-              continue
-
-          self._hashlist.setdefault(inode, []).append(hash_value)
+          file_identifier = self._GetFileIdentifier(sub_file_entry)
+          if self._IsDuplicateFile(file_identifier):
+            continue
 
       for path_spec in self._ExtractPathSpecsFromFile(sub_file_entry):
         yield path_spec
@@ -597,8 +769,19 @@ class PathSpecExtractor(object):
     Yields:
       dfvfs.PathSpec: path specification of a file entry found in the source.
     """
-    for path_spec in path_specs:
-      for extracted_path_spec in self._ExtractPathSpecs(
-          path_spec, find_specs=find_specs,
-          recurse_file_system=recurse_file_system):
-        yield extracted_path_spec
+    try:
+      for path_spec in path_specs:
+        for extracted_path_spec in self._ExtractPathSpecs(
+            path_spec, find_specs=find_specs,
+            recurse_file_system=recurse_file_system):
+          yield extracted_path_spec
+
+    finally:
+      if self._duplicate_file_index:
+        self._duplicate_file_index.Close()
+        self._duplicate_file_index = None
+
+    if self._duplicate_file_check:
+      logging.info(u'Skipped {0:d} duplicate files.'.format(
+          self.number_of_skipped_duplicate_files))
+
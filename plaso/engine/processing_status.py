@@ -302,6 +302,29 @@ class ProcessStatus(object):
     return consumed_sources_delta > 0 or produced_sources_delta > 0
 
 
+class TasksStatus(object):
+  """The status of the tasks.
+
+  Attributes:
+    number_of_abandoned_tasks (int): number of abandoned tasks.
+    number_of_tasks_merging (int): number of tasks that are being merged.
+    number_of_tasks_pending_merge (int): number of tasks that are pending
+        merge, which is the merge backlog.
+    number_of_tasks_processing (int): number of tasks that are being
+        processed by workers.
+    total_number_of_tasks (int): total number of active tasks.
+  """
+
+  def __init__(self):
+    """Initializes the tasks status object."""
+    super(TasksStatus, self).__init__()
+    self.number_of_abandoned_tasks = 0
+    self.number_of_tasks_merging = 0
+    self.number_of_tasks_pending_merge = 0
+    self.number_of_tasks_processing = 0
+    self.total_number_of_tasks = 0
+
+
 class ProcessingStatus(object):
   """The status of the overall extraction process (processing).
 
@@ -310,6 +333,9 @@ class ProcessingStatus(object):
     error_path_specs (list[str]): path specification strings that caused
         critical errors during processing.
     foreman_status (ProcessingStatus): foreman processing status.
+    number_of_skipped_duplicate_files (int): number of files that were
+        skipped as duplicates, for example of a file in another VSS store.
+    tasks_status (TasksStatus): status information about the tasks.
   """
 
   def __init__(self):
@@ -320,6 +346,8 @@ class ProcessingStatus(object):
     self.aborted = False
     self.error_path_specs = []
     self.foreman_status = None
+    self.number_of_skipped_duplicate_files = 0
+    self.tasks_status = None
 
   @property
   def workers_status(self):
@@ -482,3 +510,11 @@ class ProcessingStatus(object):
         number_of_consumed_event_tags, number_of_produced_event_tags,
         number_of_consumed_errors, number_of_produced_errors,
         number_of_consumed_reports, number_of_produced_reports)
+
+  def UpdateTasksStatus(self, tasks_status):
+    """Updates the tasks status.
+
+    Args:
+      tasks_status (TasksStatus): status information about the tasks.
+    """
+    self.tasks_status = tasks_status
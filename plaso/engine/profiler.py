@@ -228,8 +228,58 @@ class ProcessingProfiler(CPUTimeProfiler):
 
   _FILENAME_PREFIX = u'processing'
 
+  def __init__(self, identifier, path=None):
+    """Initializes the processing profiler object.
+
+    Args:
+      identifier (str): identifier of the profiling session used to create
+          the sample filename.
+      path (Optional[str]): path to write the sample file.
+    """
+    super(ProcessingProfiler, self).__init__(identifier, path=path)
+    self._counters = {}
+    self._counters_file = u'{0:s}_counters-{1!s}.csv'.format(
+        self._FILENAME_PREFIX, identifier)
+
+    if path:
+      self._counters_file = os.path.join(path, self._counters_file)
+
+  def IncrementCounter(self, counter_name, value=1):
+    """Increments a counter.
+
+    Args:
+      counter_name (str): name of the counter.
+      value (Optional[int]): value to increment the counter with.
+    """
+    self._counters[counter_name] = self._counters.get(counter_name, 0) + value
+
+  def Write(self):
+    """Writes the CPU time measurements and counters to sample files."""
+    super(ProcessingProfiler, self).Write()
+
+    if not self._counters:
+      return
+
+    try:
+      os.remove(self._counters_file)
+    except OSError:
+      pass
+
+    with open(self._counters_file, 'wb') as file_object:
+      line = u'counter name\tvalue\n'
+      file_object.write(line.encode(u'utf-8'))
+
+      for name, value in sorted(self._counters.items()):
+        line = u'{0:s}\t{1:d}\n'.format(name, value)
+        file_object.write(line.encode(u'utf-8'))
+
 
 class SerializersProfiler(CPUTimeProfiler):
-  """The serializers profiler."""
+  """The serializers profiler.
+
+  The profile names consist of the serialization format and the attribute
+  container type, such as "json:event", so that the CPU time of different
+  serialization formats can be compared side-by-side.
+  """
 
   _FILENAME_PREFIX = u'serializers'
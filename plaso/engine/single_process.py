@@ -144,6 +144,9 @@ class SingleProcessEngine(engine.BaseEngine):
       event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
       storage_writer.AddEventSource(event_source)
 
+      self._processing_status.number_of_skipped_duplicate_files = (
+          path_spec_extractor.number_of_skipped_duplicate_files)
+
       self._UpdateStatus(
           definitions.PROCESSING_STATUS_COLLECTING, display_name,
           number_of_consumed_sources, storage_writer)
@@ -297,8 +300,8 @@ class SingleProcessEngine(engine.BaseEngine):
       filter_find_specs=None, filter_object=None, hasher_names_string=None,
       mount_path=None, parser_filter_expression=None, preferred_year=None,
       process_archives=False, process_compressed_streams=True,
-      status_update_callback=None, temporary_directory=None,
-      text_prepend=None, yara_rules_string=None):
+      reuse_hashes=False, status_update_callback=None,
+      temporary_directory=None, text_prepend=None, yara_rules_string=None):
     """Processes the sources.
 
     Args:
@@ -318,6 +321,8 @@ class SingleProcessEngine(engine.BaseEngine):
           scanned for file entries.
       process_compressed_streams (Optional[bool]): True if file content in
           compressed streams should be processed.
+      reuse_hashes (Optional[bool]): True if the hashes of file content
+          that was already hashed should be reused.
       status_update_callback (Optional[function]): callback function for status
           updates.
       temporary_directory (Optional[str]): path of the directory for temporary
@@ -347,7 +352,8 @@ class SingleProcessEngine(engine.BaseEngine):
         process_compressed_streams=process_compressed_streams)
 
     if hasher_names_string:
-      extraction_worker.SetHashers(hasher_names_string)
+      extraction_worker.SetHashers(
+          hasher_names_string, reuse_hashes=reuse_hashes)
 
     if yara_rules_string:
       extraction_worker.SetYaraRules(yara_rules_string)
@@ -381,6 +387,8 @@ class SingleProcessEngine(engine.BaseEngine):
 
       self._StopProfiling(extraction_worker)
 
+      extraction_worker.Close()
+
     if self._abort:
       logging.debug(u'Processing aborted.')
       self._processing_status.aborted = True
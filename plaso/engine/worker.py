@@ -7,14 +7,18 @@ import os
 import re
 import time
 
+import construct
+
 from dfvfs.analyzer import analyzer
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.lib import errors as dfvfs_errors
 from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import resolver as path_spec_resolver
 
+from plaso.analyzers import hashing_analyzer
 from plaso.analyzers import manager as analyzers_manager
 from plaso.containers import event_sources
+from plaso.engine import block_cache
 from plaso.engine import extractors
 from plaso.lib import definitions
 from plaso.lib import errors
@@ -75,6 +79,25 @@ class EventExtractionWorker(object):
   _TYPES_WITH_ROOT_METADATA = frozenset([
       dfvfs_definitions.TYPE_INDICATOR_GZIP])
 
+  # Maximum number of bytes of data of a data stream that is kept in
+  # the block cache shared by the analyzers, signature scanner and parsers.
+  _MAXIMUM_BLOCK_CACHE_SIZE = 32 * 1024 * 1024
+
+  # Number of bytes of a data stream that are passed at once to incremental
+  # analyzers, such as the hashing analyzer.
+  _INCREMENTAL_ANALYZER_READ_SIZE = 1024 * 1024
+
+  # The start of the NTFS boot sector up to and including the volume serial
+  # number.
+  _NTFS_BOOT_SECTOR = construct.Struct(
+      u'ntfs_boot_sector',
+      construct.Bytes(u'boot_entry_point', 3),
+      construct.Bytes(u'file_system_signature', 8),
+      construct.Padding(61),
+      construct.ULInt64(u'volume_serial_number'))
+
+  _NTFS_FILE_SYSTEM_SIGNATURE = b'NTFS    '
+
   def __init__(
       self, resolver_context, parser_filter_expression=None,
       process_archives=False, process_compressed_streams=True):
@@ -104,16 +127,19 @@ class EventExtractionWorker(object):
     self._analyzers = []
     self._event_extractor = extractors.EventExtractor(
         resolver_context, parser_filter_expression=parser_filter_expression)
+    self._hash_results_cache = None
     self._hasher_names = None
     self._process_archives = process_archives
     self._process_compressed_streams = process_compressed_streams
     self._processing_profiler = None
     self._resolver_context = resolver_context
+    self._volume_serial_numbers = {}
 
     self.last_activity_timestamp = 0.0
     self.processing_status = definitions.PROCESSING_STATUS_IDLE
 
-  def _AnalyzeDataStream(self, mediator, file_entry, data_stream_name):
+  def _AnalyzeDataStream(
+      self, mediator, file_entry, data_stream_name, file_object=None):
     """Analyzes the contents of a specific data stream of a file entry.
 
     The results of the analyzers are set in the parser mediator as attributes
@@ -126,6 +152,9 @@ class EventExtractionWorker(object):
       file_entry (dfvfs.FileEntry): file entry whose data stream is to be
           analyzed.
       data_stream_name (str): name of the data stream.
+      file_object (Optional[file]): file-like object of the data stream.
+          If not set the data stream is opened, and closed afterwards,
+          by this function.
 
     Raises:
       RuntimeError: if the file-like object cannot be retrieved from
@@ -141,17 +170,28 @@ class EventExtractionWorker(object):
     if self._processing_profiler:
       self._processing_profiler.StartTiming(u'analyzing')
 
+    file_identifier = None
+    if self._hash_results_cache:
+      file_identifier = self._GetFileIdentifier(file_entry, data_stream_name)
+
     try:
-      file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
-      if not file_object:
-        raise RuntimeError((
-            u'Unable to retrieve file-like object for file entry: '
-            u'{0:s}.').format(display_name))
+      if file_object:
+        self._AnalyzeFileObject(
+            mediator, file_object, file_identifier=file_identifier)
 
-      try:
-        self._AnalyzeFileObject(mediator, file_object)
-      finally:
-        file_object.close()
+      else:
+        file_object = file_entry.GetFileObject(
+            data_stream_name=data_stream_name)
+        if not file_object:
+          raise RuntimeError((
+              u'Unable to retrieve file-like object for file entry: '
+              u'{0:s}.').format(display_name))
+
+        try:
+          self._AnalyzeFileObject(
+              mediator, file_object, file_identifier=file_identifier)
+        finally:
+          file_object.close()
 
     finally:
       if self._processing_profiler:
@@ -161,51 +201,93 @@ class EventExtractionWorker(object):
         u'[AnalyzeDataStream] completed analyzing file: {0:s}'.format(
             display_name))
 
-  def _AnalyzeFileObject(self, mediator, file_object):
+  def _AnalyzeFileObject(self, mediator, file_object, file_identifier=None):
     """Processes a file-like object with analyzers.
 
     Args:
       mediator (ParserMediator): mediates the interactions between
           parsers and other components, such as storage and abort signals.
       file_object (dfvfs.FileIO): file-like object to process.
+      file_identifier (Optional[str]): identifier of the data stream content,
+          used to reuse cached analyzer results, where None represents that
+          the results should not be reused.
     """
     if not self._analyzers:
       return
 
-    maximum_read_size = max([
-        analyzer_object.SIZE_LIMIT for analyzer_object in self._analyzers])
-
+    display_name = mediator.GetDisplayName()
     file_size = file_object.get_size()
 
+    uncached_analyzers = []
+    for analyzer_object in self._analyzers:
+      results = None
+      if file_identifier:
+        results = analyzer_object.GetCachedResults(file_identifier)
+
+      if results is None:
+        uncached_analyzers.append(analyzer_object)
+        continue
+
+      for result in results:
+        logging.debug((
+            u'[AnalyzeFileObject] attribute {0:s}:{1:s} cached for '
+            u'file: {2:s}.').format(
+                result.attribute_name, result.attribute_value, display_name))
+
+        mediator.AddEventAttribute(
+            result.attribute_name, result.attribute_value)
+
+      # Record that the results were not calculated from the content of
+      # the data stream.
+      mediator.AddEventAttribute(
+          u'{0:s}_results_reused'.format(analyzer_object.NAME), True)
+
+    # Non-incremental analyzers, such as the Yara analyzer, need all the data
+    # of the data stream at once and are only run if it fits their size limit.
+    analyzers = []
+    whole_data_analyzers = []
+    for analyzer_object in uncached_analyzers:
+      if analyzer_object.INCREMENTAL_ANALYZER:
+        analyzers.append(analyzer_object)
+      elif file_size <= analyzer_object.SIZE_LIMIT:
+        whole_data_analyzers.append(analyzer_object)
+
     file_object.seek(0, os.SEEK_SET)
 
-    data = file_object.read(maximum_read_size)
+    if whole_data_analyzers:
+      analyzers.extend(whole_data_analyzers)
+      read_size = file_size
+    else:
+      # Incremental analyzers are passed the data in fixed size blocks to
+      # prevent allocating the size limit for every read.
+      read_size = self._INCREMENTAL_ANALYZER_READ_SIZE
+
+    data = b''
+    if analyzers:
+      data = file_object.read(read_size)
+
     while data:
       if self._abort:
         break
 
-      for analyzer_object in self._analyzers:
+      for analyzer_object in analyzers:
         if self._abort:
           break
 
-        if (not analyzer_object.INCREMENTAL_ANALYZER and
-            file_size > analyzer_object.SIZE_LIMIT):
-          continue
-
         self.processing_status = analyzer_object.PROCESSING_STATUS_HINT
 
         analyzer_object.Analyze(data)
 
         self.last_activity_timestamp = time.time()
 
-      data = file_object.read(maximum_read_size)
+      data = file_object.read(read_size)
 
-    display_name = mediator.GetDisplayName()
-    for analyzer_object in self._analyzers:
+    for analyzer_object in uncached_analyzers:
       if self._abort:
         break
 
-      for result in analyzer_object.GetResults():
+      results = analyzer_object.GetResults()
+      for result in results:
         logging.debug((
             u'[AnalyzeFileObject] attribute {0:s}:{1:s} calculated for '
             u'file: {2:s}.').format(
@@ -214,6 +296,9 @@ class EventExtractionWorker(object):
         mediator.AddEventAttribute(
             result.attribute_name, result.attribute_value)
 
+      if file_identifier:
+        analyzer_object.CacheResults(file_identifier, results)
+
       analyzer_object.Reset()
 
     self.processing_status = definitions.PROCESSING_STATUS_RUNNING
@@ -292,8 +377,23 @@ class EventExtractionWorker(object):
 
     return False
 
+  def _CloseCachedDataStream(self, file_object):
+    """Closes a data stream opened with a block cache.
+
+    Args:
+      file_object (BlockCachedFileObject): file-like object of the data
+          stream.
+    """
+    if self._processing_profiler:
+      self._processing_profiler.IncrementCounter(
+          u'block_cache_hits', file_object.block_cache.number_of_hits)
+      self._processing_profiler.IncrementCounter(
+          u'block_cache_misses', file_object.block_cache.number_of_misses)
+
+    file_object.close()
+
   def _ExtractContentFromDataStream(
-      self, mediator, file_entry, data_stream_name):
+      self, mediator, file_entry, data_stream_name, file_object=None):
     """Extracts content from a data stream.
 
     Args:
@@ -302,6 +402,7 @@ class EventExtractionWorker(object):
       file_entry (dfvfs.FileEntry): file entry to extract its content.
       data_stream_name (str): name of the data stream whose content is to be
           extracted.
+      file_object (Optional[file]): file-like object of the data stream.
     """
     self.processing_status = definitions.PROCESSING_STATUS_EXTRACTING
 
@@ -309,7 +410,7 @@ class EventExtractionWorker(object):
       self._processing_profiler.StartTiming(u'extracting')
 
     self._event_extractor.ParseDataStream(
-        mediator, file_entry, data_stream_name)
+        mediator, file_entry, data_stream_name, file_object=file_object)
 
     if self._processing_profiler:
       self._processing_profiler.StopTiming(u'extracting')
@@ -387,6 +488,142 @@ class EventExtractionWorker(object):
 
     return type_indicators
 
+  def _GetFileIdentifier(self, file_entry, data_stream_name):
+    """Determines an identifier of the content of a data stream.
+
+    The identifier consists of the storage media image, the volume, the inode
+    and sequence number, the size and the modification, change and creation
+    timestamps of the file entry. The volume is identified by the NTFS volume
+    serial number if available and otherwise by the partition. The VSS store
+    is not part of the identifier, so that the same content in different VSS
+    stores has the same identifier.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry containing the data stream.
+      data_stream_name (str): name of the data stream.
+
+    Returns:
+      str: identifier of the data stream content or None if the content
+          cannot be identified.
+    """
+    stat_object = file_entry.GetStat()
+    if not stat_object:
+      return
+
+    inode = getattr(stat_object, u'ino', None)
+    if inode is None:
+      inode = getattr(file_entry.path_spec, u'inode', None)
+    if inode is None:
+      inode = getattr(file_entry.path_spec, u'mft_entry', None)
+
+    modification_time = getattr(stat_object, u'mtime', None)
+    size = getattr(stat_object, u'size', None)
+    if inode is None or modification_time is None or size is None:
+      return
+
+    # The sequence number changes when a NTFS MFT entry is reused.
+    sequence_number = None
+    if file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_TSK:
+      tsk_file = file_entry.GetTSKFile()
+      tsk_file_meta = getattr(getattr(tsk_file, u'info', None), u'meta', None)
+      sequence_number = getattr(tsk_file_meta, u'seq', None)
+
+    image_location = u''
+    partition_segments = []
+    path_spec = file_entry.path_spec.parent
+    while path_spec:
+      if path_spec.type_indicator == dfvfs_definitions.TYPE_INDICATOR_OS:
+        image_location = getattr(path_spec, u'location', None) or u''
+        break
+
+      if (path_spec.type_indicator ==
+          dfvfs_definitions.TYPE_INDICATOR_TSK_PARTITION):
+        partition_segments.append(u'{0!s}'.format(
+            getattr(path_spec, u'start_offset', None) or
+            getattr(path_spec, u'location', None)))
+
+      path_spec = path_spec.parent
+
+    if file_entry.type_indicator == dfvfs_definitions.TYPE_INDICATOR_OS:
+      # Files on the host file system are identified by their location.
+      volume_identifier = getattr(file_entry.path_spec, u'location', u'')
+
+    else:
+      volume_serial_number = self._GetNTFSVolumeSerialNumber(file_entry)
+      if volume_serial_number is not None:
+        volume_identifier = u'{0:016x}'.format(volume_serial_number)
+      else:
+        volume_identifier = u'/'.join(partition_segments)
+
+    timestamps = []
+    for attribute_name in (u'mtime', u'ctime', u'crtime'):
+      timestamps.append(u'{0!s}.{1!s}'.format(
+          getattr(stat_object, attribute_name, None),
+          getattr(stat_object, u'{0:s}_nano'.format(attribute_name), None)))
+
+    return u'{0:s}:{1:s}:{2:s}:{3!s}-{4!s}:{5:s}:{6!s}:{7:s}'.format(
+        file_entry.type_indicator, image_location, volume_identifier, inode,
+        sequence_number, data_stream_name or u'', size, u':'.join(timestamps))
+
+  def _GetNTFSVolumeSerialNumber(self, file_entry):
+    """Retrieves the NTFS volume serial number of a file entry.
+
+    The volume serial number is read from the $Boot file once per volume.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry.
+
+    Returns:
+      int: volume serial number or None if not available, for example when
+          the file system is not NTFS.
+    """
+    if file_entry.type_indicator not in (
+        dfvfs_definitions.TYPE_INDICATOR_NTFS,
+        dfvfs_definitions.TYPE_INDICATOR_TSK):
+      return
+
+    volume_path_spec = file_entry.path_spec.parent
+    if not volume_path_spec:
+      return
+
+    volume_comparable = volume_path_spec.comparable
+    if volume_comparable in self._volume_serial_numbers:
+      return self._volume_serial_numbers[volume_comparable]
+
+    volume_serial_number = None
+
+    boot_path_spec = path_spec_factory.Factory.NewPathSpec(
+        file_entry.type_indicator, location=u'/$Boot',
+        parent=volume_path_spec)
+
+    try:
+      file_system = file_entry.GetFileSystem()
+      boot_file_entry = file_system.GetFileEntryByPathSpec(boot_path_spec)
+
+      file_object = None
+      if boot_file_entry:
+        file_object = boot_file_entry.GetFileObject()
+
+      if file_object:
+        try:
+          boot_sector = self._NTFS_BOOT_SECTOR.parse_stream(file_object)
+        finally:
+          file_object.close()
+
+        if (boot_sector.file_system_signature ==
+            self._NTFS_FILE_SYSTEM_SIGNATURE):
+          volume_serial_number = boot_sector.volume_serial_number
+
+    except (
+        IOError, construct.FieldError, dfvfs_errors.AccessError,
+        dfvfs_errors.BackEndError, dfvfs_errors.PathSpecError) as exception:
+      logging.debug(
+          u'Unable to read NTFS volume serial number with error: {0!s}'.format(
+              exception))
+
+    self._volume_serial_numbers[volume_comparable] = volume_serial_number
+    return volume_serial_number
+
   def _IsMetadataFile(self, file_entry):
     """Determines if the file entry is a metadata file.
 
@@ -402,6 +639,29 @@ class EventExtractionWorker(object):
 
     return False
 
+  def _OpenCachedDataStream(self, file_entry, data_stream_name):
+    """Opens a data stream with a block cache.
+
+    The block cache is shared by the analyzers, the signature scanner and
+    the parsers of the data stream.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry containing the data stream.
+      data_stream_name (str): name of the data stream.
+
+    Returns:
+      BlockCachedFileObject: file-like object of the data stream or None
+          if the data stream cannot be opened.
+    """
+    file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
+    if not file_object:
+      return
+
+    data_stream_block_cache = block_cache.BlockCache(
+        maximum_size=self._MAXIMUM_BLOCK_CACHE_SIZE)
+    return block_cache.BlockCachedFileObject(
+        file_object, block_cache=data_stream_block_cache)
+
   def _ProcessArchiveTypes(self, mediator, path_spec, type_indicators):
     """Processes a data stream containing archive types such as: TAR or ZIP.
 
@@ -562,6 +822,7 @@ class EventExtractionWorker(object):
       stat_object = sub_file_entry.GetStat()
       if stat_object:
         event_source.file_entry_type = stat_object.type
+        event_source.file_size = getattr(stat_object, u'size', None)
 
       mediator.ProduceEventSource(event_source)
 
@@ -635,61 +896,82 @@ class EventExtractionWorker(object):
     if not data_stream_name and not file_entry.IsFile():
       has_data_stream = False
 
+    file_object = None
     if has_data_stream:
-      # Since AnalyzeDataStream generates event attributes it needs to be
-      # called before producing events.
-      self._AnalyzeDataStream(mediator, file_entry, data_stream_name)
-
-    # We always want to extract the file entry metadata but we only want
-    # to parse it once per file entry, so we only use it if we are
-    # processing the default (nameless) data stream.
-    if (not data_stream_name and (
-        not file_entry.IsRoot() or
-        file_entry.type_indicator in self._TYPES_WITH_ROOT_METADATA)):
-      self._ExtractMetadataFromFileEntry(mediator, file_entry)
-
-    if not has_data_stream:
-      return
-
-    # Determine if the content of the file entry should not be extracted.
-    skip_content_extraction = self._CanSkipContentExtraction(file_entry)
-    if skip_content_extraction:
-      display_name = mediator.GetDisplayName()
-      logging.debug(
-          u'Skipping content extraction of: {0:s}'.format(display_name))
-      self.processing_status = definitions.PROCESSING_STATUS_IDLE
-      return
-
-    path_spec = copy.deepcopy(file_entry.path_spec)
-    if data_stream_name:
-      path_spec.data_stream = data_stream_name
-
-    archive_types = []
-    compressed_stream_types = []
+      file_object = self._OpenCachedDataStream(file_entry, data_stream_name)
 
-    if self._process_compressed_streams:
-      compressed_stream_types = self._GetCompressedStreamTypes(
-          mediator, path_spec)
-
-    if not compressed_stream_types:
-      archive_types = self._GetArchiveTypes(mediator, path_spec)
-
-    if archive_types:
-      if self._process_archives:
-        self._ProcessArchiveTypes(mediator, path_spec, archive_types)
+    try:
+      if has_data_stream:
+        # Since AnalyzeDataStream generates event attributes it needs to be
+        # called before producing events.
+        self._AnalyzeDataStream(
+            mediator, file_entry, data_stream_name, file_object=file_object)
+
+      # We always want to extract the file entry metadata but we only want
+      # to parse it once per file entry, so we only use it if we are
+      # processing the default (nameless) data stream.
+      if (not data_stream_name and (
+          not file_entry.IsRoot() or
+          file_entry.type_indicator in self._TYPES_WITH_ROOT_METADATA)):
+        self._ExtractMetadataFromFileEntry(mediator, file_entry)
+
+      if not has_data_stream:
+        return
+
+      # Determine if the content of the file entry should not be extracted.
+      skip_content_extraction = self._CanSkipContentExtraction(file_entry)
+      if skip_content_extraction:
+        display_name = mediator.GetDisplayName()
+        logging.debug(
+            u'Skipping content extraction of: {0:s}'.format(display_name))
+        self.processing_status = definitions.PROCESSING_STATUS_IDLE
+        return
+
+      path_spec = copy.deepcopy(file_entry.path_spec)
+      if data_stream_name:
+        path_spec.data_stream = data_stream_name
+
+      archive_types = []
+      compressed_stream_types = []
+
+      if self._process_compressed_streams:
+        compressed_stream_types = self._GetCompressedStreamTypes(
+            mediator, path_spec)
+
+      if not compressed_stream_types:
+        archive_types = self._GetArchiveTypes(mediator, path_spec)
+
+      if file_object and (archive_types or compressed_stream_types):
+        # The archive and compressed stream file systems reuse the file object
+        # of the data stream cached by the resolver context and expect it to
+        # be at the start of the data stream, hence the data stream is closed
+        # before they are processed.
+        self._CloseCachedDataStream(file_object)
+        file_object = None
+
+      if archive_types:
+        if self._process_archives:
+          self._ProcessArchiveTypes(mediator, path_spec, archive_types)
+
+        if dfvfs_definitions.TYPE_INDICATOR_ZIP in archive_types:
+          file_object = self._OpenCachedDataStream(
+              file_entry, data_stream_name)
+
+          # ZIP files are the base of certain file formats like docx.
+          self._ExtractContentFromDataStream(
+              mediator, file_entry, data_stream_name, file_object=file_object)
+
+      elif compressed_stream_types:
+        self._ProcessCompressedStreamTypes(
+            mediator, path_spec, compressed_stream_types)
 
-      if dfvfs_definitions.TYPE_INDICATOR_ZIP in archive_types:
-        # ZIP files are the base of certain file formats like docx.
+      else:
         self._ExtractContentFromDataStream(
-            mediator, file_entry, data_stream_name)
-
-    elif compressed_stream_types:
-      self._ProcessCompressedStreamTypes(
-          mediator, path_spec, compressed_stream_types)
+            mediator, file_entry, data_stream_name, file_object=file_object)
 
-    else:
-      self._ExtractContentFromDataStream(
-          mediator, file_entry, data_stream_name)
+    finally:
+      if file_object:
+        self._CloseCachedDataStream(file_object)
 
   def _ProcessMetadataFile(self, mediator, file_entry):
     """Processes a metadata file.
@@ -706,6 +988,12 @@ class EventExtractionWorker(object):
 
     self.last_activity_timestamp = time.time()
 
+  def Close(self):
+    """Closes the extraction worker."""
+    if self._hash_results_cache:
+      self._hash_results_cache.Close()
+      self._hash_results_cache = None
+
   def GetAnalyzerNames(self):
     """Gets the names of the active analyzers.
 
@@ -749,12 +1037,16 @@ class EventExtractionWorker(object):
       self.last_activity_timestamp = time.time()
       self.processing_status = definitions.PROCESSING_STATUS_IDLE
 
-  def SetHashers(self, hasher_names_string):
+  def SetHashers(self, hasher_names_string, reuse_hashes=False):
     """Sets the hasher names.
 
     Args:
       hasher_names_string (str): comma separated names of the hashers
           to enable, where 'none' disables the hashing analyzer.
+      reuse_hashes (Optional[bool]): True if the hash results of a data
+          stream should be reused for data streams with the same identifier,
+          such as the same file in another VSS store, instead of hashing
+          their content.
     """
     if not hasher_names_string or hasher_names_string == u'none':
       return
@@ -762,6 +1054,11 @@ class EventExtractionWorker(object):
     analyzer_object = analyzers_manager.AnalyzersManager.GetAnalyzerInstance(
         u'hashing')
     analyzer_object.SetHasherNames(hasher_names_string)
+
+    if reuse_hashes:
+      self._hash_results_cache = hashing_analyzer.HashResultsCache()
+      analyzer_object.SetResultsCache(self._hash_results_cache)
+
     self._analyzers.append(analyzer_object)
 
   def SetParsersProfiler(self, parsers_profiler):
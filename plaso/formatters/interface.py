@@ -46,10 +46,16 @@ class EventFormatter(object):
   _FORMAT_STRING_ATTRIBUTE_NAME_RE = re.compile(
       u'{([a-z][a-zA-Z0-9_]*)[!]?[^:}]*[:]?[^}]*}')
 
+  # The names of the event attributes that are used in error messages.
+  _ERROR_MESSAGE_ATTRIBUTE_NAMES = frozenset([
+      u'data_type', u'display_name', u'parser', u'uuid'])
+
   def __init__(self):
     """Initializes an event formatter object."""
     super(EventFormatter, self).__init__()
+    self._event_value_names = None
     self._format_string_attribute_names = None
+    self._required_event_value_names = None
 
   def _FormatMessage(self, format_string, event_values):
     """Determines the formatted message string.
@@ -132,6 +138,56 @@ class EventFormatter(object):
 
     return message_string, short_message_string
 
+  def _GetEventValueNames(self):
+    """Retrieves the names of the event values needed to format the messages.
+
+    Returns:
+      tuple: containing:
+
+        frozenset[str]: names of the event values needed to format
+            the messages, including those used in error messages.
+        frozenset[str]: names of the event values that are required to
+            format the messages.
+    """
+    if self._event_value_names is None:
+      attribute_names = set(self._FORMAT_STRING_ATTRIBUTE_NAME_RE.findall(
+          self.FORMAT_STRING))
+      attribute_names.update(self._FORMAT_STRING_ATTRIBUTE_NAME_RE.findall(
+          self.FORMAT_STRING_SHORT))
+
+      self._required_event_value_names = frozenset(attribute_names)
+      self._event_value_names = frozenset(
+          attribute_names.union(self._ERROR_MESSAGE_ATTRIBUTE_NAMES))
+
+    return self._event_value_names, self._required_event_value_names
+
+  def _GetEventValues(self, event):
+    """Retrieves the event values needed to format the messages.
+
+    Only the event values used by the format strings are copied, instead of
+    all the event attributes. If a required event value is missing all
+    the event attributes are copied, so that they can be included in
+    the error message.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      dict[str, object]: event values.
+    """
+    event_value_names, required_event_value_names = self._GetEventValueNames()
+
+    event_values = {}
+    for attribute_name in event_value_names:
+      attribute_value = getattr(event, attribute_name, None)
+      if attribute_value is not None:
+        event_values[attribute_name] = attribute_value
+
+    if not required_event_value_names.issubset(event_values):
+      return event.CopyToDict()
+
+    return event_values
+
   def GetFormatStringAttributeNames(self):
     """Retrieves the attribute names in the format string.
 
@@ -164,7 +220,7 @@ class EventFormatter(object):
       raise errors.WrongFormatter(u'Unsupported data type: {0:s}.'.format(
           event.data_type))
 
-    event_values = event.CopyToDict()
+    event_values = self._GetEventValues(event)
     return self._FormatMessages(
         self.FORMAT_STRING, self.FORMAT_STRING_SHORT, event_values)
 
@@ -206,6 +262,10 @@ class ConditionalEventFormatter(EventFormatter):
   # The separator used to join the string pieces.
   FORMAT_STRING_SEPARATOR = u' '
 
+  # The types of attribute values that are formatted when they have a zero
+  # value.
+  _NUMERIC_TYPES = (bool, float) + py2to3.INTEGER_TYPES
+
   def __init__(self):
     """Initializes the conditional formatter.
 
@@ -258,6 +318,40 @@ class ConditionalEventFormatter(EventFormatter):
             u'Invalid short format string piece: [{0:s}] contains more '
             u'than 1 attribute name.').format(format_string_piece))
 
+    # The format string pieces plans contain the attribute name and format
+    # string piece pairs, so that the pieces of absent attributes can be
+    # skipped without having to format them. The format strings are cached
+    # per combination of pieces that are present.
+    self._format_string_pieces_plan = list(zip(
+        self._format_string_pieces_map, self.FORMAT_STRING_PIECES))
+    self._format_string_short_pieces_plan = list(zip(
+        self._format_string_short_pieces_map, self.FORMAT_STRING_SHORT_PIECES))
+    self._format_strings_cache = {}
+    self._short_format_strings_cache = {}
+
+  def _GetEventValueNames(self):
+    """Retrieves the names of the event values needed to format the messages.
+
+    Returns:
+      tuple: containing:
+
+        frozenset[str]: names of the event values needed to format
+            the messages, including those used in error messages.
+        frozenset[str]: names of the event values that are required to
+            format the messages, which is empty since format string pieces
+            of absent attributes are skipped.
+    """
+    if self._event_value_names is None:
+      attribute_names = set(self._format_string_pieces_map)
+      attribute_names.update(self._format_string_short_pieces_map)
+      attribute_names.discard(u'')
+
+      self._required_event_value_names = frozenset()
+      self._event_value_names = frozenset(
+          attribute_names.union(self._ERROR_MESSAGE_ATTRIBUTE_NAMES))
+
+    return self._event_value_names, self._required_event_value_names
+
   def _ConditionalFormatMessages(self, event_values):
     """Determines the conditional formatted message strings.
 
@@ -269,26 +363,40 @@ class ConditionalEventFormatter(EventFormatter):
     """
     # Using getattr here to make sure the attribute is not set to None.
     # if A.b = None, hasattr(A, b) is True but getattr(A, b, None) is False.
-    string_pieces = []
-    for map_index, attribute_name in enumerate(self._format_string_pieces_map):
-      if not attribute_name or attribute_name in event_values:
-        if attribute_name:
-          attribute = event_values.get(attribute_name, None)
-          # If an attribute is an int, yet has zero value we want to include
-          # that in the format string, since that is still potentially valid
-          # information. Otherwise we would like to skip it.
-          # pylint: disable=unidiomatic-typecheck
-          if type(attribute) not in (bool, int, long, float) and not attribute:
-            continue
-        string_pieces.append(self.FORMAT_STRING_PIECES[map_index])
-    format_string = self.FORMAT_STRING_SEPARATOR.join(string_pieces)
-
-    string_pieces = []
-    for map_index, attribute_name in enumerate(
-        self._format_string_short_pieces_map):
-      if not attribute_name or event_values.get(attribute_name, None):
-        string_pieces.append(self.FORMAT_STRING_SHORT_PIECES[map_index])
-    short_format_string = self.FORMAT_STRING_SEPARATOR.join(string_pieces)
+    pieces_key = []
+    for attribute_name, _ in self._format_string_pieces_plan:
+      if not attribute_name:
+        is_present = True
+      else:
+        attribute = event_values.get(attribute_name, None)
+        # If an attribute is an int, yet has zero value we want to include
+        # that in the format string, since that is still potentially valid
+        # information. Otherwise we would like to skip it.
+        # pylint: disable=unidiomatic-typecheck
+        is_present = bool(
+            attribute_name in event_values and (
+                type(attribute) in self._NUMERIC_TYPES or attribute))
+      pieces_key.append(is_present)
+
+    pieces_key = tuple(pieces_key)
+    format_string = self._format_strings_cache.get(pieces_key, None)
+    if format_string is None:
+      format_string = self.FORMAT_STRING_SEPARATOR.join([
+          format_string_piece for is_present, (_, format_string_piece) in zip(
+              pieces_key, self._format_string_pieces_plan) if is_present])
+      self._format_strings_cache[pieces_key] = format_string
+
+    pieces_key = tuple([
+        not attribute_name or bool(event_values.get(attribute_name, None))
+        for attribute_name, _ in self._format_string_short_pieces_plan])
+    short_format_string = self._short_format_strings_cache.get(
+        pieces_key, None)
+    if short_format_string is None:
+      short_format_string = self.FORMAT_STRING_SEPARATOR.join([
+          format_string_piece for is_present, (_, format_string_piece) in zip(
+              pieces_key, self._format_string_short_pieces_plan)
+          if is_present])
+      self._short_format_strings_cache[pieces_key] = short_format_string
 
     return self._FormatMessages(
         format_string, short_format_string, event_values)
@@ -329,5 +437,5 @@ class ConditionalEventFormatter(EventFormatter):
       raise errors.WrongFormatter(u'Unsupported data type: {0:s}.'.format(
           event.data_type))
 
-    event_values = event.CopyToDict()
+    event_values = self._GetEventValues(event)
     return self._ConditionalFormatMessages(event_values)
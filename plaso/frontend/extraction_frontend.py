@@ -257,19 +257,24 @@ class ExtractionFrontend(frontend.Frontend):
 
     return session
 
-  def CreateStorageWriter(self, session, storage_file_path):
+  def CreateStorageWriter(
+      self, session, storage_file_path,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON):
     """Creates a storage writer.
 
     Args:
       session (Session): session the storage changes are part of.
       storage_file_path (str): path of the storage file.
+      serialization_format (Optional[str]): serialization format used when
+          creating a new storage file.
 
     Returns:
       StorageWriter: storage writer.
     """
     self._CheckStorageFile(storage_file_path)
 
-    return storage_zip_file.ZIPStorageFileWriter(session, storage_file_path)
+    return storage_zip_file.ZIPStorageFileWriter(
+        session, storage_file_path, serialization_format=serialization_format)
 
   def DisableProfiling(self):
     """Disabled profiling."""
@@ -366,8 +371,9 @@ class ExtractionFrontend(frontend.Frontend):
       enable_sigsegv_handler=False, force_preprocessing=False,
       hasher_names_string=None, number_of_extraction_workers=0,
       process_archives=False, process_compressed_streams=True,
-      single_process_mode=False, status_update_callback=None,
-      temporary_directory=None, timezone=u'UTC', yara_rules_string=None):
+      reuse_hashes=False, single_process_mode=False,
+      status_update_callback=None, temporary_directory=None, timezone=u'UTC',
+      yara_rules_string=None):
     """Processes the sources.
 
     Args:
@@ -388,6 +394,8 @@ class ExtractionFrontend(frontend.Frontend):
           scanned for file entries.
       process_compressed_streams (Optional[bool]): True if file content in
           compressed streams should be processed.
+      reuse_hashes (Optional[bool]): True if the hashes of file content
+          that was already hashed should be reused.
       single_process_mode (Optional[bool]): True if the front-end should
           run in single process mode.
       status_update_callback (Optional[function]): callback function for status
@@ -459,6 +467,7 @@ class ExtractionFrontend(frontend.Frontend):
           preferred_year=session.preferred_year,
           process_archives=process_archives,
           process_compressed_streams=process_compressed_streams,
+          reuse_hashes=reuse_hashes,
           status_update_callback=status_update_callback,
           temporary_directory=temporary_directory,
           text_prepend=self._text_prepend,
@@ -480,6 +489,7 @@ class ExtractionFrontend(frontend.Frontend):
           preferred_year=session.preferred_year,
           process_archives=process_archives,
           process_compressed_streams=process_compressed_streams,
+          reuse_hashes=reuse_hashes,
           status_update_callback=status_update_callback,
           show_memory_usage=self._show_worker_memory_information,
           temporary_directory=temporary_directory,
@@ -190,7 +190,8 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
 
   def ExportEvents(
       self, storage_reader, output_module, deduplicate_events=True,
-      status_update_callback=None, time_slice=None, use_time_slicer=False):
+      number_of_export_processes=0, status_update_callback=None,
+      storage_file_path=None, time_slice=None, use_time_slicer=False):
     """Exports events using an output module.
 
     Args:
@@ -198,8 +199,13 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
       output_module (OutputModule): output module.
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
+      number_of_export_processes (Optional[int]): maximum number of export
+          processes, where 0 or 1 represents exporting without export
+          processes.
       status_update_callback (Optional[function]): callback function for status
           updates.
+      storage_file_path (Optional[str]): path of the storage file, which is
+          required to export events using export processes.
       time_slice (Optional[TimeSlice]): slice of time to output.
       use_time_slicer (Optional[bool]): True if the 'time slicer' should be
           used. The 'time slicer' will provide a context of events around
@@ -214,7 +220,9 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     return engine.ExportEvents(
         self._knowledge_base, storage_reader, output_module,
         deduplicate_events=deduplicate_events, event_filter=self._event_filter,
-        status_update_callback=status_update_callback, time_slice=time_slice,
+        number_of_export_processes=number_of_export_processes,
+        status_update_callback=status_update_callback,
+        storage_file_path=storage_file_path, time_slice=time_slice,
         use_time_slicer=use_time_slicer)
 
   def GetAnalysisPluginInfo(self):
@@ -231,6 +231,14 @@ class GenericBinaryOperator(BinaryOperator):
     super(GenericBinaryOperator, self).__init__(**kwargs)
     self.bool_value = True
 
+    # Split the path of the left operand once instead of every time
+    # the operator is matched.
+    self._left_operand_path = self.left_operand
+    if self.value_expander and isinstance(
+        self.left_operand, py2to3.STRING_TYPES):
+      self._left_operand_path = self.left_operand.split(
+          self.value_expander.FIELD_SEPARATOR)
+
   def FlipBool(self):
     logging.debug(u'Negative matching.')
     self.bool_value = not self.bool_value
@@ -251,8 +259,7 @@ class GenericBinaryOperator(BinaryOperator):
     return False
 
   def Matches(self, obj):
-    key = self.left_operand
-    values = self.value_expander.Expand(obj, key)
+    values = self.value_expander.Expand(obj, self._left_operand_path)
     if values and self.Operate(values):
       return self.bool_value
     return not self.bool_value
@@ -16,6 +16,12 @@ from plaso.lib import timelib
 from plaso.parsers import presets
 
 
+# The names of the attributes that require the event to be formatted.
+_EXPENSIVE_ATTRIBUTE_NAMES = frozenset([
+    u'message', u'message_short', u'source', u'source_long', u'source_short',
+    u'sourcetype'])
+
+
 class DictObject(object):
   # There's a backslash in the class docstring, so as not to confuse Sphinx.
   # pylint: disable=anomalous-backslash-in-string
@@ -73,6 +79,13 @@ class DictObject(object):
 class PlasoValueExpander(objectfilter.AttributeValueExpander):
   """An expander that gives values based on object attribute names."""
 
+  # The formatter mediator and the message of the most recently formatted
+  # event are shared by all expanders, since every operator of a filter has
+  # its own expander, so that the message of an event is only formatted once.
+  _formatter_mediator = None
+  _message_event_object = None
+  _message = None
+
   def __init__(self):
     """Initialize an attribute value expander."""
     super(PlasoValueExpander, self).__init__()
@@ -86,17 +99,24 @@ class PlasoValueExpander(objectfilter.AttributeValueExpander):
     Returns:
       A formatted message string.
     """
-    # TODO: move this somewhere where the mediator can be instantiated once.
-    formatter_mediator = formatters_mediator.FormatterMediator()
+    if PlasoValueExpander._message_event_object is event_object:
+      return PlasoValueExpander._message
+
+    if not PlasoValueExpander._formatter_mediator:
+      PlasoValueExpander._formatter_mediator = (
+          formatters_mediator.FormatterMediator())
 
     result = u''
     try:
       result, _ = formatters_manager.FormattersManager.GetMessageStrings(
-          formatter_mediator, event_object)
+          PlasoValueExpander._formatter_mediator, event_object)
     except KeyError as exception:
       logging.warning(u'Unable to correctly assemble event: {0:s}'.format(
           exception))
 
+    PlasoValueExpander._message_event_object = event_object
+    PlasoValueExpander._message = result
+
     return result
 
   def _GetSources(self, event_object):
@@ -224,6 +244,42 @@ class ParserList(objectfilter.GenericBinaryOperator):
     return False
 
 
+class PlasoAndFilter(objectfilter.AndFilter):
+  """Performs a boolean AND of the given Filter instances as arguments.
+
+  The filters are evaluated in order of their estimated cost, so that
+  cheap filters, such as those on the timestamp, data type or parser, can
+  short-circuit expensive filters, such as those on the message or source.
+  """
+
+  def __init__(self, arguments=None, **kwargs):
+    """Initializes the filter.
+
+    Args:
+      arguments (Optional[list[objectfilter.Filter]]): filters.
+    """
+    super(PlasoAndFilter, self).__init__(arguments=arguments, **kwargs)
+    self.args = sorted(self.args, key=GetFilterCost)
+
+
+class PlasoOrFilter(objectfilter.OrFilter):
+  """Performs a boolean OR of the given Filter instances as arguments.
+
+  The filters are evaluated in order of their estimated cost, so that
+  cheap filters, such as those on the timestamp, data type or parser, can
+  short-circuit expensive filters, such as those on the message or source.
+  """
+
+  def __init__(self, arguments=None, **kwargs):
+    """Initializes the filter.
+
+    Args:
+      arguments (Optional[list[objectfilter.Filter]]): filters.
+    """
+    super(PlasoOrFilter, self).__init__(arguments=arguments, **kwargs)
+    self.args = sorted(self.args, key=GetFilterCost)
+
+
 class PlasoAttributeFilterImplementation(objectfilter.BaseFilterImplementation):
   """Does field name access on the lowercase version of names.
 
@@ -233,7 +289,10 @@ class PlasoAttributeFilterImplementation(objectfilter.BaseFilterImplementation):
 
   FILTERS = {}
   FILTERS.update(objectfilter.BaseFilterImplementation.FILTERS)
-  FILTERS.update({'ValueExpander': PlasoValueExpander})
+  FILTERS.update({
+      'AndFilter': PlasoAndFilter,
+      'OrFilter': PlasoOrFilter,
+      'ValueExpander': PlasoValueExpander})
   OPS = objectfilter.OP2FN
   OPS.update({'inlist': ParserList,})
 
@@ -328,6 +387,41 @@ class BaseParser(objectfilter.Parser):
   expression_cls = PlasoExpression
 
 
+def GetFilterCost(filter_object):
+  """Estimates the cost of evaluating a filter.
+
+  Args:
+    filter_object (objectfilter.Filter): filter.
+
+  Returns:
+    int: estimated cost, where a higher value indicates a higher cost.
+  """
+  if isinstance(filter_object, objectfilter.BinaryOperator):
+    attribute_name = filter_object.left_operand
+    if isinstance(attribute_name, py2to3.STRING_TYPES):
+      attribute_name = attribute_name.split(u'.')[0].lower()
+
+    if attribute_name in _EXPENSIVE_ATTRIBUTE_NAMES:
+      cost = 100
+    else:
+      cost = 1
+
+    if isinstance(filter_object, objectfilter.Regexp):
+      cost *= 2
+
+    return cost
+
+  if isinstance(filter_object, objectfilter.Context):
+    return GetFilterCost(filter_object.condition)
+
+  cost = 0
+  for argument in filter_object.args:
+    if isinstance(argument, objectfilter.Filter):
+      cost += GetFilterCost(argument)
+
+  return max(cost, 1)
+
+
 class TimeRangeCache(object):
   """A class that stores timeranges from filters."""
 
@@ -4,6 +4,12 @@
 import logging
 import threading
 
+# The 'cPickle' module was renamed to 'pickle' in Python 3
+try:
+  import cPickle as pickle
+except ImportError:
+  import pickle
+
 from plaso.analysis import mediator as analysis_mediator
 from plaso.containers import tasks
 from plaso.engine import plaso_queue
@@ -12,6 +18,34 @@ from plaso.lib import errors
 from plaso.multi_processing import base_process
 
 
+def DeserializeEvent(serialized_event):
+  """Deserializes an event pushed to an analysis process.
+
+  Args:
+    serialized_event (bytes): serialized event.
+
+  Returns:
+    EventObject: event.
+  """
+  return pickle.loads(serialized_event)
+
+
+def SerializeEvent(event):
+  """Serializes an event to be pushed to an analysis process.
+
+  Events are pushed to the analysis processes in batches of serialized
+  events, so that an event is only serialized once when it is examined by
+  multiple analysis plugins.
+
+  Args:
+    event (EventObject): event.
+
+  Returns:
+    bytes: serialized event.
+  """
+  return pickle.dumps(event, pickle.HIGHEST_PROTOCOL)
+
+
 class AnalysisProcess(base_process.MultiProcessBaseProcess):
   """Class that defines a multi-processing analysis process."""
 
@@ -129,20 +163,22 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
 
       while not self._abort:
         try:
-          event = self._event_queue.PopItem()
+          queued_object = self._event_queue.PopItem()
 
         except (errors.QueueClose, errors.QueueEmpty) as exception:
           logging.debug(u'ConsumeItems exiting with exception {0:s}.'.format(
               type(exception)))
           break
 
-        if isinstance(event, plaso_queue.QueueAbort):
+        if isinstance(queued_object, plaso_queue.QueueAbort):
           logging.debug(u'ConsumeItems exiting, dequeued QueueAbort object.')
           break
 
-        self._ProcessEvent(self._analysis_mediator, event)
-
-        self._number_of_consumed_events += 1
+        if isinstance(queued_object, list):
+          self._ProcessEventBatch(self._analysis_mediator, queued_object)
+        else:
+          self._ProcessEvent(self._analysis_mediator, queued_object)
+          self._number_of_consumed_events += 1
 
         if self._memory_profiler:
           self._memory_profiler.Sample()
@@ -214,6 +250,23 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
         logging.warning(u'Unhandled exception while processing event object.')
         logging.exception(exception)
 
+  def _ProcessEventBatch(self, mediator, event_batch):
+    """Processes a batch of serialized events.
+
+    Args:
+      mediator (AnalysisMediator): mediates interactions between
+          analysis plugins and other components, such as storage and dfvfs.
+      event_batch (list[bytes]): serialized events.
+    """
+    for serialized_event in event_batch:
+      if self._abort:
+        break
+
+      event = DeserializeEvent(serialized_event)
+      self._ProcessEvent(mediator, event)
+
+      self._number_of_consumed_events += 1
+
   def SignalAbort(self):
     """Signals the process to abort."""
     self._abort = True
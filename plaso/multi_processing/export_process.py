@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""The multi-process export process."""
+
+import io
+import logging
+import multiprocessing
+import threading
+
+from plaso.lib import definitions
+from plaso.multi_processing import base_process
+from plaso.output import event_buffer as output_event_buffer
+from plaso.storage import zip_file as storage_zip_file
+
+
+class ExportOutputWriter(object):
+  """Class that implements an export output writer.
+
+  The export output writer writes UTF-8 encoded text, which is read back
+  by the engine that combines the output of the export processes.
+  """
+
+  ENCODING = u'utf-8'
+
+  def __init__(self, file_object):
+    """Initializes an export output writer.
+
+    Args:
+      file_object (file): file-like object to write to.
+    """
+    super(ExportOutputWriter, self).__init__()
+    self._file_object = file_object
+
+  def Write(self, string):
+    """Writes a string to the output.
+
+    Args:
+      string (str): output.
+    """
+    self._file_object.write(string.encode(self.ENCODING))
+
+
+class ExportProcess(base_process.MultiProcessBaseProcess):
+  """Class that defines a multi-processing export process.
+
+  The export process exports the events within a time range to a separate
+  output file, without the header and footer of the output format.
+
+  Attributes:
+    completed (multiprocessing.Value): 1 if all the events within the time
+        range were exported, 0 otherwise.
+    number_of_consumed_events (multiprocessing.Value): number of events
+        that were exported.
+    number_of_duplicate_events (multiprocessing.Value): number of duplicate
+        events that were removed.
+    number_of_filtered_events (multiprocessing.Value): number of events
+        that were filtered.
+  """
+
+  # Number of seconds to wait for the completion status to be queried
+  # by the foreman process.
+  _FOREMAN_STATUS_WAIT = 5 * 60
+
+  def __init__(
+      self, storage_file_path, output_module, time_range, output_path,
+      deduplicate_events=True, event_filter=None, **kwargs):
+    """Initializes an export process.
+
+    Non-specified keyword arguments (kwargs) are directly passed to
+    multiprocessing.Process.
+
+    Args:
+      storage_file_path (str): path of the storage file.
+      output_module (LinearOutputModule): output module.
+      time_range (TimeRange): time range of the events to export.
+      output_path (str): path of the file the output is written to.
+      deduplicate_events (Optional[bool]): True if events should be
+          deduplicated.
+      event_filter (Optional[FilterObject]): event filter.
+    """
+    super(ExportProcess, self).__init__(**kwargs)
+    self._abort = False
+    self._deduplicate_events = deduplicate_events
+    self._event_filter = event_filter
+    self._foreman_status_wait_event = None
+    self._number_of_consumed_events = 0
+    self._output_module = output_module
+    self._output_path = output_path
+    self._status = definitions.PROCESSING_STATUS_INITIALIZED
+    self._storage_file_path = storage_file_path
+    self._time_range = time_range
+
+    # The completion indicator and counters are shared with the engine
+    # process.
+    self.completed = multiprocessing.Value(u'B', 0)
+    self.number_of_consumed_events = multiprocessing.Value(u'L', 0)
+    self.number_of_duplicate_events = multiprocessing.Value(u'L', 0)
+    self.number_of_filtered_events = multiprocessing.Value(u'L', 0)
+
+  def _ExportEvents(self, storage_reader, output_file_object):
+    """Exports the events within the time range.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      output_file_object (file): file-like object to write the output to.
+    """
+    output_writer = ExportOutputWriter(output_file_object)
+    self._output_module.SetOutputWriter(output_writer)
+
+    number_of_filtered_events = 0
+
+    event_buffer = output_event_buffer.EventBuffer(
+        self._output_module, self._deduplicate_events,
+        write_header_and_footer=False)
+
+    with event_buffer:
+      for event in storage_reader.GetEvents(time_range=self._time_range):
+        if self._abort:
+          break
+
+        if self._event_filter and not self._event_filter.Match(event):
+          number_of_filtered_events += 1
+          continue
+
+        event_buffer.Append(event)
+        self._number_of_consumed_events += 1
+
+    self.number_of_consumed_events.value = self._number_of_consumed_events
+    self.number_of_duplicate_events.value = event_buffer.duplicate_counter
+    self.number_of_filtered_events.value = number_of_filtered_events
+
+  def _GetStatus(self):
+    """Returns status information.
+
+    Returns:
+      dict[str, object]: status attributes, indexed by name.
+    """
+    status = {
+        u'display_name': u'',
+        u'identifier': self._name,
+        u'number_of_consumed_errors': None,
+        u'number_of_consumed_event_tags': None,
+        u'number_of_consumed_events': self._number_of_consumed_events,
+        u'number_of_consumed_reports': None,
+        u'number_of_consumed_sources': None,
+        u'number_of_produced_errors': None,
+        u'number_of_produced_event_tags': None,
+        u'number_of_produced_events': None,
+        u'number_of_produced_reports': None,
+        u'number_of_produced_sources': None,
+        u'processing_status': self._status,
+        u'task_identifier': None}
+
+    if self._status in (
+        definitions.PROCESSING_STATUS_ABORTED,
+        definitions.PROCESSING_STATUS_COMPLETED):
+      self._foreman_status_wait_event.set()
+
+    return status
+
+  def _Main(self):
+    """The main loop."""
+    logging.debug(u'Export process: {0!s} (PID: {1:d}) started'.format(
+        self._name, self._pid))
+
+    # Creating the threading event in the constructor will cause a pickle
+    # error on Windows when an export process is created.
+    self._foreman_status_wait_event = threading.Event()
+    self._status = definitions.PROCESSING_STATUS_EXPORTING
+
+    storage_reader = None
+    try:
+      storage_reader = storage_zip_file.ZIPStorageFileReader(
+          self._storage_file_path)
+
+      with io.open(self._output_path, 'wb') as output_file_object:
+        self._ExportEvents(storage_reader, output_file_object)
+
+    # All exceptions need to be caught here to prevent the process
+    # from being killed by an uncaught exception.
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.warning(
+          u'Unhandled exception in process: {0!s} (PID: {1:d}).'.format(
+              self._name, self._pid))
+      logging.exception(exception)
+
+      self._abort = True
+
+    finally:
+      if storage_reader:
+        storage_reader.Close()
+
+    if self._abort:
+      self._status = definitions.PROCESSING_STATUS_ABORTED
+    else:
+      self.completed.value = 1
+      self._status = definitions.PROCESSING_STATUS_COMPLETED
+
+    self._foreman_status_wait_event.wait(self._FOREMAN_STATUS_WAIT)
+
+    logging.debug(u'Export process: {0!s} (PID: {1:d}) stopped'.format(
+        self._name, self._pid))
+
+    self._foreman_status_wait_event = None
+
+  def SignalAbort(self):
+    """Signals the process to abort."""
+    self._abort = True
+    if self._foreman_status_wait_event:
+      self._foreman_status_wait_event.set()
@@ -3,8 +3,11 @@
 
 from __future__ import print_function
 import collections
+import io
 import logging
 import os
+import shutil
+import tempfile
 import time
 
 from plaso.engine import plaso_queue
@@ -14,6 +17,7 @@ from plaso.lib import bufferlib
 from plaso.lib import definitions
 from plaso.multi_processing import analysis_process
 from plaso.multi_processing import engine as multi_process_engine
+from plaso.multi_processing import export_process
 from plaso.multi_processing import multi_process_queue
 from plaso.output import event_buffer as output_event_buffer
 from plaso.storage import time_range as storage_time_range
@@ -22,10 +26,29 @@ from plaso.storage import time_range as storage_time_range
 class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
   """Class that defines the psort multi-processing engine."""
 
+  # Number of events in a batch of events pushed to an analysis process.
+  _EVENT_BATCH_SIZE = 1000
+
+  # Maximum number of event batches queued per analysis process.
+  _MAXIMUM_NUMBER_OF_QUEUED_EVENT_BATCHES = 16
+
   _PROCESS_JOIN_TIMEOUT = 5.0
 
   _QUEUE_TIMEOUT = 10 * 60
 
+  # Number of time ranges per export process. Using more time ranges than
+  # export processes compensates for time ranges that contain more events
+  # than others.
+  _NUMBER_OF_TIME_RANGES_PER_EXPORT_PROCESS = 4
+
+  # The names of the output modules that support parallel export. The output
+  # of these modules consists of a header, a line per event and a footer,
+  # which allows the output of the export processes to be concatenated.
+  _PARALLEL_EXPORT_OUTPUT_MODULES = frozenset([
+      u'dynamic', u'json_line', u'l2tcsv', u'l2ttln', u'rawpy', u'tln'])
+
+  # Size of the blocks of exported text that are read at once.
+  _EXPORTED_TEXT_READ_SIZE = 4 * 1024 * 1024
 
   def __init__(
       self, debug_output=False, enable_profiling=False,
@@ -102,6 +125,15 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     filter_limit = getattr(event_filter, u'limit', None)
 
+    data_types_per_plugin = {}
+    for analysis_plugin in analysis_plugins:
+      data_types_per_plugin[analysis_plugin.plugin_name] = (
+          analysis_plugin.EVENT_DATA_TYPES)
+
+    event_batches = {}
+    for plugin_name in self._event_queues.keys():
+      event_batches[plugin_name] = []
+
     for event in storage_writer.GetEvents():
       if event_filter:
         filter_match = event_filter.Match(event)
@@ -113,9 +145,24 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         number_of_filtered_events += 1
         continue
 
-      for event_queue in self._event_queues.values():
-        # TODO: Check for premature exit of analysis plugins.
-        event_queue.PushItem(event)
+      # The event is serialized once and the serialized event is shared by
+      # the batches of all the analysis plugins that examine its data type.
+      serialized_event = None
+      for plugin_name, event_queue in self._event_queues.items():
+        data_types = data_types_per_plugin.get(plugin_name, None)
+        if data_types is not None and event.data_type not in data_types:
+          continue
+
+        if serialized_event is None:
+          serialized_event = analysis_process.SerializeEvent(event)
+
+        event_batch = event_batches[plugin_name]
+        event_batch.append(serialized_event)
+
+        if len(event_batch) >= self._EVENT_BATCH_SIZE:
+          # TODO: Check for premature exit of analysis plugins.
+          event_queue.PushItem(event_batch)
+          event_batches[plugin_name] = []
 
       self._number_of_consumed_events += 1
 
@@ -123,10 +170,16 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
           filter_limit == self._number_of_consumed_events):
         break
 
+    for plugin_name, event_queue in self._event_queues.items():
+      event_batch = event_batches[plugin_name]
+      if event_batch:
+        event_queue.PushItem(event_batch)
+
     logging.debug(u'Finished pushing events to analysis plugins.')
-    # Signal that we have finished adding events.
+    # Signal that we have finished adding events. The event queues are
+    # bounded, hence block to make sure the end of input marker is not dropped.
     for event_queue in self._event_queues.values():
-      event_queue.PushItem(plaso_queue.QueueAbort(), block=False)
+      event_queue.PushItem(plaso_queue.QueueAbort())
 
     logging.debug(u'Processing analysis plugin results.')
 
@@ -344,6 +397,154 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     return events_counter
 
+  def _ExportEventsInParallel(
+      self, storage_file_path, time_ranges, output_module,
+      number_of_export_processes, deduplicate_events=True, event_filter=None):
+    """Exports events using multiple export processes.
+
+    Every export process exports the events within one time range to
+    a temporary file. The temporary files are appended to the output in
+    the order of the time ranges.
+
+    Args:
+      storage_file_path (str): path of the storage file.
+      time_ranges (list[TimeRange]): time ranges in chronological order.
+      output_module (LinearOutputModule): output module.
+      number_of_export_processes (int): maximum number of export processes
+          that run concurrently.
+      deduplicate_events (Optional[bool]): True if events should be
+          deduplicated.
+      event_filter (Optional[FilterObject]): event filter.
+
+    Returns:
+      collections.Counter: counter that tracks the number of unique events
+          read from storage.
+
+    Raises:
+      RuntimeError: if an export process did not complete.
+    """
+    self._status = definitions.PROCESSING_STATUS_EXPORTING
+
+    number_of_duplicate_events = 0
+    number_of_filtered_events = 0
+
+    temporary_directory = tempfile.mkdtemp(prefix=u'psort-')
+
+    try:
+      pending_processes = collections.deque()
+      time_range_index = 0
+
+      while time_range_index < len(time_ranges) or pending_processes:
+        if self._abort:
+          break
+
+        number_of_running_processes = len([
+            process for process, _ in pending_processes
+            if process.is_alive()])
+
+        while (time_range_index < len(time_ranges) and
+               number_of_running_processes < number_of_export_processes):
+          output_path = os.path.join(
+              temporary_directory, u'{0:08d}.txt'.format(time_range_index))
+
+          process = export_process.ExportProcess(
+              storage_file_path, output_module,
+              time_ranges[time_range_index], output_path,
+              deduplicate_events=deduplicate_events, event_filter=event_filter,
+              name=u'Export {0:d}'.format(time_range_index))
+
+          process.start()
+
+          logging.debug(u'Started export process: {0:s} (PID: {1:d}).'.format(
+              process.name, process.pid))
+
+          self._RegisterProcess(process)
+          self._StartMonitoringProcess(process.pid)
+
+          pending_processes.append((process, output_path))
+          number_of_running_processes += 1
+          time_range_index += 1
+
+        # The output of the export processes is written in order, hence
+        # only the oldest export process is waited for.
+        process, output_path = pending_processes[0]
+        process.join(timeout=self._STATUS_UPDATE_INTERVAL)
+        if process.is_alive():
+          continue
+
+        pending_processes.popleft()
+
+        if not process.completed.value:
+          raise RuntimeError(
+              u'Export process: {0:s} (PID: {1:d}) did not complete.'.format(
+                  process.name, process.pid))
+
+        self._WriteExportedText(output_module, output_path)
+        os.remove(output_path)
+
+        self._number_of_consumed_events += (
+            process.number_of_consumed_events.value)
+        number_of_duplicate_events += process.number_of_duplicate_events.value
+        number_of_filtered_events += process.number_of_filtered_events.value
+
+    finally:
+      self._StopMonitoringProcesses()
+
+      # Terminate the export processes that are still running, for example
+      # if the export was aborted.
+      self._AbortTerminate()
+      self._AbortJoin(timeout=self._PROCESS_JOIN_TIMEOUT)
+
+      shutil.rmtree(temporary_directory, ignore_errors=True)
+
+    events_counter = collections.Counter()
+    events_counter[u'Events filtered'] = number_of_filtered_events
+    events_counter[u'Events processed'] = self._number_of_consumed_events
+
+    if number_of_duplicate_events:
+      events_counter[u'Duplicate events removed'] = number_of_duplicate_events
+
+    return events_counter
+
+  def _GetExportTimeRanges(
+      self, storage_reader, output_module, number_of_export_processes,
+      event_filter=None, storage_file_path=None, time_slice=None):
+    """Retrieves the time ranges to export using export processes.
+
+    Args:
+      storage_reader (StorageReader): storage reader.
+      output_module (OutputModule): output module.
+      number_of_export_processes (int): maximum number of export processes.
+      event_filter (Optional[FilterObject]): event filter.
+      storage_file_path (Optional[str]): path of the storage file.
+      time_slice (Optional[TimeSlice]): slice of time to output.
+
+    Returns:
+      list[TimeRange]: time ranges in chronological order or None if
+          the events should not be exported using export processes.
+    """
+    if number_of_export_processes <= 1 or not storage_file_path:
+      return
+
+    # A time slice and a filter limit depend on the events exported before,
+    # hence they cannot be applied by the export processes independently.
+    if time_slice or getattr(event_filter, u'limit', None):
+      return
+
+    if output_module.NAME not in self._PARALLEL_EXPORT_OUTPUT_MODULES:
+      logging.info((
+          u'Output module: {0:s} does not support export processes, '
+          u'exporting without.').format(output_module.NAME))
+      return
+
+    time_ranges = storage_reader.GetEventTimeRanges(
+        number_of_export_processes *
+        self._NUMBER_OF_TIME_RANGES_PER_EXPORT_PROCESS)
+    if not time_ranges or len(time_ranges) < 2:
+      return
+
+    return time_ranges
+
   def _StartAnalysisProcesses(
       self, knowledge_base_object, storage_writer, analysis_plugins,
       data_location, event_filter_expression=None):
@@ -365,6 +566,7 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       if self._use_zeromq:
         queue_name = u'{0:s} output event queue'.format(analysis_plugin.NAME)
         output_event_queue = zeromq_queue.ZeroMQPushBindQueue(
+            maximum_items=self._MAXIMUM_NUMBER_OF_QUEUED_EVENT_BATCHES,
             name=queue_name, timeout_seconds=self._QUEUE_TIMEOUT)
         # Open the queue so it can bind to a random port, and we can get the
         # port number to use in the input queue.
@@ -372,6 +574,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
       else:
         output_event_queue = multi_process_queue.MultiProcessingQueue(
+            maximum_number_of_queued_items=(
+                self._MAXIMUM_NUMBER_OF_QUEUED_EVENT_BATCHES),
             timeout=self._QUEUE_TIMEOUT)
 
       self._event_queues[analysis_plugin.NAME] = output_event_queue
@@ -379,7 +583,9 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       if self._use_zeromq:
         queue_name = u'{0:s} input event queue'.format(analysis_plugin.NAME)
         input_event_queue = zeromq_queue.ZeroMQPullConnectQueue(
-            name=queue_name, delay_open=True, port=output_event_queue.port,
+            delay_open=True,
+            maximum_items=self._MAXIMUM_NUMBER_OF_QUEUED_EVENT_BATCHES,
+            name=queue_name, port=output_event_queue.port,
             timeout_seconds=self._QUEUE_TIMEOUT)
 
       else:
@@ -448,9 +654,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         event_queue.Empty()
 
     # Wake the processes to make sure that they are not blocking
-    # waiting for the queue new items.
+    # waiting for the queue new items. Only block on a normal stop, since
+    # on abort the processes might no longer consume the bounded queues.
     for event_queue in self._event_queues.values():
-      event_queue.PushItem(plaso_queue.QueueAbort(), block=False)
+      event_queue.PushItem(plaso_queue.QueueAbort(), block=not abort)
 
     # Try waiting for the processes to exit normally.
     self._AbortJoin(timeout=self._PROCESS_JOIN_TIMEOUT)
@@ -538,6 +745,21 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         number_of_consumed_errors, number_of_produced_errors,
         number_of_consumed_reports, number_of_produced_reports)
 
+  def _WriteExportedText(self, output_module, path):
+    """Writes the text exported by an export process to the output.
+
+    Args:
+      output_module (LinearOutputModule): output module.
+      path (str): path of the file that contains the exported text.
+    """
+    with io.open(
+        path, 'r', encoding=export_process.ExportOutputWriter.ENCODING,
+        newline=u'') as file_object:
+      text = file_object.read(self._EXPORTED_TEXT_READ_SIZE)
+      while text:
+        output_module.WriteText(text)
+        text = file_object.read(self._EXPORTED_TEXT_READ_SIZE)
+
   def AnalyzeEvents(
       self, knowledge_base_object, storage_writer, data_location,
       analysis_plugins, event_filter=None, event_filter_expression=None,
@@ -619,10 +841,16 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
   def ExportEvents(
       self, knowledge_base_object, storage_reader, output_module,
-      deduplicate_events=True, event_filter=None, status_update_callback=None,
-      time_slice=None, use_time_slicer=False):
+      deduplicate_events=True, event_filter=None, number_of_export_processes=0,
+      status_update_callback=None, storage_file_path=None, time_slice=None,
+      use_time_slicer=False):
     """Exports events using an output module.
 
+    The events are exported using multiple export processes if the number
+    of export processes is larger than 1 and the storage file and output
+    module support it. Otherwise the events are exported by the engine
+    process.
+
     Args:
       knowledge_base_object (KnowledgeBase): contains information from
           the source data needed for processing.
@@ -631,8 +859,13 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
       event_filter (Optional[FilterObject]): event filter.
+      number_of_export_processes (Optional[int]): maximum number of export
+          processes, where 0 or 1 represents exporting without export
+          processes.
       status_update_callback (Optional[function]): callback function for status
           updates.
+      storage_file_path (Optional[str]): path of the storage file, which is
+          required to export events using export processes.
       time_slice (Optional[TimeSlice]): slice of time to output.
       use_time_slicer (Optional[bool]): True if the 'time slicer' should be
           used. The 'time slicer' will provide a context of events around
@@ -646,6 +879,11 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     storage_reader.ReadPreprocessingInformation(knowledge_base_object)
 
+    time_ranges = self._GetExportTimeRanges(
+        storage_reader, output_module, number_of_export_processes,
+        event_filter=event_filter, storage_file_path=storage_file_path,
+        time_slice=time_slice)
+
     event_buffer = output_event_buffer.EventBuffer(
         output_module, deduplicate_events)
 
@@ -653,9 +891,16 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     try:
       with event_buffer:
-        events_counter = self._ExportEvents(
-            storage_reader, event_buffer, event_filter=event_filter,
-            time_slice=time_slice, use_time_slicer=use_time_slicer)
+        if time_ranges:
+          events_counter = self._ExportEventsInParallel(
+              storage_file_path, time_ranges, output_module,
+              number_of_export_processes,
+              deduplicate_events=deduplicate_events, event_filter=event_filter)
+
+        else:
+          events_counter = self._ExportEvents(
+              storage_reader, event_buffer, event_filter=event_filter,
+              time_slice=time_slice, use_time_slicer=use_time_slicer)
 
     finally:
       # Stop the status update thread after close of the storage writer
@@ -5,6 +5,7 @@ import heapq
 import logging
 import multiprocessing
 import os
+import threading
 import time
 
 # The 'Queue' module was renamed to 'queue' in Python 3
@@ -30,7 +31,14 @@ from plaso.multi_processing import worker_process
 
 
 class _EventSourceHeap(object):
-  """Class that defines an event source heap."""
+  """Class that defines an event source heap.
+
+  The event sources are ordered by their estimated processing cost, where
+  directories are popped first, since these produce new event sources,
+  followed by files with the highest estimated processing cost. Event sources
+  with the same estimated processing cost are popped in the order they were
+  pushed.
+  """
 
   def __init__(self, maximum_number_of_items=50000):
     """Initializes an event source heap.
@@ -42,6 +50,23 @@ class _EventSourceHeap(object):
     super(_EventSourceHeap, self).__init__()
     self._heap = []
     self._maximum_number_of_items = maximum_number_of_items
+    self._number_of_pushed_items = 0
+
+  def _GetEventSourceCost(self, event_source):
+    """Estimates the processing cost of an event source.
+
+    Args:
+      event_source (EventSource): event source.
+
+    Returns:
+      int: estimated processing cost, where a higher value indicates
+          a higher cost.
+    """
+    file_size = getattr(event_source, u'file_size', None)
+    if file_size is None:
+      return 0
+
+    return file_size
 
   def PopEventSource(self):
     """Pops an event source from the heap.
@@ -50,7 +75,7 @@ class _EventSourceHeap(object):
       EventSource: event source.
     """
     try:
-      _, event_source = heapq.heappop(self._heap)
+      _, _, event_source = heapq.heappop(self._heap)
 
     except IndexError:
       return
@@ -69,12 +94,15 @@ class _EventSourceHeap(object):
     """
     if event_source.file_entry_type == (
         dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY):
-      weight = 1
+      weight = (0, 0)
     else:
-      weight = 100
+      # Negate the cost so that the event source with the highest cost
+      # is popped first.
+      weight = (1, -self._GetEventSourceCost(event_source))
 
-    heap_values = (weight, event_source)
+    heap_values = (weight, self._number_of_pushed_items, event_source)
     heapq.heappush(self._heap, heap_values)
+    self._number_of_pushed_items += 1
 
     if len(self._heap) >= self._maximum_number_of_items:
       raise errors.HeapFull()
@@ -88,15 +116,44 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
   * merge results returned by extraction workers.
   """
 
+  # Maximum size of a file in bytes that can be batched with other files
+  # into a single task.
+  _MAXIMUM_BATCH_FILE_SIZE = 256 * 1024
+
+  # Maximum combined size of the files in bytes batched into a single task.
+  _MAXIMUM_BATCH_SIZE = 4 * 1024 * 1024
+
+  # Maximum number of event sources batched into a single task.
+  _MAXIMUM_NUMBER_OF_BATCHED_EVENT_SOURCES = 64
+
   # Maximum number of attribute containers to merge per loop.
   _MAXIMUM_NUMBER_OF_CONTAINERS = 50
 
+  # Maximum number of attribute containers to merge per loop when merging
+  # in the merge thread.
+  _MAXIMUM_NUMBER_OF_CONTAINERS_MERGE_THREAD = 5000
+
+  # Number of seconds the merge thread waits when there is nothing to merge.
+  _MERGE_THREAD_SLEEP_TIME = 0.1
+
   # Maximum number of concurrent tasks.
   _MAXIMUM_NUMBER_OF_TASKS = 10000
 
+  # Maximum number of event sources that have been written by the collector
+  # thread but not yet scheduled, before the collector thread waits.
+  _MAXIMUM_NUMBER_OF_PENDING_EVENT_SOURCES = 50000
+
+  # Number of seconds the collector thread waits when the maximum number of
+  # pending event sources has been reached.
+  _COLLECTOR_THREAD_SLEEP_TIME = 0.1
+
   _PROCESS_JOIN_TIMEOUT = 5.0
   _PROCESS_WORKER_TIMEOUT = 15.0 * 60.0
 
+  # Number of seconds the task scheduler waits when it cannot make progress
+  # and merging is done by the merge thread.
+  _SCHEDULER_LOOP_SLEEP_TIME = 0.05
+
   _WORKER_PROCESSES_MINIMUM = 2
   _WORKER_PROCESSES_MAXIMUM = 15
 
@@ -108,7 +165,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       self, debug_output=False, enable_profiling=False,
       maximum_number_of_tasks=_MAXIMUM_NUMBER_OF_TASKS,
       profiling_directory=None, profiling_sample_rate=1000,
-      profiling_type=u'all', use_zeromq=True):
+      profiling_type=u'all', use_merge_thread=True, use_zeromq=True):
     """Initializes an engine object.
 
     Args:
@@ -129,6 +186,8 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
             the processing;
           * 'serializers' to profile CPU time consumed by individual
             serializers.
+      use_merge_thread (Optional[bool]): True if task storage should be merged
+          by a dedicated merge thread instead of by the task scheduler loop.
       use_zeromq (Optional[bool]): True if ZeroMQ should be used for queuing
           instead of Python's multiprocessing queue.
     """
@@ -137,6 +196,8 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
         profiling_directory=profiling_directory,
         profiling_sample_rate=profiling_sample_rate,
         profiling_type=profiling_type)
+    self._collector_thread = None
+    self._collector_thread_active = False
     self._enable_sigsegv_handler = False
     self._filter_find_specs = None
     self._filter_object = None
@@ -146,6 +207,8 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._memory_profiler = None
     self._merge_task = None
     self._merge_task_on_hold = None
+    self._merge_thread = None
+    self._merge_thread_active = False
     self._mount_path = None
     self._number_of_consumed_errors = 0
     self._number_of_consumed_event_tags = 0
@@ -164,22 +227,159 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._process_compressed_streams = True
     self._processing_profiler = None
     self._resolver_context = context.Context()
+    self._reuse_hashes = False
     self._serializers_profiler = None
     self._session_identifier = None
     self._status = definitions.PROCESSING_STATUS_IDLE
     self._storage_merge_reader = None
     self._storage_merge_reader_on_hold = None
     self._storage_writer = None
+    self._storage_writer_lock = threading.Lock()
     self._task_queue = None
     self._task_queue_port = None
     self._task_manager = task_manager.TaskManager(
         maximum_number_of_tasks=maximum_number_of_tasks)
     self._temporary_directory = None
     self._text_prepend = None
+    self._use_merge_thread = use_merge_thread
     self._use_zeromq = use_zeromq
     self._yara_rules_string = None
 
-  def _MergeTaskStorage(self, storage_writer):
+  def _CanBatchEventSource(self, event_source):
+    """Determines if an event source can be batched with other event sources.
+
+    Only files of which the size is known and small enough are batched,
+    larger files, such as Windows Registry files, SQLite databases or
+    pagefiles, and directories are processed in a task of their own.
+
+    Args:
+      event_source (EventSource): event source.
+
+    Returns:
+      bool: True if the event source can be batched.
+    """
+    if event_source.file_entry_type != dfvfs_definitions.FILE_ENTRY_TYPE_FILE:
+      return False
+
+    file_size = getattr(event_source, u'file_size', None)
+    if file_size is None:
+      return False
+
+    return file_size <= self._MAXIMUM_BATCH_FILE_SIZE
+
+  def _CreateTask(self, event_source, event_source_heap):
+    """Creates a task for an event source.
+
+    Small files are batched with other small files from the event source
+    heap into a single task, to reduce the overhead of creating, scheduling
+    and merging a task storage per file.
+
+    Args:
+      event_source (EventSource): event source.
+      event_source_heap (_EventSourceHeap): event source heap.
+
+    Returns:
+      tuple: containing:
+
+        Task: task.
+        EventSource: next event source, that was popped from the event source
+            heap but could not be batched into the task, or None.
+    """
+    task = self._task_manager.CreateTask(self._session_identifier)
+    task.file_entry_type = event_source.file_entry_type
+    task.path_spec = event_source.path_spec
+
+    if not self._CanBatchEventSource(event_source):
+      return task, None
+
+    path_specs = [event_source.path_spec]
+    batch_size = event_source.file_size
+
+    next_event_source = event_source_heap.PopEventSource()
+    while next_event_source:
+      if len(path_specs) >= self._MAXIMUM_NUMBER_OF_BATCHED_EVENT_SOURCES:
+        break
+
+      if not self._CanBatchEventSource(next_event_source):
+        break
+
+      if (batch_size + next_event_source.file_size >
+          self._MAXIMUM_BATCH_SIZE):
+        break
+
+      path_specs.append(next_event_source.path_spec)
+      batch_size += next_event_source.file_size
+
+      next_event_source = event_source_heap.PopEventSource()
+
+    if len(path_specs) > 1:
+      task.path_specs = path_specs
+
+    return task, next_event_source
+
+  def _CollectorThreadMain(
+      self, source_path_specs, storage_writer, filter_find_specs=None):
+    """Main function of the collector thread.
+
+    The collector thread extracts the path specifications from the sources
+    and writes them as event sources, while the task scheduler loop schedules
+    tasks for the event sources that already have been written.
+
+    Args:
+      source_path_specs (list[dfvfs.PathSpec]): path specifications of
+          the sources to process.
+      storage_writer (StorageWriter): storage writer for a session storage.
+      filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
+          used in path specification extraction.
+    """
+    logging.debug(u'Collector thread started')
+
+    try:
+      path_spec_extractor = extractors.PathSpecExtractor(
+          self._resolver_context)
+
+      for path_spec in path_spec_extractor.ExtractPathSpecs(
+          source_path_specs, find_specs=filter_find_specs,
+          recurse_file_system=False):
+        if self._abort:
+          break
+
+        # TODO: determine if event sources should be DataStream or FileEntry
+        # or both.
+        event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
+
+        with self._storage_writer_lock:
+          storage_writer.AddEventSource(event_source)
+
+          self._number_of_produced_sources = (
+              storage_writer.number_of_event_sources)
+
+        self._processing_status.number_of_skipped_duplicate_files = (
+            path_spec_extractor.number_of_skipped_duplicate_files)
+
+        # Bound the number of event sources that are pending scheduling.
+        while not self._abort and (
+            self._number_of_produced_sources -
+            self._number_of_consumed_sources >=
+            self._MAXIMUM_NUMBER_OF_PENDING_EVENT_SOURCES):
+          time.sleep(self._COLLECTOR_THREAD_SLEEP_TIME)
+
+    # All exceptions need to be caught here to prevent the scheduler from
+    # waiting on a collector thread that is no longer running. The processing
+    # is aborted since the collected event sources are incomplete.
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.error(
+          u'Collector thread stopped with error: {0!s}'.format(exception))
+      self._abort = True
+
+    finally:
+      self._collector_thread_active = False
+
+    logging.debug(u'Collector thread stopped')
+
+  def _MergeTaskStorage(
+      self, storage_writer,
+      maximum_number_of_containers=_MAXIMUM_NUMBER_OF_CONTAINERS):
     """Merges a task storage with the session storage.
 
     This function checks all task storages that are ready to merge and updates
@@ -189,6 +389,11 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     Args:
       storage_writer (StorageWriter): storage writer for a session storage used
           to merge task storage.
+      maximum_number_of_containers (Optional[int]): maximum number of
+          containers to merge, where 0 represent no limit.
+
+    Returns:
+      bool: True if a task storage was merged.
     """
     if self._processing_profiler:
       self._processing_profiler.StartTiming(u'merge_check')
@@ -208,59 +413,90 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if not self._storage_merge_reader_on_hold:
       task = self._task_manager.GetTaskPendingMerge(self._merge_task)
 
+    if not task and not self._storage_merge_reader:
+      return False
+
     # Limit the number of attributes containers from a single task-based
     # storage file that are merged per loop to keep tasks flowing.
-    if task or self._storage_merge_reader:
-      self._status = definitions.PROCESSING_STATUS_MERGING
+    self._status = definitions.PROCESSING_STATUS_MERGING
 
-      if self._processing_profiler:
-        self._processing_profiler.StartTiming(u'merge')
+    if self._processing_profiler:
+      self._processing_profiler.StartTiming(u'merge')
 
-      if task:
-        if self._storage_merge_reader:
-          self._merge_task_on_hold = self._merge_task
-          self._storage_merge_reader_on_hold = self._storage_merge_reader
+    if task:
+      if self._storage_merge_reader:
+        self._merge_task_on_hold = self._merge_task
+        self._storage_merge_reader_on_hold = self._storage_merge_reader
 
-        self._merge_task = task
-        try:
-          self._storage_merge_reader = storage_writer.StartMergeTaskStorage(
-              task)
-        except IOError as exception:
-          logging.error(
-              (u'Unable to merge results of task: {0:s} '
-               u'with error: {1:s}').format(
-                   task.identifier, exception))
-          self._storage_merge_reader = None
+      self._merge_task = task
+      try:
+        self._storage_merge_reader = storage_writer.StartMergeTaskStorage(
+            task)
+      except IOError as exception:
+        logging.error(
+            (u'Unable to merge results of task: {0:s} '
+             u'with error: {1:s}').format(
+                 task.identifier, exception))
+        self._storage_merge_reader = None
+
+    if self._storage_merge_reader:
+      fully_merged = self._storage_merge_reader.MergeAttributeContainers(
+          maximum_number_of_containers=maximum_number_of_containers)
+    else:
+      # TODO: Do something more sensible when this happens, perhaps
+      # retrying the task once that is implemented. For now, we mark the task
+      # as fully merged because we can't continue with it.
+      fully_merged = True
 
-      if self._storage_merge_reader:
-        fully_merged = self._storage_merge_reader.MergeAttributeContainers(
-            maximum_number_of_containers=self._MAXIMUM_NUMBER_OF_CONTAINERS)
+    if self._processing_profiler:
+      self._processing_profiler.StopTiming(u'merge')
+
+    if fully_merged:
+      self._task_manager.CompleteTask(self._merge_task)
+
+      if self._storage_merge_reader_on_hold:
+        self._merge_task = self._merge_task_on_hold
+        self._storage_merge_reader = self._storage_merge_reader_on_hold
+
+        self._merge_task_on_hold = None
+        self._storage_merge_reader_on_hold = None
       else:
-        # TODO: Do something more sensible when this happens, perhaps
-        # retrying the task once that is implemented. For now, we mark the task
-        # as fully merged because we can't continue with it.
-        fully_merged = True
+        self._merge_task = None
+        self._storage_merge_reader = None
 
-      if self._processing_profiler:
-        self._processing_profiler.StopTiming(u'merge')
+    self._status = definitions.PROCESSING_STATUS_RUNNING
+    self._number_of_produced_errors = storage_writer.number_of_errors
+    self._number_of_produced_events = storage_writer.number_of_events
+    self._number_of_produced_sources = storage_writer.number_of_event_sources
 
-      if fully_merged:
-        self._task_manager.CompleteTask(self._merge_task)
+    return True
 
-        if self._storage_merge_reader_on_hold:
-          self._merge_task = self._merge_task_on_hold
-          self._storage_merge_reader = self._storage_merge_reader_on_hold
+  def _MergeThreadMain(self):
+    """Main function of the merge thread.
 
-          self._merge_task_on_hold = None
-          self._storage_merge_reader_on_hold = None
-        else:
-          self._merge_task = None
-          self._storage_merge_reader = None
+    The merge thread merges task storage with the session storage so that
+    the task scheduler loop does not have to.
+    """
+    logging.debug(u'Merge thread started')
 
-      self._status = definitions.PROCESSING_STATUS_RUNNING
-      self._number_of_produced_errors = storage_writer.number_of_errors
-      self._number_of_produced_events = storage_writer.number_of_events
-      self._number_of_produced_sources = storage_writer.number_of_event_sources
+    try:
+      while self._merge_thread_active and not self._abort:
+        with self._storage_writer_lock:
+          is_merged = self._MergeTaskStorage(
+              self._storage_writer, maximum_number_of_containers=(
+                  self._MAXIMUM_NUMBER_OF_CONTAINERS_MERGE_THREAD))
+
+        if not is_merged:
+          time.sleep(self._MERGE_THREAD_SLEEP_TIME)
+
+    # All exceptions need to be caught here to prevent the scheduler from
+    # waiting on tasks that are pending merge and will never be merged.
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.error(
+          u'Merge thread stopped with error: {0!s}'.format(exception))
+      self._abort = True
+
+    logging.debug(u'Merge thread stopped')
 
   def _ProcessSources(
       self, source_path_specs, storage_writer, filter_find_specs=None):
@@ -289,22 +525,15 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._number_of_produced_reports = 0
     self._number_of_produced_sources = 0
 
-    path_spec_extractor = extractors.PathSpecExtractor(self._resolver_context)
-
-    for path_spec in path_spec_extractor.ExtractPathSpecs(
-        source_path_specs, find_specs=filter_find_specs,
-        recurse_file_system=False):
-      if self._abort:
-        break
-
-      # TODO: determine if event sources should be DataStream or FileEntry
-      # or both.
-      event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
-      storage_writer.AddEventSource(event_source)
+    # Tasks are scheduled while the sources are being collected.
+    self._StartCollectorThread(
+        source_path_specs, storage_writer, filter_find_specs=filter_find_specs)
 
-      self._number_of_produced_sources = storage_writer.number_of_event_sources
+    try:
+      self._ScheduleTasks(storage_writer)
 
-    self._ScheduleTasks(storage_writer)
+    finally:
+      self._StopCollectorThread()
 
     if self._abort:
       self._status = definitions.PROCESSING_STATUS_ABORTED
@@ -364,10 +593,11 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if self._processing_profiler:
       self._processing_profiler.StartTiming(u'get_event_source')
 
-    if start_with_first:
-      event_source = storage_writer.GetFirstWrittenEventSource()
-    else:
-      event_source = storage_writer.GetNextWrittenEventSource()
+    with self._storage_writer_lock:
+      if start_with_first:
+        event_source = storage_writer.GetFirstWrittenEventSource()
+      else:
+        event_source = storage_writer.GetNextWrittenEventSource()
 
     if self._processing_profiler:
       self._processing_profiler.StopTiming(u'get_event_source')
@@ -381,7 +611,8 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       if self._processing_profiler:
         self._processing_profiler.StartTiming(u'get_event_source')
 
-      event_source = storage_writer.GetNextWrittenEventSource()
+      with self._storage_writer_lock:
+        event_source = storage_writer.GetNextWrittenEventSource()
 
       if self._processing_profiler:
         self._processing_profiler.StopTiming(u'get_event_source')
@@ -413,42 +644,73 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     event_source = event_source_heap.PopEventSource()
 
-    while event_source or self._task_manager.HasActiveTasks():
-      if self._abort:
-        break
+    if self._use_merge_thread:
+      self._StartMergeThread()
 
-      try:
-        if event_source and not task:
-          task = self._task_manager.CreateTask(self._session_identifier)
-          task.file_entry_type = event_source.file_entry_type
-          task.path_spec = event_source.path_spec
-          event_source = None
+    is_collecting = self._collector_thread_active
+    has_active_tasks = self._task_manager.HasActiveTasks()
+
+    try:
+      while event_source or is_collecting or has_active_tasks:
+        if self._abort:
+          break
+
+        # Determine if the collector thread is active before filling the
+        # event source heap, so that the event sources it wrote last are
+        # scheduled before the loop ends.
+        is_collecting = self._collector_thread_active
+
+        try:
+          if event_source and not task:
+            task, event_source = self._CreateTask(
+                event_source, event_source_heap)
 
-          self._number_of_consumed_sources += 1
+            self._number_of_consumed_sources += len(task.GetPathSpecs())
 
-          if self._memory_profiler:
-            self._memory_profiler.Sample()
+            if self._memory_profiler:
+              self._memory_profiler.Sample()
 
-        if task:
-          if self._ScheduleTask(task):
-            task = None
+          if task:
+            if self._ScheduleTask(task):
+              task = None
 
-        self._MergeTaskStorage(storage_writer)
+          if not self._merge_thread:
+            self._MergeTaskStorage(storage_writer)
 
-        self._FillEventSourceHeap(storage_writer, event_source_heap)
+          # Determine if there are active tasks before filling the event
+          # source heap, so that the event sources the merge thread wrote
+          # when merging the last active task are scheduled before the loop
+          # ends.
+          has_active_tasks = self._task_manager.HasActiveTasks()
 
-        if not event_source and not task:
-          event_source = event_source_heap.PopEventSource()
+          self._FillEventSourceHeap(storage_writer, event_source_heap)
 
-      except KeyboardInterrupt:
-        self._abort = True
+          if not event_source and not task:
+            event_source = event_source_heap.PopEventSource()
 
-        self._processing_status.aborted = True
-        if self._status_update_callback:
-          self._status_update_callback(self._processing_status)
+          # Prevent the scheduler loop from competing with the merge thread
+          # while it is waiting on the workers or the merge thread.
+          if self._merge_thread and (task or not event_source):
+            time.sleep(self._SCHEDULER_LOOP_SLEEP_TIME)
+
+          # Prevent the scheduler loop from competing with the collector thread
+          # while it is waiting on new event sources.
+          elif is_collecting and not task and not event_source:
+            time.sleep(self._SCHEDULER_LOOP_SLEEP_TIME)
+
+        except KeyboardInterrupt:
+          self._abort = True
+
+          self._processing_status.aborted = True
+          if self._status_update_callback:
+            self._status_update_callback(self._processing_status)
+
+    finally:
+      if self._merge_thread:
+        self._StopMergeThread()
 
     for task in self._task_manager.GetAbandonedTasks():
-      self._processing_status.error_path_specs.append(task.path_spec)
+      self._processing_status.error_path_specs.extend(task.GetPathSpecs())
 
     self._status = definitions.PROCESSING_STATUS_IDLE
 
@@ -493,6 +755,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
         profiling_directory=self._profiling_directory,
         profiling_sample_rate=self._profiling_sample_rate,
         profiling_type=self._profiling_type,
+        reuse_hashes=self._reuse_hashes,
         temporary_directory=self._temporary_directory,
         text_prepend=self._text_prepend,
         yara_rules_string=self._yara_rules_string)
@@ -504,6 +767,31 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     return process
 
+  def _StartCollectorThread(
+      self, source_path_specs, storage_writer, filter_find_specs=None):
+    """Starts the collector thread.
+
+    Args:
+      source_path_specs (list[dfvfs.PathSpec]): path specifications of
+          the sources to process.
+      storage_writer (StorageWriter): storage writer for a session storage.
+      filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
+          used in path specification extraction.
+    """
+    self._collector_thread_active = True
+    self._collector_thread = threading.Thread(
+        name=u'Collector', target=self._CollectorThreadMain,
+        args=(source_path_specs, storage_writer),
+        kwargs={u'filter_find_specs': filter_find_specs})
+    self._collector_thread.start()
+
+  def _StartMergeThread(self):
+    """Starts the merge thread."""
+    self._merge_thread_active = True
+    self._merge_thread = threading.Thread(
+        name=u'Merge', target=self._MergeThreadMain)
+    self._merge_thread.start()
+
   def _StartProfiling(self):
     """Starts profiling."""
     if not self._enable_profiling:
@@ -536,6 +824,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
       display_name = getattr(self._merge_task, u'identifier', u'')
 
+      tasks_status = self._task_manager.GetStatusInformation()
+      self._processing_status.UpdateTasksStatus(tasks_status)
+
       self._processing_status.UpdateForemanStatus(
           self._name, self._status, self._pid, display_name,
           self._number_of_consumed_sources, self._number_of_produced_sources,
@@ -590,6 +881,22 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
       self._task_queue.Close(abort=True)
 
+  def _StopCollectorThread(self):
+    """Stops the collector thread."""
+    if self._collector_thread_active:
+      self._abort = True
+
+    if self._collector_thread.is_alive():
+      self._collector_thread.join()
+    self._collector_thread = None
+
+  def _StopMergeThread(self):
+    """Stops the merge thread."""
+    self._merge_thread_active = False
+    if self._merge_thread.is_alive():
+      self._merge_thread.join()
+    self._merge_thread = None
+
   def _StopProfiling(self):
     """Stops profiling."""
     if not self._enable_profiling:
@@ -699,9 +1006,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       filter_object=None, hasher_names_string=None, mount_path=None,
       number_of_worker_processes=0, parser_filter_expression=None,
       preferred_year=None, process_archives=False,
-      process_compressed_streams=True, status_update_callback=None,
-      show_memory_usage=False, temporary_directory=None, text_prepend=None,
-      yara_rules_string=None):
+      process_compressed_streams=True, reuse_hashes=False,
+      status_update_callback=None, show_memory_usage=False,
+      temporary_directory=None, text_prepend=None, yara_rules_string=None):
     """Processes the sources and extract event objects.
 
     Args:
@@ -725,6 +1032,8 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
           scanned for file entries.
       process_compressed_streams (Optional[bool]): True if file content in
           compressed streams should be processed.
+      reuse_hashes (Optional[bool]): True if the hashes of file content
+          that was already hashed should be reused.
       show_memory_usage (Optional[bool]): True if memory information should be
           included in status updates.
       status_update_callback (Optional[function]): callback function for status
@@ -775,6 +1084,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._preferred_year = preferred_year
     self._process_archives = process_archives
     self._process_compressed_streams = process_compressed_streams
+    self._reuse_hashes = reuse_hashes
     self._session_identifier = session_identifier
     self._status_update_callback = status_update_callback
     self._storage_writer = storage_writer
@@ -888,6 +1198,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._preferred_year = None
     self._process_archives = None
     self._process_compressed_streams = None
+    self._reuse_hashes = False
     self._session_identifier = None
     self._status_update_callback = None
     self._storage_writer = None
@@ -10,6 +10,7 @@ import time
 from dfvfs.lib import definitions as dfvfs_definitions
 
 from plaso.containers import tasks
+from plaso.engine import processing_status
 
 
 class _PendingMergeTaskHeap(object):
@@ -20,6 +21,11 @@ class _PendingMergeTaskHeap(object):
     super(_PendingMergeTaskHeap, self).__init__()
     self._heap = []
 
+  @property
+  def number_of_tasks(self):
+    """int: number of tasks on the heap."""
+    return len(self._heap)
+
   def PeekTask(self):
     """Retrieves the first task from the heap without removing it.
 
@@ -82,6 +88,8 @@ class TaskManager(object):
       completed.
   * completed: a worker has completed processing the task and the results
       have been merged with the session storage.
+  * merging: the results of the task are being merged with the session
+      storage.
   * pending_merge: a worker has completed processing the task and the results
       are ready to be merged with the session storage.
   * processing: a worker is processing the task.
@@ -104,6 +112,8 @@ class TaskManager(object):
     self._active_tasks = {}
     self._lock = threading.Lock()
     self._maximum_number_of_tasks = maximum_number_of_tasks
+    # Dictionary mapping task identifiers to tasks that are being merged.
+    self._tasks_merging = {}
     self._tasks_pending_merge = _PendingMergeTaskHeap()
     # Use ordered dictionaries to preserve the order in which tasks were added.
     # This dictionary maps task identifiers to tasks.
@@ -142,6 +152,7 @@ class TaskManager(object):
       logging.debug(u'Task {0:s} is complete'.format(
           task.identifier))
       del self._active_tasks[task.identifier]
+      self._tasks_merging.pop(task.identifier, None)
 
   def GetAbandonedTasks(self):
     """Retrieves all abandoned tasks.
@@ -172,15 +183,37 @@ class TaskManager(object):
       Task: the next task to merge or None if there is no task pending merge or
           with a higher priority.
     """
-    next_task = self._tasks_pending_merge.PeekTask()
-    if not next_task:
-      return
-
-    if current_task:
-      if next_task.merge_priority > current_task.merge_priority:
+    with self._lock:
+      next_task = self._tasks_pending_merge.PeekTask()
+      if not next_task:
         return
 
-    return self._tasks_pending_merge.PopTask()
+      if current_task:
+        if next_task.merge_priority > current_task.merge_priority:
+          return
+
+      next_task = self._tasks_pending_merge.PopTask()
+      self._tasks_merging[next_task.identifier] = next_task
+
+    return next_task
+
+  def GetStatusInformation(self):
+    """Retrieves status information about the tasks.
+
+    Returns:
+      TasksStatus: tasks status information.
+    """
+    tasks_status = processing_status.TasksStatus()
+
+    with self._lock:
+      tasks_status.number_of_abandoned_tasks = len(self._abandoned_tasks)
+      tasks_status.number_of_tasks_merging = len(self._tasks_merging)
+      tasks_status.number_of_tasks_pending_merge = (
+          self._tasks_pending_merge.number_of_tasks)
+      tasks_status.number_of_tasks_processing = len(self._tasks_processing)
+      tasks_status.total_number_of_tasks = len(self._active_tasks)
+
+    return tasks_status
 
   def HasActiveTasks(self):
     """Determines if there are active tasks.
@@ -24,7 +24,7 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
       hasher_names_string=None, mount_path=None, parser_filter_expression=None,
       preferred_year=None, process_archives=False,
       process_compressed_streams=True, profiling_directory=None,
-      profiling_sample_rate=1000, profiling_type=u'all',
+      profiling_sample_rate=1000, profiling_type=u'all', reuse_hashes=False,
       temporary_directory=None, text_prepend=None, yara_rules_string=None,
       **kwargs):
     """Initializes a worker process.
@@ -64,6 +64,8 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
             the processing;
           * 'serializers' to profile CPU time consumed by individual
             serializers.
+      reuse_hashes (Optional[bool]): True if the hashes of file content
+          that was already hashed should be reused.
       temporary_directory (Optional[str]): path of the directory for temporary
           files.
       text_prepend (Optional[str]): text to prepend to every event.
@@ -94,6 +96,7 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
     self._profiling_directory = profiling_directory
     self._profiling_sample_rate = profiling_sample_rate
     self._profiling_type = profiling_type
+    self._reuse_hashes = reuse_hashes
     self._serializers_profiler = None
     self._session_identifier = session_identifier
     self._status = definitions.PROCESSING_STATUS_INITIALIZED
@@ -177,7 +180,8 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
         process_compressed_streams=self._process_compressed_streams)
 
     if self._hasher_names_string:
-      self._extraction_worker.SetHashers(self._hasher_names_string)
+      self._extraction_worker.SetHashers(
+          self._hasher_names_string, reuse_hashes=self._reuse_hashes)
 
     if self._yara_rules_string:
       self._extraction_worker.SetYaraRules(self._yara_rules_string)
@@ -223,6 +227,7 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
       self._abort = True
 
     self._StopProfiling()
+    self._extraction_worker.Close()
     self._extraction_worker = None
     self._parser_mediator = None
     self._storage_writer = None
@@ -293,12 +298,16 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
 
     try:
       # TODO: add support for more task types.
-      self._ProcessPathSpec(
-          self._extraction_worker, self._parser_mediator, task.path_spec)
-      self._number_of_consumed_sources += 1
+      for path_spec in task.GetPathSpecs():
+        if self._abort:
+          break
+
+        self._ProcessPathSpec(
+            self._extraction_worker, self._parser_mediator, path_spec)
+        self._number_of_consumed_sources += 1
 
-      if self._memory_profiler:
-        self._memory_profiler.Sample()
+        if self._memory_profiler:
+          self._memory_profiler.Sample()
 
     finally:
       storage_writer.WriteTaskCompletion(aborted=self._abort)
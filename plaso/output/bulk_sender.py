@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""The background bulk sender."""
+
+import logging
+import threading
+import time
+
+try:
+  import Queue
+except ImportError:
+  import queue as Queue  # pylint: disable=import-error
+
+
+class SendResult(object):
+  """Class that defines the result of a batch that was partially sent.
+
+  Attributes:
+    number_of_failed_documents (int): number of documents that could not
+        be sent and should not be resent.
+    number_of_rejected_documents (int): number of documents in the rejected
+        batch.
+    rejected_batch (object): batch of the documents that were rejected with
+        a retryable error, such as an overloaded server, and should be resent
+        or None if there are no such documents.
+  """
+
+  def __init__(
+      self, number_of_failed_documents=0, number_of_rejected_documents=0,
+      rejected_batch=None):
+    """Initializes a send result.
+
+    Args:
+      number_of_failed_documents (Optional[int]): number of documents that
+          could not be sent and should not be resent.
+      number_of_rejected_documents (Optional[int]): number of documents in
+          the rejected batch.
+      rejected_batch (Optional[object]): batch of the documents that should
+          be resent.
+    """
+    super(SendResult, self).__init__()
+    self.number_of_failed_documents = number_of_failed_documents
+    self.number_of_rejected_documents = number_of_rejected_documents
+    self.rejected_batch = rejected_batch
+
+
+class BulkSender(object):
+  """Class that implements a background bulk sender.
+
+  The bulk sender sends batches of documents, such as Elasticsearch bulk
+  requests, from background threads, so that formatting events and sending
+  previous batches overlap. The number of queued batches is bounded, hence
+  adding a batch blocks while the sender threads are behind.
+
+  Batches that fail with a retryable error, such as an overloaded server or
+  a timeout, are retried after an exponentially increasing delay. The same
+  applies to the documents of a batch that were rejected individually.
+
+  Attributes:
+    number_of_batches (int): number of batches that were sent.
+    number_of_documents (int): number of documents that were sent.
+    number_of_failed_batches (int): number of batches that could not be sent.
+    number_of_failed_documents (int): number of documents of sent batches
+        that could not be sent.
+    number_of_retries (int): number of times a batch was resent.
+    total_latency (float): total number of seconds the successful send
+        requests took.
+  """
+
+  _MAXIMUM_NUMBER_OF_QUEUED_BATCHES = 16
+
+  _MAXIMUM_NUMBER_OF_RETRIES = 5
+
+  # Delays, in number of seconds, before retrying to send a batch.
+  _INITIAL_RETRY_DELAY = 1.0
+  _MAXIMUM_RETRY_DELAY = 60.0
+
+  def __init__(
+      self, send_function, is_retryable_function=None,
+      maximum_number_of_queued_batches=None, maximum_number_of_retries=None,
+      number_of_senders=2, retry_delay=None):
+    """Initializes a bulk sender.
+
+    Args:
+      send_function (function): function that sends a batch, which takes
+          the batch as its argument and returns a send result (SendResult)
+          if only part of the batch was sent or None otherwise.
+      is_retryable_function (Optional[function]): function that determines if
+          sending a batch should be retried, which takes the exception raised
+          by the send function as its argument and returns a boolean. None
+          represents that sending a batch is never retried.
+      maximum_number_of_queued_batches (Optional[int]): maximum number of
+          batches that are queued before adding a batch blocks.
+      maximum_number_of_retries (Optional[int]): maximum number of times
+          sending a batch is retried.
+      number_of_senders (Optional[int]): number of sender threads, which is
+          the maximum number of concurrent send requests.
+      retry_delay (Optional[float]): initial number of seconds to wait before
+          retrying to send a batch, which doubles with every retry.
+    """
+    super(BulkSender, self).__init__()
+    self._exception = None
+    self._is_retryable_function = is_retryable_function
+    self._lock = threading.Lock()
+    self._maximum_number_of_retries = maximum_number_of_retries
+    if self._maximum_number_of_retries is None:
+      self._maximum_number_of_retries = self._MAXIMUM_NUMBER_OF_RETRIES
+    self._number_of_senders = number_of_senders
+    self._queue = Queue.Queue(
+        maxsize=(maximum_number_of_queued_batches or
+                 self._MAXIMUM_NUMBER_OF_QUEUED_BATCHES))
+    self._retry_delay = retry_delay or self._INITIAL_RETRY_DELAY
+    self._send_function = send_function
+    self._start_time = None
+    self._threads = []
+
+    self.number_of_batches = 0
+    self.number_of_documents = 0
+    self.number_of_failed_batches = 0
+    self.number_of_failed_documents = 0
+    self.number_of_retries = 0
+    self.total_latency = 0.0
+
+  def _RaiseIfFailed(self):
+    """Raises if a batch could not be sent.
+
+    Raises:
+      RuntimeError: if a batch could not be sent.
+    """
+    if self._exception:
+      raise RuntimeError(u'Unable to send batch with error: {0!s}'.format(
+          self._exception))
+
+  def _SendBatch(self, batch, number_of_documents):
+    """Sends a batch.
+
+    Args:
+      batch (object): batch.
+      number_of_documents (int): number of documents in the batch.
+    """
+    retry_delay = self._retry_delay
+    number_of_failed_documents = 0
+    number_of_pending_documents = number_of_documents
+    number_of_retries = 0
+
+    while True:
+      start_time = time.time()
+      try:
+        send_result = self._send_function(batch)
+
+      # Every exception is caught, to prevent it from terminating the sender
+      # thread. The exception is raised in the thread that adds the batches.
+      except Exception as exception:  # pylint: disable=broad-except
+        is_retryable = (
+            self._is_retryable_function and
+            self._is_retryable_function(exception))
+
+        if (not is_retryable or
+            number_of_retries >= self._maximum_number_of_retries):
+          logging.error((
+              u'Unable to send batch of {0:d} documents with error: '
+              u'{1!s}').format(number_of_pending_documents, exception))
+
+          with self._lock:
+            self.number_of_failed_batches += 1
+            if not self._exception:
+              self._exception = exception
+          return
+
+        logging.warning((
+            u'Unable to send batch of {0:d} documents with error: {1!s} '
+            u'retrying in {2:.1f} seconds.').format(
+                number_of_pending_documents, exception, retry_delay))
+
+      else:
+        if not send_result:
+          break
+
+        number_of_failed_documents += send_result.number_of_failed_documents
+
+        if send_result.rejected_batch is None:
+          break
+
+        if number_of_retries >= self._maximum_number_of_retries:
+          logging.error((
+              u'Unable to send {0:d} rejected documents of batch after {1:d} '
+              u'retries.').format(
+                  send_result.number_of_rejected_documents, number_of_retries))
+
+          number_of_failed_documents += (
+              send_result.number_of_rejected_documents)
+          break
+
+        # Only the rejected documents are resent.
+        batch = send_result.rejected_batch
+        number_of_pending_documents = send_result.number_of_rejected_documents
+
+        logging.warning((
+            u'{0:d} documents of batch were rejected, retrying in {1:.1f} '
+            u'seconds.').format(number_of_pending_documents, retry_delay))
+
+      time.sleep(retry_delay)
+      retry_delay = min(retry_delay * 2, self._MAXIMUM_RETRY_DELAY)
+      number_of_retries += 1
+
+      with self._lock:
+        self.number_of_retries += 1
+
+    latency = time.time() - start_time
+
+    with self._lock:
+      self.number_of_batches += 1
+      self.number_of_documents += (
+          number_of_documents - number_of_failed_documents)
+      self.number_of_failed_documents += number_of_failed_documents
+      self.total_latency += latency
+
+    logging.debug(u'Sent batch of {0:d} documents in {1:.3f} seconds.'.format(
+        number_of_documents, latency))
+
+  def _ThreadMain(self):
+    """The main function of the sender threads."""
+    while True:
+      queued_item = self._queue.get()
+      try:
+        # None signals the sender thread to stop.
+        if queued_item is None:
+          break
+
+        batch, number_of_documents = queued_item
+        self._SendBatch(batch, number_of_documents)
+
+      finally:
+        self._queue.task_done()
+
+  def AddBatch(self, batch, number_of_documents):
+    """Adds a batch to be sent.
+
+    Blocks while the maximum number of batches is queued.
+
+    Args:
+      batch (object): batch.
+      number_of_documents (int): number of documents in the batch.
+
+    Raises:
+      RuntimeError: if a previously added batch could not be sent.
+    """
+    self._RaiseIfFailed()
+
+    if not self._threads:
+      self.Start()
+
+    self._queue.put((batch, number_of_documents))
+
+  def Flush(self):
+    """Waits for all the added batches to be sent.
+
+    Raises:
+      RuntimeError: if an added batch could not be sent.
+    """
+    self._queue.join()
+    self._RaiseIfFailed()
+
+  def GetAverageLatency(self):
+    """Determines the average latency of the send requests.
+
+    Returns:
+      float: average number of seconds a successful send request took.
+    """
+    if not self.number_of_batches:
+      return 0.0
+
+    return self.total_latency / self.number_of_batches
+
+  def GetDocumentsPerSecond(self):
+    """Determines the number of documents sent per second.
+
+    Returns:
+      float: number of documents sent per second since the sender threads
+          were started.
+    """
+    if not self._start_time:
+      return 0.0
+
+    elapsed_time = time.time() - self._start_time
+    if elapsed_time <= 0:
+      return 0.0
+
+    return self.number_of_documents / elapsed_time
+
+  def Start(self):
+    """Starts the sender threads."""
+    self._start_time = time.time()
+
+    for _ in range(self._number_of_senders):
+      thread = threading.Thread(name=u'BulkSender', target=self._ThreadMain)
+      # Daemon threads do not prevent the process from exiting.
+      thread.daemon = True
+      thread.start()
+      self._threads.append(thread)
+
+  def Stop(self):
+    """Sends the added batches and stops the sender threads.
+
+    Raises:
+      RuntimeError: if an added batch could not be sent.
+    """
+    for _ in self._threads:
+      self._queue.put(None)
+
+    for thread in self._threads:
+      thread.join()
+
+    self._threads = []
+
+    self._RaiseIfFailed()
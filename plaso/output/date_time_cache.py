@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""The date and time rendering cache."""
+
+import bisect
+import datetime
+
+import pytz  # pylint: disable=wrong-import-order
+
+
+class DateTimeValues(object):
+  """Class that contains the date and time values of a second.
+
+  Attributes:
+    date_string (str): date formatted as "YYYY-MM-DD".
+    day_of_month (int): day of month.
+    hours (int): hours.
+    minutes (int): minutes.
+    month (int): month.
+    seconds (int): seconds.
+    time_string (str): time formatted as "hh:mm:ss".
+    utc_offset_string (str): offset to UTC formatted as "+hh:mm".
+    year (int): year.
+  """
+
+  __slots__ = [
+      u'date_string', u'day_of_month', u'hours', u'minutes', u'month',
+      u'seconds', u'time_string', u'utc_offset_string', u'year']
+
+  def __init__(self, datetime_object, utc_offset):
+    """Initializes date and time values.
+
+    Args:
+      datetime_object (datetime.datetime): date and time in local time,
+          without microseconds.
+      utc_offset (datetime.timedelta): offset of local time to UTC.
+    """
+    super(DateTimeValues, self).__init__()
+    self.day_of_month = datetime_object.day
+    self.hours = datetime_object.hour
+    self.minutes = datetime_object.minute
+    self.month = datetime_object.month
+    self.seconds = datetime_object.second
+    self.year = datetime_object.year
+
+    self.date_string = u'{0:04d}-{1:02d}-{2:02d}'.format(
+        self.year, self.month, self.day_of_month)
+    self.time_string = u'{0:02d}:{1:02d}:{2:02d}'.format(
+        self.hours, self.minutes, self.seconds)
+
+    # The UTC offset is formatted in the same way as datetime.isoformat().
+    utc_offset_seconds = utc_offset.days * 86400 + utc_offset.seconds
+    if utc_offset_seconds < 0:
+      sign = u'-'
+      utc_offset_seconds = -utc_offset_seconds
+    else:
+      sign = u'+'
+
+    utc_offset_minutes, utc_offset_seconds = divmod(utc_offset_seconds, 60)
+    utc_offset_hours, utc_offset_minutes = divmod(utc_offset_minutes, 60)
+    self.utc_offset_string = u'{0:s}{1:02d}:{2:02d}'.format(
+        sign, utc_offset_hours, utc_offset_minutes)
+    if utc_offset_seconds:
+      self.utc_offset_string = u'{0:s}:{1:02d}'.format(
+          self.utc_offset_string, utc_offset_seconds)
+
+
+class DateTimeCache(object):
+  """Class that implements a date and time rendering cache.
+
+  Output modules typically format the timestamp of an event into several
+  fields and the events are output in chronological order, so many
+  consecutive events share the same second. The cache converts a timestamp
+  into local time only once per second and adds the microseconds to
+  the cached date and time values when formatting.
+
+  The offset of local time to UTC is determined by a binary search of
+  the UTC transition times of the timezone instead of localizing every
+  timestamp.
+  """
+
+  _EPOCH = datetime.datetime(1970, 1, 1)
+
+  _MAXIMUM_NUMBER_OF_CACHED_VALUES = 1024
+
+  _MICRO_SECONDS_PER_SECOND = 1000000
+
+  def __init__(self, timezone=pytz.UTC):
+    """Initializes a date and time rendering cache.
+
+    Args:
+      timezone (Optional[pytz.timezone]): timezone.
+    """
+    super(DateTimeCache, self).__init__()
+    self._date_time_values = {}
+    self._timezone = None
+    self._transition_timestamps = None
+    self._transition_utc_offsets = None
+    self._utc_offset = None
+
+    self.SetTimezone(timezone)
+
+  def _GetDateTimeValues(self, timestamp):
+    """Retrieves the date and time values of the second of a timestamp.
+
+    Args:
+      timestamp (int): number of microseconds since January 1, 1970,
+          00:00:00 UTC.
+
+    Returns:
+      tuple[DateTimeValues, int]: date and time values of the second and
+          the number of microseconds within the second.
+
+    Raises:
+      OverflowError: if the timestamp cannot be represented in local time.
+    """
+    posix_time, microseconds = divmod(
+        timestamp, self._MICRO_SECONDS_PER_SECOND)
+
+    date_time_values = self._date_time_values.get(posix_time, None)
+    if not date_time_values:
+      utc_offset = self._GetUTCOffset(posix_time)
+
+      try:
+        datetime_object = self._EPOCH + datetime.timedelta(
+            seconds=posix_time)
+        datetime_object += utc_offset
+      except OverflowError as exception:
+        raise OverflowError((
+            u'Unable to copy timestamp: {0:d} to local time with error: '
+            u'{1!s}').format(timestamp, exception))
+
+      date_time_values = DateTimeValues(datetime_object, utc_offset)
+
+      if (len(self._date_time_values) >=
+          self._MAXIMUM_NUMBER_OF_CACHED_VALUES):
+        self._date_time_values = {}
+
+      self._date_time_values[posix_time] = date_time_values
+
+    return date_time_values, microseconds
+
+  def _GetUTCOffset(self, posix_time):
+    """Retrieves the offset of local time to UTC.
+
+    Args:
+      posix_time (int): number of seconds since January 1, 1970,
+          00:00:00 UTC.
+
+    Returns:
+      datetime.timedelta: offset of local time to UTC.
+    """
+    if not self._transition_timestamps:
+      return self._utc_offset
+
+    transition_index = bisect.bisect_right(
+        self._transition_timestamps, posix_time) - 1
+    return self._transition_utc_offsets[max(transition_index, 0)]
+
+  def GetDateString(self, timestamp):
+    """Retrieves the date of a timestamp in local time.
+
+    Args:
+      timestamp (int): number of microseconds since January 1, 1970,
+          00:00:00 UTC.
+
+    Returns:
+      str: date formatted as "YYYY-MM-DD".
+
+    Raises:
+      OverflowError: if the timestamp cannot be represented in local time.
+    """
+    date_time_values, _ = self._GetDateTimeValues(timestamp)
+    return date_time_values.date_string
+
+  def GetDateTimeValues(self, timestamp):
+    """Retrieves the date and time values of a timestamp in local time.
+
+    Args:
+      timestamp (int): number of microseconds since January 1, 1970,
+          00:00:00 UTC.
+
+    Returns:
+      DateTimeValues: date and time values of the second of the timestamp.
+
+    Raises:
+      OverflowError: if the timestamp cannot be represented in local time.
+    """
+    date_time_values, _ = self._GetDateTimeValues(timestamp)
+    return date_time_values
+
+  def GetISO8601String(self, timestamp):
+    """Retrieves the date and time of a timestamp in local time.
+
+    Args:
+      timestamp (int): number of microseconds since January 1, 1970,
+          00:00:00 UTC.
+
+    Returns:
+      str: date and time formatted in ISO 8601 format, the same as
+          datetime.isoformat().
+
+    Raises:
+      OverflowError: if the timestamp cannot be represented in local time.
+    """
+    date_time_values, microseconds = self._GetDateTimeValues(timestamp)
+
+    # Similar to datetime.isoformat() the fraction of second is only
+    # included if it is not 0.
+    if not microseconds:
+      return u''.join([
+          date_time_values.date_string, u'T', date_time_values.time_string,
+          date_time_values.utc_offset_string])
+
+    return u''.join([
+        date_time_values.date_string, u'T', date_time_values.time_string,
+        u'.', u'{0:06d}'.format(microseconds),
+        date_time_values.utc_offset_string])
+
+  def GetTimeString(self, timestamp):
+    """Retrieves the time of a timestamp in local time.
+
+    Args:
+      timestamp (int): number of microseconds since January 1, 1970,
+          00:00:00 UTC.
+
+    Returns:
+      str: time formatted as "hh:mm:ss".
+
+    Raises:
+      OverflowError: if the timestamp cannot be represented in local time.
+    """
+    date_time_values, _ = self._GetDateTimeValues(timestamp)
+    return date_time_values.time_string
+
+  def SetTimezone(self, timezone):
+    """Sets the timezone.
+
+    Args:
+      timezone (pytz.timezone): timezone.
+    """
+    self._date_time_values = {}
+    self._timezone = timezone
+    self._transition_timestamps = None
+    self._transition_utc_offsets = None
+    self._utc_offset = None
+
+    # The UTC transition times and the corresponding transition information
+    # are only defined by timezones with daylight saving time or other
+    # changes of the offset to UTC.
+    utc_transition_times = getattr(timezone, u'_utc_transition_times', None)
+    transition_info = getattr(timezone, u'_transition_info', None)
+
+    if utc_transition_times and transition_info:
+      self._transition_timestamps = []
+      for utc_transition_time in utc_transition_times:
+        time_delta = utc_transition_time - self._EPOCH
+        self._transition_timestamps.append(
+            time_delta.days * 86400 + time_delta.seconds)
+
+      self._transition_utc_offsets = [
+          utc_offset for utc_offset, _, _ in transition_info]
+
+    else:
+      self._utc_offset = timezone.utcoffset(self._EPOCH)
@@ -5,7 +5,6 @@ import logging
 
 from plaso.lib import errors
 from plaso.lib import py2to3
-from plaso.lib import timelib
 from plaso.output import interface
 from plaso.output import manager
 
@@ -57,20 +56,16 @@ class DynamicFieldsHelper(object):
       str: date field.
     """
     try:
-      date_use = timelib.Timestamp.CopyToDatetime(
-          event.timestamp, self._output_mediator.timezone,
-          raise_error=True)
+      return self._output_mediator.date_time_cache.GetDateString(
+          event.timestamp)
     except OverflowError as exception:
       self._ReportEventError(event, (
           u'unable to copy timestamp: {0:d} to a human readable date '
-          u'with error: {1:s}. Defaulting to: "0000-00-00"').format(
+          u'with error: {1!s}. Defaulting to: "0000-00-00"').format(
               event.timestamp, exception))
 
       return u'0000-00-00'
 
-    return u'{0:04d}-{1:02d}-{2:02d}'.format(
-        date_use.year, date_use.month, date_use.day)
-
   def _FormatDateTime(self, event):
     """Formats the date and time in ISO 8601 format.
 
@@ -81,14 +76,13 @@ class DynamicFieldsHelper(object):
       str: date and time field.
     """
     try:
-      return timelib.Timestamp.CopyToIsoFormat(
-          event.timestamp, timezone=self._output_mediator.timezone,
-          raise_error=True)
+      return self._output_mediator.date_time_cache.GetISO8601String(
+          event.timestamp)
 
     except OverflowError as exception:
       self._ReportEventError(event, (
           u'unable to copy timestamp: {0:d} to a human readable date and time '
-          u'with error: {1:s}. Defaulting to: "0000-00-00T00:00:00"').format(
+          u'with error: {1!s}. Defaulting to: "0000-00-00T00:00:00"').format(
               event.timestamp, exception))
 
       return u'0000-00-00T00:00:00'
@@ -244,20 +238,16 @@ class DynamicFieldsHelper(object):
       str: time field.
     """
     try:
-      date_use = timelib.Timestamp.CopyToDatetime(
-          event.timestamp, self._output_mediator.timezone,
-          raise_error=True)
+      return self._output_mediator.date_time_cache.GetTimeString(
+          event.timestamp)
     except OverflowError as exception:
       self._ReportEventError(event, (
           u'unable to copy timestamp: {0:d} to a human readable time '
-          u'with error: {1:s}. Defaulting to: "00:00:00"').format(
+          u'with error: {1!s}. Defaulting to: "00:00:00"').format(
               event.timestamp, exception))
 
       return u'00:00:00'
 
-    return u'{0:02d}:{1:02d}:{2:02d}'.format(
-        date_use.hour, date_use.minute, date_use.second)
-
   def _FormatTimestampDescription(self, event):
     """Formats the timestamp description.
 
@@ -9,11 +9,14 @@ from dfvfs.serializer.json_serializer import JsonPathSpecSerializer
 try:
   from elasticsearch import Elasticsearch
   from elasticsearch.exceptions import ConnectionError
+  from elasticsearch.exceptions import ConnectionTimeout
 except ImportError:
   Elasticsearch = None
+  ConnectionTimeout = None
 
 from plaso.lib import errors
 from plaso.lib import timelib
+from plaso.output import bulk_sender
 from plaso.output import interface
 from plaso.output import manager
 
@@ -23,10 +26,19 @@ elastic_logger.setLevel(logging.WARNING)
 
 
 class ElasticSearchHelper(object):
-  """Elasticsearch helper class."""
+  """Elasticsearch helper class.
+
+  The bulk insert requests are sent by a background bulk sender, so that
+  formatting events and indexing previously formatted events overlap.
+  """
+
+  # The HTTP status code Elasticsearch returns when it is overloaded,
+  # for example when its bulk queue is full.
+  _HTTP_STATUS_TOO_MANY_REQUESTS = 429
+
   def __init__(
       self, output_mediator, host, port, flush_interval, index_name, mapping,
-      doc_type):
+      doc_type, number_of_bulk_requests=2):
     """Create a Elasticsearch helper.
 
     Args:
@@ -37,6 +49,8 @@ class ElasticSearchHelper(object):
       index_name (str): Name of the Elasticsearch index.
       mapping (dict): Elasticsearch index configuration.
       doc_type (str): Elasticsearch document type name.
+      number_of_bulk_requests (Optional[int]): maximum number of concurrent
+          bulk insert requests.
     """
     super(ElasticSearchHelper, self).__init__()
     self.client = Elasticsearch([{u'host': host, u'port': port}])
@@ -46,13 +60,17 @@ class ElasticSearchHelper(object):
     self._flush_interval = flush_interval
     self._events = []
     self._counter = Counter()
+    self._bulk_sender = bulk_sender.BulkSender(
+        self._SendBulkRequest, is_retryable_function=self._IsRetryableError,
+        number_of_senders=number_of_bulk_requests)
 
   def AddEvent(self, event_object, force_flush=False):
     """Index event in Elasticsearch.
 
     Args:
       event_object (EventObject): the event object.
-      force_flush (bool): Force bulk insert of events in the queue.
+      force_flush (bool): Force bulk insert of events in the queue and wait
+          for all the bulk inserts to complete.
     """
     if event_object:
       self._events.append(
@@ -64,6 +82,26 @@ class ElasticSearchHelper(object):
     if force_flush or self._counter[u'events'] % self._flush_interval == 0:
       self._FlushEventsToElasticSearch()
 
+    if force_flush:
+      self._bulk_sender.Flush()
+
+  def Close(self):
+    """Sends any remaining queued events and stops the bulk sender."""
+    self._FlushEventsToElasticSearch()
+    self._bulk_sender.Stop()
+
+    logging.info((
+        u'{0:d} events added in {1:d} bulk requests, {2:.1f} events per '
+        u'second, average bulk request latency: {3:.3f} seconds').format(
+            self._bulk_sender.number_of_documents,
+            self._bulk_sender.number_of_batches,
+            self._bulk_sender.GetDocumentsPerSecond(),
+            self._bulk_sender.GetAverageLatency()))
+
+    if self._bulk_sender.number_of_failed_documents:
+      logging.error(u'{0:d} events could not be added.'.format(
+          self._bulk_sender.number_of_failed_documents))
+
   def _EnsureIndexExists(self, index_name, mapping):
     """Create Elasticsearch index.
 
@@ -97,7 +135,8 @@ class ElasticSearchHelper(object):
       Dictionary with sanitized event object values.
     """
     event_values = {}
-    for attribute_name, attribute_value in event_object.GetAttributes():
+    for attribute_name, attribute_value in iter(
+        self._output_mediator.GetEventValues(event_object).items()):
       # Ignore the regvalue attribute as it cause issues when indexing
       if attribute_name == u'regvalue':
         continue
@@ -142,17 +181,79 @@ class ElasticSearchHelper(object):
     return event_values
 
   def _FlushEventsToElasticSearch(self):
-    """Insert events in bulk to Elasticsearch."""
+    """Queues the events for bulk insert to Elasticsearch."""
+    if not self._events:
+      return
+
+    # Every event consists of an index action and the event values.
+    number_of_events = len(self._events) // 2
+    self._bulk_sender.AddBatch(self._events, number_of_events)
+
+    # Clear the events list
+    self._events = []
+    logging.info(u'{0:d} events queued'.format(self._counter[u'events']))
+
+  def _IsRetryableError(self, exception):
+    """Determines if a bulk insert should be retried after an error.
+
+    Args:
+      exception (Exception): exception raised by the bulk insert.
+
+    Returns:
+      bool: True if Elasticsearch is overloaded or the bulk insert timed out.
+    """
+    if ConnectionTimeout and isinstance(exception, ConnectionTimeout):
+      return True
+
+    status_code = getattr(exception, u'status_code', None)
+    return status_code == self._HTTP_STATUS_TOO_MANY_REQUESTS
+
+  def _SendBulkRequest(self, events):
+    """Inserts events in bulk to Elasticsearch.
+
+    Called from the bulk sender threads.
+
+    Args:
+      events (list[dict]): index actions and event values.
+
+    Returns:
+      SendResult: result of the events that were not inserted or None if
+          all the events were inserted.
+    """
     try:
-      self.client.bulk(
-          index=self._index, doc_type=self._doc_type, body=self._events)
+      response = self.client.bulk(
+          index=self._index, doc_type=self._doc_type, body=events)
     except ValueError as e:
       # Ignore problematic events
       logging.warning(u'{0:s}'.format(e))
+      return
 
-    # Clear the events list
-    self._events = []
-    logging.info(u'{0:d} events added'.format(self._counter[u'events']))
+    if not response or not response.get(u'errors', False):
+      return
+
+    number_of_failed_events = 0
+    rejected_events = []
+
+    # The items of the response correspond to the index actions of the
+    # request, where every event consists of an index action and the event
+    # values.
+    for item_index, item in enumerate(response.get(u'items', [])):
+      item_result = item.get(u'index', {})
+      if u'error' not in item_result:
+        continue
+
+      if item_result.get(u'status') == self._HTTP_STATUS_TOO_MANY_REQUESTS:
+        rejected_events.extend(events[item_index * 2:(item_index + 1) * 2])
+      else:
+        logging.warning(u'Unable to index event with error: {0!s}'.format(
+            item_result[u'error']))
+        number_of_failed_events += 1
+
+    number_of_rejected_events = len(rejected_events) // 2
+    return bulk_sender.SendResult(
+        number_of_failed_documents=number_of_failed_events,
+        number_of_rejected_documents=number_of_rejected_events,
+        rejected_batch=rejected_events or None)
 
 
 class ElasticSearchOutputModule(interface.OutputModule):
@@ -178,6 +279,7 @@ class ElasticSearchOutputModule(interface.OutputModule):
     self._host = None
     self._index_name = None
     self._mapping = None
+    self._number_of_bulk_requests = 2
     self._output_mediator = output_mediator
     self._port = None
     self._raw_fields = False
@@ -185,9 +287,10 @@ class ElasticSearchOutputModule(interface.OutputModule):
   def Close(self):
     """Close connection to the Elasticsearch database.
 
-    Sends any remaining buffered events for indexing.
+    Sends any remaining buffered events for indexing and waits for
+    the indexing to complete.
     """
-    self._elastic.AddEvent(event_object=None, force_flush=True)
+    self._elastic.Close()
 
   def SetServerInformation(self, server, port):
     """Set the Elasticsearch server information.
@@ -210,6 +313,17 @@ class ElasticSearchOutputModule(interface.OutputModule):
     self._flush_interval = flush_interval
     logging.info(u'Flush interval: {0:d}'.format(self._flush_interval))
 
+  def SetNumberOfBulkRequests(self, number_of_bulk_requests):
+    """Set the number of concurrent bulk insert requests.
+
+    Args:
+      number_of_bulk_requests (int): maximum number of bulk insert requests
+          that are sent concurrently.
+    """
+    self._number_of_bulk_requests = number_of_bulk_requests
+    logging.info(u'Number of concurrent bulk requests: {0:d}'.format(
+        self._number_of_bulk_requests))
+
   def SetIndexName(self, index_name):
     """Set the index name.
 
@@ -277,7 +391,8 @@ class ElasticSearchOutputModule(interface.OutputModule):
 
     self._elastic = ElasticSearchHelper(
         self._output_mediator, self._host, self._port, self._flush_interval,
-        self._index_name, self._mapping, self._doc_type)
+        self._index_name, self._mapping, self._doc_type,
+        number_of_bulk_requests=self._number_of_bulk_requests)
     logging.info(u'Adding events to Elasticsearch..')
 
 
@@ -72,7 +72,8 @@ class EventBuffer(object):
 
   _JOIN_ATTRIBUTES = frozenset([u'display_name', u'filename', u'inode'])
 
-  def __init__(self, output_module, check_dedups=True):
+  def __init__(
+      self, output_module, check_dedups=True, write_header_and_footer=True):
     """Initializes an event buffer object.
 
     This class is used for buffering up events for duplicate removals
@@ -83,12 +84,18 @@ class EventBuffer(object):
       output_module (OutputModule): output module.
       check_dedups (Optional[bool]): True if the event buffer should check and
           merge duplicate events.
+      write_header_and_footer (Optional[bool]): True if the header and footer
+          should be written by the output module. False is used to write
+          a part of the output, such as in a parallel export process.
     """
     self._current_timestamp = 0
     self._events_per_key = {}
     self._output_module = output_module
     self._output_module.Open()
-    self._output_module.WriteHeader()
+    self._write_header_and_footer = write_header_and_footer
+
+    if self._write_header_and_footer:
+      self._output_module.WriteHeader()
 
     self.check_dedups = check_dedups
     self.duplicate_counter = 0
@@ -131,7 +138,8 @@ class EventBuffer(object):
     self.Flush()
 
     if self._output_module:
-      self._output_module.WriteFooter()
+      if self._write_header_and_footer:
+        self._output_module.WriteFooter()
       self._output_module.Close()
 
   def Flush(self):
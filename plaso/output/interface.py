@@ -81,14 +81,20 @@ class OutputModule(object):
     Args:
       event (EventObject): event.
     """
-    self.WriteEventStart()
+    self._output_mediator.StartEventRendering(event)
 
     try:
-      self.WriteEventBody(event)
-    except errors.NoFormatterFound:
-      self._ReportEventError(event, u'unable to retrieve formatter')
+      self.WriteEventStart()
 
-    self.WriteEventEnd()
+      try:
+        self.WriteEventBody(event)
+      except errors.NoFormatterFound:
+        self._ReportEventError(event, u'unable to retrieve formatter')
+
+      self.WriteEventEnd()
+
+    finally:
+      self._output_mediator.StopEventRendering()
 
   @abc.abstractmethod
   def WriteEventBody(self, event):
@@ -171,3 +177,13 @@ class LinearOutputModule(OutputModule):
   def Close(self):
     """Closes the output."""
     self._output_writer = None
+
+  def WriteText(self, text):
+    """Writes text that was already formatted by the output module.
+
+    This is used to write the output of parallel export processes.
+
+    Args:
+      text (str): formatted text.
+    """
+    self._output_writer.Write(text)
@@ -5,10 +5,11 @@ For documentation on the L2T CSV format see:
 http://forensicswiki.org/wiki/L2T_CSV
 """
 
+import logging
+
 from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.lib import py2to3
-from plaso.lib import timelib
 from plaso.output import interface
 from plaso.output import manager
 
@@ -86,8 +87,16 @@ class L2TCSVOutputModule(interface.LinearOutputModule):
           u'Unable to find event formatter for: {0:s}.'.format(
               getattr(event, u'data_type', u'UNKNOWN')))
 
-    date_use = timelib.Timestamp.CopyToDatetime(
-        event.timestamp, self._output_mediator.timezone)
+    try:
+      date_time_values = (
+          self._output_mediator.date_time_cache.GetDateTimeValues(
+              event.timestamp))
+    except OverflowError as exception:
+      logging.error((
+          u'Unable to copy timestamp: {0:d} to a human readable date and '
+          u'time with error: {1!s}. Defaulting to: "01/01/1970 '
+          u'00:00:00"').format(event.timestamp, exception))
+      date_time_values = None
 
     format_variables = self._output_mediator.GetFormatStringAttributeNames(
         event)
@@ -134,10 +143,14 @@ class L2TCSVOutputModule(interface.LinearOutputModule):
     if not notes:
       notes.append(u'-')
 
-    date_string = u'{0:02d}/{1:02d}/{2:04d}'.format(
-        date_use.month, date_use.day, date_use.year)
-    time_string = u'{0:02d}:{1:02d}:{2:02d}'.format(
-        date_use.hour, date_use.minute, date_use.second)
+    if date_time_values:
+      date_string = u'{0:02d}/{1:02d}/{2:04d}'.format(
+          date_time_values.month, date_time_values.day_of_month,
+          date_time_values.year)
+      time_string = date_time_values.time_string
+    else:
+      date_string = u'01/01/1970'
+      time_string = u'00:00:00'
 
     output_values = [
         date_string,
@@ -3,10 +3,44 @@
 
 from plaso.formatters import manager as formatters_manager
 from plaso.lib import eventdata
+from plaso.output import date_time_cache
 
 import pytz  # pylint: disable=wrong-import-order
 
 
+class _EventRenderContext(object):
+  """Class that contains the values derived from the event being written.
+
+  The values are determined once per event and shared by the fields of
+  the output modules that write the event.
+
+  Attributes:
+    event (EventObject): event.
+    event_formatter (EventFormatter): event formatter or None if no event
+        formatter matches the data type of the event.
+    event_values (dict[str, object]): event values or None if not
+        determined yet.
+    messages (tuple[str, str]): formatted message string and short message
+        string or None if not determined yet.
+    sources (tuple[str, str]): short and long source string or None if not
+        determined yet.
+  """
+
+  def __init__(self, event, event_formatter):
+    """Initializes an event render context.
+
+    Args:
+      event (EventObject): event.
+      event_formatter (EventFormatter): event formatter or None.
+    """
+    super(_EventRenderContext, self).__init__()
+    self.event = event
+    self.event_formatter = event_formatter
+    self.event_values = None
+    self.messages = None
+    self.sources = None
+
+
 class OutputMediator(object):
   """Class that implements the output mediator.
 
@@ -28,6 +62,8 @@ class OutputMediator(object):
       preferred_encoding (Optional[str]): preferred encoding to output.
     """
     super(OutputMediator, self).__init__()
+    self._date_time_cache = date_time_cache.DateTimeCache(timezone=pytz.UTC)
+    self._event_render_context = None
     self._formatter_mediator = formatter_mediator
     self._knowledge_base = knowledge_base
     self._preferred_encoding = preferred_encoding
@@ -35,6 +71,11 @@ class OutputMediator(object):
 
     self.fields_filter = fields_filter
 
+  @property
+  def date_time_cache(self):
+    """The date and time rendering cache of the timezone."""
+    return self._date_time_cache
+
   @property
   def encoding(self):
     """The preferred encoding."""
@@ -53,14 +94,14 @@ class OutputMediator(object):
     """The timezone."""
     return self._timezone
 
-  def GetEventFormatter(self, event):
+  def _GetEventFormatter(self, event):
     """Retrieves the event formatter for a specific event type.
 
     Args:
       event (EventObject): event.
 
     Returns:
-      The event formatter object (instance of EventFormatter) or None.
+      EventFormatter: event formatter or None.
     """
     data_type = getattr(event, u'data_type', None)
     if not data_type:
@@ -69,6 +110,56 @@ class OutputMediator(object):
     return formatters_manager.FormattersManager.GetFormatterObject(
         event.data_type)
 
+  def _GetEventRenderContext(self, event):
+    """Retrieves the render context of an event.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      _EventRenderContext: render context or None if the event is not
+          the event being written.
+    """
+    event_render_context = self._event_render_context
+    if event_render_context and event_render_context.event is event:
+      return event_render_context
+
+  def GetEventFormatter(self, event):
+    """Retrieves the event formatter for a specific event type.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      The event formatter object (instance of EventFormatter) or None.
+    """
+    event_render_context = self._GetEventRenderContext(event)
+    if event_render_context:
+      return event_render_context.event_formatter
+
+    return self._GetEventFormatter(event)
+
+  def GetEventValues(self, event):
+    """Retrieves the event values.
+
+    The event values are shared by the users of the output mediator while
+    the event is written and should not be changed.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      dict[str, object]: event values, indexed by attribute name.
+    """
+    event_render_context = self._GetEventRenderContext(event)
+    if not event_render_context:
+      return dict(event.GetAttributes())
+
+    if event_render_context.event_values is None:
+      event_render_context.event_values = dict(event.GetAttributes())
+
+    return event_render_context.event_values
+
   def GetFormattedMessages(self, event):
     """Retrieves the formatted messages related to the event.
 
@@ -80,11 +171,22 @@ class OutputMediator(object):
       If no event formatter to match the event can be found the function
       returns a tuple of None, None.
     """
+    event_render_context = self._GetEventRenderContext(event)
+    if event_render_context and event_render_context.messages:
+      return event_render_context.messages
+
     event_formatter = self.GetEventFormatter(event)
     if not event_formatter:
       return None, None
 
-    return event_formatter.GetMessages(self._formatter_mediator, event)
+    # Note that the event formatter determines its own event values, since
+    # most formatters change them while formatting and the cached event
+    # values of the render context must not be changed.
+    messages = event_formatter.GetMessages(self._formatter_mediator, event)
+    if event_render_context:
+      event_render_context.messages = messages
+
+    return messages
 
   def GetFormattedSources(self, event):
     """Retrieves the formatted sources related to the event.
@@ -97,11 +199,19 @@ class OutputMediator(object):
       to match the event can be found the function returns a tuple
       of None, None.
     """
+    event_render_context = self._GetEventRenderContext(event)
+    if event_render_context and event_render_context.sources:
+      return event_render_context.sources
+
     event_formatter = self.GetEventFormatter(event)
     if not event_formatter:
       return None, None
 
-    return event_formatter.GetSources(event)
+    sources = event_formatter.GetSources(event)
+    if event_render_context:
+      event_render_context.sources = sources
+
+    return sources
 
   def GetFormatStringAttributeNames(self, event):
     """Retrieves the attribute names in the format string.
@@ -239,6 +349,23 @@ class OutputMediator(object):
     return self._knowledge_base.GetUsername(
         user_sid, store_number, default_username=default_username)
 
+  def StartEventRendering(self, event):
+    """Starts rendering an event.
+
+    While the event is rendered the event formatter, the event values, and
+    the formatted messages and sources of the event are determined only
+    once and shared by all the fields of the output.
+
+    Args:
+      event (EventObject): event.
+    """
+    self._event_render_context = _EventRenderContext(
+        event, self._GetEventFormatter(event))
+
+  def StopEventRendering(self):
+    """Stops rendering an event."""
+    self._event_render_context = None
+
   def SetTimezone(self, timezone):
     """Sets the timezone.
 
@@ -252,3 +379,5 @@ class OutputMediator(object):
       self._timezone = pytz.timezone(timezone)
     except pytz.UnknownTimeZoneError:
       raise ValueError(u'Unsupported timezone: {0:s}'.format(timezone))
+
+    self._date_time_cache.SetTimezone(self._timezone)
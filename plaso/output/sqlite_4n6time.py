@@ -1,13 +1,17 @@
 # -*- coding: utf-8 -*-
 """Defines the output module for the SQLite database used by 4n6time."""
 
+import collections
+import logging
 import os
+import time
 
 try:
   from pysqlite2 import dbapi2 as sqlite3
 except ImportError:
   import sqlite3
 
+from plaso.lib import py2to3
 from plaso.output import manager
 from plaso.output import shared_4n6time
 
@@ -47,6 +51,16 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
       u':URL, :record_number, :event_identifier, :event_type, :source_name, '
       u':user_sid, :computer_name, :evidence)')
 
+  _INSERT_META_FIELD_VALUE_QUERY = (
+      u'INSERT INTO l2t_{0:s}s ({0:s}s, frequency) VALUES (?, ?)')
+
+  # Number of rows inserted at once in fast load mode.
+  _INSERT_BATCH_SIZE = 1000
+
+  # Number of events after which the transaction is committed and the status
+  # is updated.
+  _STATUS_UPDATE_INTERVAL = 10000
+
   def __init__(self, output_mediator):
     """Initializes the output module object.
 
@@ -60,7 +74,12 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
     self._connection = None
     self._count = 0
     self._cursor = None
+    self._fast_load = False
     self._filename = None
+    self._meta_field_values = {}
+    self._rows = []
+    self._start_time = None
+    self._tags = []
 
   def _GetDistinctValues(self, field_name):
     """Query database for unique field types.
@@ -80,6 +99,25 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
       row = self._cursor.fetchone()
     return result
 
+  def _GetEventsPerSecond(self):
+    """Determines the number of events inserted per second.
+
+    Returns:
+      float: number of events inserted per second since the database was
+          opened.
+    """
+    elapsed_time = time.time() - self._start_time
+    if elapsed_time <= 0:
+      return 0.0
+
+    return self._count / elapsed_time
+
+  def _InsertRows(self):
+    """Inserts the buffered rows into the database."""
+    if self._rows:
+      self._cursor.executemany(self._INSERT_QUERY, self._rows)
+      self._rows = []
+
   def _ListTags(self):
     """Query database for unique tag types."""
     all_tags = []
@@ -98,18 +136,82 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
     # TODO: make this method an iterator.
     return all_tags
 
+  def _ReadMetaFieldValues(self):
+    """Reads the meta field values and tags already stored in the database."""
+    for field in self._META_FIELDS:
+      self._cursor.execute(u'SELECT {0:s}s, frequency FROM l2t_{0:s}s'.format(
+          field))
+      for name, frequency in self._cursor.fetchall():
+        if name:
+          self._meta_field_values[field][name] += frequency
+
+    self._cursor.execute(u'SELECT tag FROM l2t_tags')
+    for tag_row in self._cursor.fetchall():
+      tag = tag_row[0]
+      if tag and tag not in self._tags:
+        self._tags.append(tag)
+
+  def _UpdateMetaFieldValues(self, row):
+    """Updates the meta field values and tags with the values of a row.
+
+    Args:
+      row (dict[str, object]): values of the row, indexed by column name.
+    """
+    for field in self._META_FIELDS:
+      value = row.get(field, None)
+      if value is None:
+        continue
+
+      # The meta field columns have TEXT affinity, hence SQLite stores
+      # the values as strings.
+      if not isinstance(value, py2to3.STRING_TYPES):
+        value = u'{0!s}'.format(value)
+
+      if value:
+        self._meta_field_values[field][value] += 1
+
+    tag_string = row.get(u'tag', None)
+    if tag_string:
+      for tag in tag_string.split(u','):
+        if tag not in self._tags:
+          self._tags.append(tag)
+
+  def _WriteMetaFieldValues(self, meta_field_values, tags):
+    """Writes the meta field values and tags to their tables.
+
+    Args:
+      meta_field_values (dict[str, dict[str, int]]): frequency of the values
+          of every meta field, indexed by meta field and value.
+      tags (list[str]): tags.
+    """
+    for field in self._META_FIELDS:
+      self._cursor.execute(u'DELETE FROM l2t_{0:s}s'.format(field))
+      self._cursor.executemany(
+          self._INSERT_META_FIELD_VALUE_QUERY.format(field),
+          list(meta_field_values[field].items()))
+
+    self._cursor.execute(u'DELETE FROM l2t_tags')
+    self._cursor.executemany(
+        u'INSERT INTO l2t_tags (tag) VALUES (?)', [[tag] for tag in tags])
+
   def Close(self):
     """Disconnects from the database.
 
     This method will create the necessary indices and commit outstanding
     transactions before disconnecting.
     """
+    if self._fast_load:
+      self._InsertRows()
+
     # Build up indices for the fields specified in the args.
     # It will commit the inserts automatically before creating index.
-    if not self._append:
+    # In fast load mode the indices are (re)created after all the events
+    # have been inserted.
+    if not self._append or self._fast_load:
       for field_name in self._fields:
-        query = u'CREATE INDEX {0:s}_idx ON log2timeline ({0:s})'.format(
-            field_name)
+        query = (
+            u'CREATE INDEX IF NOT EXISTS {0:s}_idx ON log2timeline '
+            u'({0:s})').format(field_name)
         self._cursor.execute(query)
         if self._set_status:
           self._set_status(u'Created index: {0:s}'.format(field_name))
@@ -118,16 +220,16 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
     if self._set_status:
       self._set_status(u'Creating metadata...')
 
-    for field in self._META_FIELDS:
-      values = self._GetDistinctValues(field)
-      self._cursor.execute(u'DELETE FROM l2t_{0:s}s'.format(field))
-      for name, frequency in iter(values.items()):
-        self._cursor.execute((
-            u'INSERT INTO l2t_{0:s}s ({1:s}s, frequency) '
-            u'VALUES("{2:s}", {3:d}) ').format(field, field, name, frequency))
-    self._cursor.execute(u'DELETE FROM l2t_tags')
-    for tag in self._ListTags():
-      self._cursor.execute(u'INSERT INTO l2t_tags (tag) VALUES (?)', [tag])
+    if self._fast_load:
+      meta_field_values = self._meta_field_values
+      tags = self._tags
+    else:
+      meta_field_values = {}
+      for field in self._META_FIELDS:
+        meta_field_values[field] = self._GetDistinctValues(field)
+      tags = self._ListTags()
+
+    self._WriteMetaFieldValues(meta_field_values, tags)
 
     if self._set_status:
       self._set_status(u'Database created.')
@@ -139,6 +241,11 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
     self._cursor = None
     self._connection = None
 
+    logging.info((
+        u'Inserted {0:d} events into: {1:s} at {2:.0f} events per '
+        u'second.').format(
+            self._count, self._filename, self._GetEventsPerSecond()))
+
   def Open(self):
     """Connects to the database and creates the required tables.
 
@@ -157,6 +264,12 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
     self._connection = sqlite3.connect(self._filename)
     self._cursor = self._connection.cursor()
 
+    if self._fast_load:
+      # Trade the durability of the database during the load for speed.
+      # An interrupted load can leave the database corrupted.
+      self._cursor.execute(u'PRAGMA journal_mode=OFF')
+      self._cursor.execute(u'PRAGMA synchronous=OFF')
+
     # Create table in database.
     if not self._append:
       self._cursor.execute(self._CREATE_TABLE_QUERY)
@@ -189,7 +302,37 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
       if self._set_status:
         self._set_status(u'Created table: l2t_disk')
 
+    self._meta_field_values = {}
+    for field in self._META_FIELDS:
+      self._meta_field_values[field] = collections.Counter()
+
+    self._rows = []
+    self._tags = []
+
+    if self._fast_load and self._append:
+      self._ReadMetaFieldValues()
+
+      # Maintaining the indices while inserting is slower than creating them
+      # after all the events have been inserted.
+      for field_name in self._fields:
+        self._cursor.execute(u'DROP INDEX IF EXISTS {0:s}_idx'.format(
+            field_name))
+
     self._count = 0
+    self._start_time = time.time()
+
+  def SetFastLoad(self, fast_load):
+    """Sets the fast load mode.
+
+    In fast load mode the events are inserted in batches, without journal
+    and synchronous writes, the meta field values are counted while the
+    events are inserted and the indices are created after all the events
+    have been inserted.
+
+    Args:
+      fast_load (bool): True if the fast load mode should be used.
+    """
+    self._fast_load = fast_load
 
   def SetFilename(self, filename):
     """Sets the filename.
@@ -209,13 +352,27 @@ class SQLite4n6TimeOutputModule(shared_4n6time.Shared4n6TimeOutputModule):
     # not to be used by 4n6time
     row = self._GetSanitizedEventValues(event_object)
 
-    self._cursor.execute(self._INSERT_QUERY, row)
+    if self._fast_load:
+      self._rows.append(row)
+      self._UpdateMetaFieldValues(row)
+
+      if len(self._rows) >= self._INSERT_BATCH_SIZE:
+        self._InsertRows()
+
+    else:
+      self._cursor.execute(self._INSERT_QUERY, row)
+
     self._count += 1
-    # Commit the current transaction every 10000 inserts.
-    if self._count % 10000 == 0:
-      self._connection.commit()
+
+    if self._count % self._STATUS_UPDATE_INTERVAL == 0:
+      # In fast load mode the events are inserted in a single transaction.
+      if not self._fast_load:
+        self._connection.commit()
+
       if self._set_status:
-        self._set_status(u'Inserting event: {0:d}'.format(self._count))
+        self._set_status(
+            u'Inserting event: {0:d} ({1:.0f} events per second)'.format(
+                self._count, self._GetEventsPerSecond()))
 
 
 manager.OutputManager.RegisterOutput(SQLite4n6TimeOutputModule)
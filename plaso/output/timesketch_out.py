@@ -57,10 +57,11 @@ class TimesketchOutputModule(interface.OutputModule):
   def Close(self):
     """Closes the connection to TimeSketch Elasticsearch database.
 
-    Sends the remaining events for indexing and removes the processing status on
-    the Timesketch search index object.
+    Sends the remaining events for indexing, waits for the indexing to
+    complete and removes the processing status on the Timesketch search index
+    object.
     """
-    self._elastic.AddEvent(None, force_flush=True)
+    self._elastic.Close()
     with self._timesketch.app_context():
       search_index = SearchIndex.query.filter_by(
           index_name=self._index_name).first()
@@ -236,6 +236,25 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
       logging.warning(
           u'Unable to parse record, unknown structure: {0:s}'.format(key))
 
+  def MatchesFileHeader(self, file_header, is_complete):
+    """Determines if the file header can plausibly be parsed by the parser.
+
+    Args:
+      file_header: a binary string containing the first bytes of the data
+                   stream.
+      is_complete: a boolean value that indicates the file header contains
+                   the entire data stream.
+
+    Returns:
+      A boolean value that indicates the parser might be able to parse
+      the data stream.
+    """
+    line = self._GetFirstLine(file_header, is_complete)
+    if line is None:
+      return True
+
+    return self.SIGNATURE in line
+
   def VerifyStructure(self, unused_parser_mediator, line):
     """Verify that this file is an IIS log file.
 
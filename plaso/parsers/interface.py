@@ -248,6 +248,24 @@ class FileObjectParser(BaseParser):
   # file offset seek needs to be performed.
   _INITIAL_FILE_OFFSET = 0
 
+  def MatchesFileHeader(self, unused_file_header, unused_is_complete):
+    """Determines if the file header can plausibly be parsed by the parser.
+
+    This is a fast check used to skip parsers without format specification
+    before the file-like object is parsed.
+
+    Args:
+      file_header: a binary string containing the first bytes of the data
+                   stream.
+      is_complete: a boolean value that indicates the file header contains
+                   the entire data stream.
+
+    Returns:
+      A boolean value that indicates the parser might be able to parse
+      the data stream.
+    """
+    return True
+
   def Parse(self, parser_mediator, file_object, **kwargs):
     """Parses a single file-like object.
 
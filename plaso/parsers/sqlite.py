@@ -3,14 +3,24 @@
 
 import logging
 import os
+import shutil
+import sys
 import tempfile
 
+# The 'urllib' module pathname2url function was moved to 'urllib.request'
+# in Python 3
+try:
+  from urllib import pathname2url
+except ImportError:
+  from urllib.request import pathname2url  # pylint: disable=import-error
+
 # pylint: disable=wrong-import-order
 try:
   from pysqlite2 import dbapi2 as sqlite3
 except ImportError:
   import sqlite3
 
+from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as dfvfs_factory
 
 from plaso.lib import specification
@@ -84,7 +94,13 @@ class SQLiteCache(plugins.BasePluginCache):
 class SQLiteDatabase(object):
   """A simple wrapper for opening up a SQLite database."""
 
-  _READ_BUFFER_SIZE = 65536
+  _READ_BUFFER_SIZE = 1024 * 1024
+
+  # Opening a database file by URI is supported by sqlite3 as of Python 3.4
+  # and immutable databases are supported as of SQLite 3.8.0.
+  _SUPPORTS_IMMUTABLE = (
+      sys.version_info[0:2] >= (3, 4) and
+      sqlite3.sqlite_version_info >= (3, 8, 0))
 
   def __init__(self, filename, temporary_directory=None):
     """Initializes the database object.
@@ -97,16 +113,44 @@ class SQLiteDatabase(object):
     self._database = None
     self._filename = filename
     self._is_open = False
+    self._local_path = u''
     self._table_names = []
     self._temp_db_file_path = u''
     self._temporary_directory = temporary_directory
     self._temp_wal_file_path = u''
 
+  @property
+  def local_path(self):
+    """str: path of the opened database file on the local file system.
+
+    This is either the original database file, when opened in immutable mode,
+    or the temporary copy of the database file.
+    """
+    return self._local_path
+
   @property
   def tables(self):
     """list[str]: names of all the tables."""
     return self._table_names
 
+  def _Connect(self, path, immutable=False):
+    """Connects to a database file.
+
+    Args:
+      path (str): path of the database file.
+      immutable (Optional[bool]): True if the database file should be opened
+          read-only and treated as immutable, which prevents SQLite from
+          changing or creating any file.
+
+    Returns:
+      sqlite3.Connection: database connection.
+    """
+    if not immutable:
+      return sqlite3.connect(path)
+
+    uri = u'file:{0:s}?immutable=1&mode=ro'.format(pathname2url(path))
+    return sqlite3.connect(uri, uri=True)  # pylint: disable=unexpected-keyword-arg
+
   def _CopyFileObjectToTemporaryFile(self, file_object, temporary_file):
     """Copies the contents of the file-like object to a temporary file.
 
@@ -120,50 +164,56 @@ class SQLiteDatabase(object):
       temporary_file.write(data)
       data = file_object.read(self._READ_BUFFER_SIZE)
 
-  def Close(self):
-    """Closes the database connection and clean up the temporary file."""
-    self._table_names = []
-
-    if self._is_open:
-      self._database.close()
-    self._database = None
+  def _RemoveTemporaryFiles(self):
+    """Removes the temporary copies of the database and WAL file."""
+    for temporary_file_path in (
+        self._temp_db_file_path, self._temp_wal_file_path):
+      if not temporary_file_path or not os.path.exists(temporary_file_path):
+        continue
 
-    if os.path.exists(self._temp_db_file_path):
       try:
-        os.remove(self._temp_db_file_path)
+        os.remove(temporary_file_path)
       except (OSError, IOError) as exception:
         logging.warning((
             u'Unable to remove temporary copy: {0:s} of SQLite database: '
             u'{1:s} with error: {2:s}').format(
-                self._temp_db_file_path, self._filename, exception))
+                temporary_file_path, self._filename, exception))
 
     self._temp_db_file_path = u''
+    self._temp_wal_file_path = u''
 
-    if os.path.exists(self._temp_wal_file_path):
-      try:
-        os.remove(self._temp_wal_file_path)
-      except (OSError, IOError) as exception:
-        logging.warning((
-            u'Unable to remove temporary copy: {0:s} of SQLite database: '
-            u'{1:s} with error: {2:s}').format(
-                self._temp_wal_file_path, self._filename, exception))
+  def Close(self):
+    """Closes the database connection and clean up the temporary file."""
+    self._table_names = []
 
-    self._temp_wal_file_path = u''
+    if self._is_open:
+      self._database.close()
+    self._database = None
+
+    self._RemoveTemporaryFiles()
 
     self._is_open = False
+    self._local_path = u''
 
-  def Open(self, file_object, wal_file_object=None):
+  def Open(self, file_object, wal_file_object=None, local_path=None):
     """Opens a SQLite database file.
 
     Since pysqlite cannot read directly from a file-like object a temporary
-    copy of the file is made. After creating a copy the database file this
-    function sets up a connection with the database and determines the names
-    of the tables.
+    copy of the file is made, unless the database file is available on
+    the local file system, no Write-Ahead Log (WAL) needs to be committed and
+    SQLite supports opening the database file in immutable mode. After
+    creating a copy the database file this function sets up a connection
+    with the database and determines the names of the tables.
 
     Args:
       file_object (dfvfs.FileIO): file-like object.
       wal_file_object (Optional[dfvfs.FileIO]): file-like object for the
           Write-Ahead Log (WAL) file.
+      local_path (Optional[str]): path of the database file, or a copy of it,
+          on the local file system. If set, the database file is opened
+          directly in immutable mode, or, if this is not possible, the local
+          file is used as the source of the temporary copy instead of
+          the file-like object.
 
     Raises:
       IOError: if the file-like object cannot be read.
@@ -173,32 +223,41 @@ class SQLiteDatabase(object):
     if not file_object:
       raise ValueError(u'Missing file object.')
 
-    # TODO: Current design copies the entire file into a buffer
-    # that is parsed by each SQLite parser. This is not very efficient,
-    # especially when many SQLite parsers are ran against a relatively
-    # large SQLite database. This temporary file that is created should
-    # be usable by all SQLite parsers so the file should only be read
-    # once in memory and then deleted when all SQLite parsers have completed.
-
     # TODO: Change this into a proper implementation using APSW
     # and virtual filesystems when that will be available.
     # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
     # http://apidoc.apsw.googlecode.com/hg/example.html#example-vfs
-    # Until then, just copy the file into a tempfile and parse it.
+    # Until then, open the local file in immutable mode if possible,
+    # otherwise copy the file into a tempfile and parse it.
 
-    temporary_file = tempfile.NamedTemporaryFile(
-        delete=False, dir=self._temporary_directory)
+    immutable = bool(
+        local_path and not wal_file_object and self._SUPPORTS_IMMUTABLE)
 
-    try:
-      self._CopyFileObjectToTemporaryFile(file_object, temporary_file)
-      self._temp_db_file_path = temporary_file.name
+    if immutable:
+      self._local_path = local_path
 
-    except IOError:
-      os.remove(temporary_file.name)
-      raise
+    else:
+      temporary_file = tempfile.NamedTemporaryFile(
+          delete=False, dir=self._temporary_directory)
 
-    finally:
-      temporary_file.close()
+      try:
+        if local_path:
+          with open(local_path, 'rb') as local_file_object:
+            shutil.copyfileobj(
+                local_file_object, temporary_file, self._READ_BUFFER_SIZE)
+        else:
+          self._CopyFileObjectToTemporaryFile(file_object, temporary_file)
+
+        self._temp_db_file_path = temporary_file.name
+
+      except IOError:
+        os.remove(temporary_file.name)
+        raise
+
+      finally:
+        temporary_file.close()
+
+      self._local_path = self._temp_db_file_path
 
     if wal_file_object:
       # Create WAL file using same filename so it is available for
@@ -211,12 +270,14 @@ class SQLiteDatabase(object):
 
       except IOError:
         os.remove(temporary_filename)
+        self._RemoveTemporaryFiles()
+        self._local_path = u''
         raise
 
       finally:
         temporary_file.close()
 
-    self._database = sqlite3.connect(self._temp_db_file_path)
+    self._database = self._Connect(self._local_path, immutable=immutable)
     try:
       self._database.row_factory = sqlite3.Row
       cursor = self._database.cursor()
@@ -230,11 +291,8 @@ class SQLiteDatabase(object):
       self._database.close()
       self._database = None
 
-      os.remove(self._temp_db_file_path)
-      self._temp_db_file_path = u''
-      if self._temp_wal_file_path:
-        os.remove(self._temp_wal_file_path)
-        self._temp_wal_file_path = u''
+      self._RemoveTemporaryFiles()
+      self._local_path = u''
 
       logging.debug(
           u'Unable to parse SQLite database: {0:s} with error: {1:s}'.format(
@@ -265,9 +323,28 @@ class SQLiteParser(interface.FileEntryParser):
 
   _plugin_classes = {}
 
+  def _GetLocalPath(self, file_entry):
+    """Retrieves the path of a file entry on the local file system.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry.
+
+    Returns:
+      str: path of the file entry on the local file system or None if
+          the file entry is not stored directly on the local file system.
+    """
+    path_spec = file_entry.path_spec
+    if path_spec.type_indicator != dfvfs_definitions.TYPE_INDICATOR_OS:
+      return
+
+    if getattr(path_spec, u'parent', None):
+      return
+
+    return getattr(path_spec, u'location', None)
+
   def _OpenDatabaseWithWAL(
       self, parser_mediator, database_file_entry, database_file_object,
-      filename):
+      filename, local_path=None):
     """Opens a database with its Write-Ahead Log (WAL) committed.
 
     Args:
@@ -275,6 +352,9 @@ class SQLiteParser(interface.FileEntryParser):
       database_file_entry (dfvfs.FileEntry): file entry of the database.
       database_file_object (dfvfs.FileIO): file-like object of the database.
       filename (str): name of the database file entry.
+      local_path (Optional[str]): path of the database file, or a copy of it,
+          on the local file system, which is copied instead of
+          the file-like object of the database.
 
     Returns:
       tuple: contains:
@@ -305,7 +385,9 @@ class SQLiteParser(interface.FileEntryParser):
         filename, temporary_directory=parser_mediator.temporary_directory)
 
     try:
-      database_wal.Open(database_file_object, wal_file_object=wal_file_object)
+      database_wal.Open(
+          database_file_object, wal_file_object=wal_file_object,
+          local_path=local_path)
 
     except (IOError, ValueError, sqlite3.DatabaseError) as exception:
       parser_mediator.ProduceExtractionError((
@@ -340,9 +422,11 @@ class SQLiteParser(interface.FileEntryParser):
     database = SQLiteDatabase(
         filename, temporary_directory=parser_mediator.temporary_directory)
 
+    local_path = self._GetLocalPath(file_entry)
+
     file_object = file_entry.GetFileObject()
     try:
-      database.Open(file_object)
+      database.Open(file_object, local_path=local_path)
 
     except (IOError, ValueError, sqlite3.DatabaseError) as exception:
       parser_mediator.ProduceExtractionError(
@@ -350,8 +434,11 @@ class SQLiteParser(interface.FileEntryParser):
       file_object.close()
       return
 
+    # The database file, or its temporary copy, is copied from the local
+    # file system to prevent reading the database file again.
     database_wal, wal_file_entry = self._OpenDatabaseWithWAL(
-        parser_mediator, file_entry, file_object, filename)
+        parser_mediator, file_entry, file_object, filename,
+        local_path=database.local_path)
 
     file_object.close()
 
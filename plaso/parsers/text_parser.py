@@ -423,6 +423,71 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
 
     return line.strip()
 
+  def _GetFirstLine(self, file_header, is_complete):
+    """Retrieves the first line from the file header.
+
+    The first line is determined in the same way as the first line that is
+    read by ParseFileObject, without the need for a text file object.
+
+    Args:
+      file_header (bytes): first bytes of the data stream.
+      is_complete (bool): True if the file header contains the entire data
+          stream.
+
+    Returns:
+      str: first line or an empty string if there is no such line, or None
+          if the file header does not contain the entire first line.
+    """
+    line_offset = 0
+    for depth in range(41):
+      line_end_offset = file_header.find(
+          b'\n', line_offset, line_offset + self.MAX_LINE_LENGTH)
+      if line_end_offset == -1:
+        line_end_offset = min(
+            line_offset + self.MAX_LINE_LENGTH, len(file_header))
+        if (line_end_offset - line_offset < self.MAX_LINE_LENGTH and
+            not is_complete):
+          return
+      else:
+        line_end_offset += 1
+
+      line = file_header[line_offset:line_end_offset]
+      if not line:
+        return u''
+
+      if line not in self._EMPTY_LINES:
+        break
+
+      if depth == 40:
+        return u''
+
+      line_offset = line_end_offset
+
+    if self.encoding:
+      try:
+        line = line.decode(self.encoding)
+      except UnicodeDecodeError:
+        pass
+
+    return line.strip()
+
+  def MatchesFileHeader(self, file_header, is_complete):
+    """Determines if the file header can plausibly be parsed by the parser.
+
+    Args:
+      file_header (bytes): first bytes of the data stream.
+      is_complete (bool): True if the file header contains the entire data
+          stream.
+
+    Returns:
+      bool: False if the parser cannot parse the data stream, True otherwise.
+    """
+    line = self._GetFirstLine(file_header, is_complete)
+    if line is None:
+      return True
+
+    return bool(line) and utils.IsText(line)
+
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a text file-like object using a pyparsing definition.
 
@@ -670,6 +735,22 @@ class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
     self._text_reader = EncodedTextReader(
         buffer_size=self.BUFFER_SIZE, encoding=self._ENCODING)
 
+  def MatchesFileHeader(self, unused_file_header, unused_is_complete):
+    """Determines if the file header can plausibly be parsed by the parser.
+
+    Multi line text parsers read the file-like object in blocks instead of
+    per line, hence the file header is not checked.
+
+    Args:
+      file_header (bytes): first bytes of the data stream.
+      is_complete (bool): True if the file header contains the entire data
+          stream.
+
+    Returns:
+      bool: True since the parser might be able to parse the data stream.
+    """
+    return True
+
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a text file-like object using a pyparsing definition.
 
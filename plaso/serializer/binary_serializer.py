@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""The binary serializer object implementation.
+
+The binary serialized form consists of a format version byte followed by
+the attribute container stored as marshal (version 2) data. The attribute
+container and the values that marshal cannot represent natively are stored
+as tuples that start with a tag, for example:
+(tag, container type, {attribute name: attribute value, ...})
+
+End-of-line characters in the serialized form are escaped, so that it can
+be stored in line-based storage, such as the gzip-based task storage.
+"""
+
+import collections
+import marshal
+
+from dfvfs.path import path_spec as dfvfs_path_spec
+from dfvfs.path import factory as dfvfs_path_spec_factory
+
+from plaso.containers import interface as containers_interface
+from plaso.containers import manager as containers_manager
+from plaso.lib import py2to3
+from plaso.serializer import interface
+
+
+class BinaryAttributeContainerSerializer(
+    interface.AttributeContainerSerializer):
+  """Class that implements the binary attribute container serializer.
+
+  Path specifications and the values of attributes such as the data type
+  are interned, which means that the serializer reuses previously converted
+  path specifications and strings instead of converting them for every
+  attribute container.
+  """
+
+  _FORMAT_VERSION = b'\x01'
+
+  _MARSHAL_VERSION = 2
+
+  _TAG_ATTRIBUTE_CONTAINER = 1
+  _TAG_COLLECTIONS_COUNTER = 2
+  _TAG_PATH_SPEC = 3
+  _TAG_TUPLE = 4
+
+  # The names of the attributes of which the values are interned.
+  _INTERNED_ATTRIBUTE_NAMES = frozenset([
+      u'data_type',
+      u'parser',
+      u'timestamp_desc'])
+
+  _MAXIMUM_NUMBER_OF_INTERNED_PATH_SPECS = 4096
+
+  _MAXIMUM_NUMBER_OF_INTERNED_VALUES = 16 * 1024
+
+  # Note that the interned path specifications and values are shared by all
+  # users of the serializer within the process.
+
+  # The serialized path specifications per path specification object
+  # identifier. The path specification object is stored as well to prevent
+  # its identifier from being reused while it is interned.
+  _interned_path_spec_tuples = {}
+
+  # The path specification objects per serialized path specification.
+  _interned_path_specs = {}
+
+  _interned_values = {}
+
+  @classmethod
+  def _ConvertAttributeContainerToTuple(cls, attribute_container):
+    """Converts an attribute container object into a tuple.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+
+    Returns:
+      tuple: serialized attribute container.
+
+    Raises:
+      TypeError: if not an instance of AttributeContainer.
+      ValueError: if the attribute container type is not supported.
+    """
+    if not isinstance(
+        attribute_container, containers_interface.AttributeContainer):
+      raise TypeError(u'{0:s} is not an attribute container type.'.format(
+          type(attribute_container)))
+
+    container_type = getattr(attribute_container, u'CONTAINER_TYPE', None)
+    if not container_type:
+      raise ValueError(u'Unsupported attribute container type: {0:s}.'.format(
+          type(attribute_container)))
+
+    attributes = {}
+    for attribute_name, attribute_value in attribute_container.GetAttributes():
+      if attribute_value is None:
+        continue
+
+      attributes[attribute_name] = cls._ConvertAttributeValue(attribute_value)
+
+    return cls._TAG_ATTRIBUTE_CONTAINER, container_type, attributes
+
+  @classmethod
+  def _ConvertAttributeValue(cls, attribute_value):
+    """Converts an attribute value into a value marshal can represent.
+
+    Args:
+      attribute_value (object): attribute value.
+
+    Returns:
+      object: serialized attribute value.
+    """
+    if isinstance(attribute_value, (
+        py2to3.BYTES_TYPE, py2to3.UNICODE_TYPE, py2to3.INTEGER_TYPES,
+        float)):
+      return attribute_value
+
+    elif isinstance(attribute_value, list):
+      return [
+          cls._ConvertAttributeValue(list_element)
+          for list_element in attribute_value]
+
+    elif isinstance(attribute_value, tuple):
+      return cls._TAG_TUPLE, [
+          cls._ConvertAttributeValue(tuple_element)
+          for tuple_element in attribute_value]
+
+    elif isinstance(attribute_value, collections.Counter):
+      counter = {}
+      for key, value in iter(attribute_value.items()):
+        if value is not None:
+          counter[key] = value
+      return cls._TAG_COLLECTIONS_COUNTER, counter
+
+    elif isinstance(attribute_value, dict):
+      dictionary = {}
+      for key, value in iter(attribute_value.items()):
+        dictionary[key] = cls._ConvertAttributeValue(value)
+      return dictionary
+
+    elif isinstance(attribute_value, dfvfs_path_spec.PathSpec):
+      return cls._ConvertPathSpecToTuple(attribute_value)
+
+    elif isinstance(attribute_value, containers_interface.AttributeContainer):
+      return cls._ConvertAttributeContainerToTuple(attribute_value)
+
+    return attribute_value
+
+  @classmethod
+  def _ConvertPathSpecToTuple(cls, path_spec_object):
+    """Converts a path specification object into a tuple.
+
+    Args:
+      path_spec_object (dfvfs.PathSpec): path specification.
+
+    Returns:
+      tuple: serialized path specification.
+    """
+    path_spec_identifier = id(path_spec_object)
+    interned_path_spec = cls._interned_path_spec_tuples.get(
+        path_spec_identifier, None)
+    if interned_path_spec and interned_path_spec[0] is path_spec_object:
+      return interned_path_spec[1]
+
+    properties = []
+    for property_name in dfvfs_path_spec_factory.Factory.PROPERTY_NAMES:
+      property_value = getattr(path_spec_object, property_name, None)
+      if property_value is not None:
+        properties.append((property_name, property_value))
+
+    parent_path_spec_tuple = None
+    if path_spec_object.HasParent():
+      parent_path_spec_tuple = cls._ConvertPathSpecToTuple(
+          path_spec_object.parent)
+
+    path_spec_tuple = (
+        cls._TAG_PATH_SPEC, path_spec_object.type_indicator, tuple(properties),
+        parent_path_spec_tuple)
+
+    if (len(cls._interned_path_spec_tuples) >=
+        cls._MAXIMUM_NUMBER_OF_INTERNED_PATH_SPECS):
+      cls._interned_path_spec_tuples.clear()
+
+    cls._interned_path_spec_tuples[path_spec_identifier] = (
+        path_spec_object, path_spec_tuple)
+
+    return path_spec_tuple
+
+  @classmethod
+  def _ConvertTupleToAttributeContainer(cls, container_tuple):
+    """Converts a tuple into an attribute container object.
+
+    Args:
+      container_tuple (tuple): serialized attribute container.
+
+    Returns:
+      AttributeContainer: attribute container.
+
+    Raises:
+      ValueError: if the container type is not supported.
+    """
+    _, container_type, attributes = container_tuple
+
+    container_class = (
+        containers_manager.AttributeContainersManager.GetAttributeContainer(
+            container_type))
+    if not container_class:
+      raise ValueError(u'Unsupported container type: {0:s}'.format(
+          container_type))
+
+    container_object = container_class()
+    for attribute_name, attribute_value in iter(attributes.items()):
+      # Event tags should be serialized separately.
+      # TODO: remove when analysis report no longer defines event tags.
+      if (container_type == u'analysis_report' and
+          attribute_name == u'_event_tags'):
+        continue
+
+      # Be strict about which attributes to set in non event objects.
+      if (container_type != u'event' and
+          attribute_name not in container_object.__dict__):
+        continue
+
+      if attribute_name in cls._INTERNED_ATTRIBUTE_NAMES:
+        attribute_value = cls._InternValue(attribute_value)
+      else:
+        attribute_value = cls._ConvertValue(attribute_value)
+
+      setattr(container_object, attribute_name, attribute_value)
+
+    return container_object
+
+  @classmethod
+  def _ConvertTupleToPathSpec(cls, path_spec_tuple):
+    """Converts a tuple into a path specification object.
+
+    Args:
+      path_spec_tuple (tuple): serialized path specification.
+
+    Returns:
+      dfvfs.PathSpec: path specification.
+    """
+    path_spec_object = cls._interned_path_specs.get(path_spec_tuple, None)
+    if path_spec_object:
+      return path_spec_object
+
+    _, type_indicator, properties, parent_path_spec_tuple = path_spec_tuple
+
+    kwargs = dict(properties)
+    if parent_path_spec_tuple:
+      kwargs[u'parent'] = cls._ConvertTupleToPathSpec(parent_path_spec_tuple)
+
+    path_spec_object = dfvfs_path_spec_factory.Factory.NewPathSpec(
+        type_indicator, **kwargs)
+
+    if (len(cls._interned_path_specs) >=
+        cls._MAXIMUM_NUMBER_OF_INTERNED_PATH_SPECS):
+      cls._interned_path_specs.clear()
+
+    cls._interned_path_specs[path_spec_tuple] = path_spec_object
+
+    return path_spec_object
+
+  @classmethod
+  def _ConvertValue(cls, value):
+    """Converts a serialized value into an object.
+
+    Args:
+      value (object): serialized value.
+
+    Returns:
+      object: deserialized value.
+
+    Raises:
+      ValueError: if the tag of the serialized value is not supported.
+    """
+    if isinstance(value, list):
+      return [cls._ConvertValue(list_element) for list_element in value]
+
+    elif isinstance(value, dict):
+      dictionary = {}
+      for key, dictionary_value in iter(value.items()):
+        dictionary[key] = cls._ConvertValue(dictionary_value)
+      return dictionary
+
+    elif not isinstance(value, tuple):
+      return value
+
+    tag = value[0]
+    if tag == cls._TAG_PATH_SPEC:
+      return cls._ConvertTupleToPathSpec(value)
+
+    elif tag == cls._TAG_TUPLE:
+      return tuple([
+          cls._ConvertValue(tuple_element) for tuple_element in value[1]])
+
+    elif tag == cls._TAG_COLLECTIONS_COUNTER:
+      return collections.Counter(value[1])
+
+    elif tag == cls._TAG_ATTRIBUTE_CONTAINER:
+      return cls._ConvertTupleToAttributeContainer(value)
+
+    raise ValueError(u'Unsupported tag: {0!s}'.format(tag))
+
+  @classmethod
+  def _InternValue(cls, value):
+    """Interns a value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: interned value, if the value can be interned or the value
+          otherwise.
+    """
+    if not isinstance(value, (py2to3.BYTES_TYPE, py2to3.UNICODE_TYPE)):
+      return cls._ConvertValue(value)
+
+    interned_value = cls._interned_values.get(value, None)
+    if interned_value is None:
+      if (len(cls._interned_values) >=
+          cls._MAXIMUM_NUMBER_OF_INTERNED_VALUES):
+        cls._interned_values.clear()
+
+      cls._interned_values[value] = value
+      interned_value = value
+
+    return interned_value
+
+  @classmethod
+  def ReadSerialized(cls, serialized):
+    """Reads an attribute container from serialized form.
+
+    Args:
+      serialized (bytes): binary serialized form.
+
+    Returns:
+      AttributeContainer: attribute container or None.
+
+    Raises:
+      ValueError: if the format version or a tag of the serialized form is
+          not supported.
+    """
+    if not serialized:
+      return
+
+    if serialized[:1] != cls._FORMAT_VERSION:
+      raise ValueError(u'Unsupported format version.')
+
+    serialized = serialized[1:].replace(b'\\n', b'\n').replace(
+        b'\\r', b'\r').replace(b'\\s', b'\\')
+
+    container_tuple = marshal.loads(serialized)
+    if (not isinstance(container_tuple, tuple) or
+        container_tuple[0] != cls._TAG_ATTRIBUTE_CONTAINER):
+      raise ValueError(u'Unsupported serialized attribute container.')
+
+    return cls._ConvertTupleToAttributeContainer(container_tuple)
+
+  @classmethod
+  def WriteSerialized(cls, attribute_container):
+    """Writes an attribute container to serialized form.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+
+    Returns:
+      bytes: binary serialized form.
+
+    Raises:
+      ValueError: if an attribute value cannot be serialized.
+    """
+    container_tuple = cls._ConvertAttributeContainerToTuple(
+        attribute_container)
+    serialized = marshal.dumps(container_tuple, cls._MARSHAL_VERSION)
+
+    # The escape character is escaped first, so that every escape character
+    # in the escaped data is followed by either "n", "r" or "s".
+    serialized = serialized.replace(b'\\', b'\\s').replace(
+        b'\n', b'\\n').replace(b'\r', b'\\r')
+
+    return b''.join([cls._FORMAT_VERSION, serialized])
@@ -2,6 +2,21 @@
 """gzip-based storage.
 
 Only supports task storage at the moment.
+
+The gzip-based storage stores one serialized attribute container per line.
+Serialized events are prefixed with a header that contains the container
+type, the timestamp and the parser chain of the event separated by tabs:
+<container type>\t<timestamp>\t<parser chain>\t<serialized data>
+
+The header allows the events to be merged into the session storage without
+having to deserialize and serialize them again. Hence the task storage must
+use the same serialization format as the session storage.
+
+The path specifications of the events are stored in a path specification
+table, where the serialized events only contain the identifier of their
+path specification. The table entries are stored as lines that precede
+the first event that references them:
+path_spec\t<identifier>\t<serialized path specification>
 """
 
 import gzip
@@ -10,7 +25,7 @@ import time
 
 from plaso.lib import definitions
 from plaso.lib import platform_specific
-from plaso.serializer import json_serializer
+from plaso.lib import py2to3
 from plaso.storage import interface
 
 
@@ -23,20 +38,31 @@ class GZIPStorageFile(interface.BaseFileStorage):
 
   _DATA_BUFFER_SIZE = 1 * 1024 * 1024
 
-  def __init__(self, storage_type=definitions.STORAGE_TYPE_TASK):
+  _EVENT_HEADER_PREFIX = b'event\t'
+
+  _HEADER_SEPARATOR = b'\t'
+
+  _PATH_SPEC_HEADER_PREFIX = b'path_spec\t'
+
+  def __init__(
+      self, storage_type=definitions.STORAGE_TYPE_TASK,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON):
     """Initializes a storage.
 
     Args:
       storage_type (Optional[str]): storage type.
+      serialization_format (Optional[str]): serialization format.
 
     Raises:
-      ValueError: if the storage type is not supported.
+      ValueError: if the serialization format or the storage type is not
+          supported.
     """
     if storage_type != definitions.STORAGE_TYPE_TASK:
       raise ValueError(u'Unsupported storage type: {0:s}.'.format(
           storage_type))
 
-    super(GZIPStorageFile, self).__init__()
+    super(GZIPStorageFile, self).__init__(
+        serialization_format=serialization_format)
     self._attribute_containers = {}
     self._gzip_file = None
 
@@ -73,6 +99,17 @@ class GZIPStorageFile(interface.BaseFileStorage):
       data_buffer = b''
       for index, line in enumerate(lines):
         if line.endswith(b'\n'):
+          if line.startswith(self._PATH_SPEC_HEADER_PREFIX):
+            _, path_spec_identifier, path_spec_data = line.split(
+                self._HEADER_SEPARATOR, 2)
+            path_spec_identifier = path_spec_identifier.decode(u'utf-8')
+            self._serialized_path_specs[path_spec_identifier] = (
+                path_spec_data.rstrip(b'\n'))
+            continue
+
+          if line.startswith(self._EVENT_HEADER_PREFIX):
+            _, _, _, line = line.split(self._HEADER_SEPARATOR, 3)
+
           attribute_container = self._DeserializeAttributeContainer(
               line, u'attribute_container')
           self._AddAttributeContainer(attribute_container)
@@ -81,11 +118,13 @@ class GZIPStorageFile(interface.BaseFileStorage):
       data_buffer = data_buffer + self._gzip_file.read(
           self._DATA_BUFFER_SIZE)
 
-  def _WriteAttributeContainer(self, attribute_container):
+  def _WriteAttributeContainer(self, attribute_container, header_values=None):
     """Writes an attribute container.
 
     Args:
       attribute_container (AttributeContainer): attribute container.
+      header_values (Optional[list[str]]): values of the header that is
+          written before the serialized attribute container data.
 
     Raises:
       IOError: when the storage file is closed or read-only.
@@ -98,9 +137,28 @@ class GZIPStorageFile(interface.BaseFileStorage):
 
     attribute_container_data = self._SerializeAttributeContainer(
         attribute_container)
+
+    if header_values:
+      for header_value in header_values:
+        self._gzip_file.write(header_value.encode(u'utf-8'))
+        self._gzip_file.write(self._HEADER_SEPARATOR)
+
     self._gzip_file.write(attribute_container_data)
     self._gzip_file.write(b'\n')
 
+  def _WriteSerializedPathSpec(self, path_spec_identifier, path_spec_data):
+    """Writes a serialized path specification to the table.
+
+    Args:
+      path_spec_identifier (str): identifier of the path specification.
+      path_spec_data (bytes): serialized path specification.
+    """
+    self._gzip_file.write(self._PATH_SPEC_HEADER_PREFIX)
+    self._gzip_file.write(path_spec_identifier.encode(u'utf-8'))
+    self._gzip_file.write(self._HEADER_SEPARATOR)
+    self._gzip_file.write(path_spec_data)
+    self._gzip_file.write(b'\n')
+
   def AddAnalysisReport(self, analysis_report):
     """Adds an analysis report.
 
@@ -123,7 +181,14 @@ class GZIPStorageFile(interface.BaseFileStorage):
     Args:
       event (EventObject): event.
     """
-    self._WriteAttributeContainer(event)
+    header_values = None
+    if isinstance(event.timestamp, py2to3.INTEGER_TYPES):
+      parser_chain = getattr(event, u'parser', None) or u''
+      header_values = [
+          event.CONTAINER_TYPE, u'{0:d}'.format(event.timestamp),
+          parser_chain]
+
+    self._WriteAttributeContainer(event, header_values=header_values)
 
   def AddEventSource(self, event_source):
     """Adds an event source.
@@ -201,6 +266,18 @@ class GZIPStorageFile(interface.BaseFileStorage):
     """
     return iter(self._GetAttributeContainerList(u'event_tag'))
 
+  def GetEventTimeRanges(self, number_of_time_ranges):
+    """Splits the events into consecutive time ranges.
+
+    Args:
+      number_of_time_ranges (int): maximum number of time ranges.
+
+    Returns:
+      list[TimeRange]: None since the events are not stored in chronological
+          order and hence cannot be split into time ranges.
+    """
+    return
+
   def HasAnalysisReports(self):
     """Determines if a storage contains analysis reports.
 
@@ -296,19 +373,31 @@ class GZIPStorageMergeReader(interface.StorageMergeReader):
   """Class that implements a gzip-based storage file reader for merging."""
 
   _DATA_BUFFER_SIZE = 1 * 1024 * 1024
+  _EVENT_HEADER_PREFIX = b'event\t'
+  _HEADER_SEPARATOR = b'\t'
+  _PATH_SPEC_HEADER_PREFIX = b'path_spec\t'
   _MAXIMUM_NUMBER_OF_LOCKED_FILE_ATTEMPTS = 4
   _LOCKED_FILE_SLEEP_TIME = 0.5
 
-  def __init__(self, storage_writer, path):
+  def __init__(
+      self, storage_writer, path,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON):
     """Initializes a storage merge reader.
 
     Args:
       storage_writer (StorageWriter): storage writer.
       path (str): path to the input file.
+      serialization_format (Optional[str]): serialization format.
 
     Raises:
       IOError: if the input file cannot be opened.
+      ValueError: if the serialization format is not supported.
     """
+    serializer = interface.SERIALIZERS.get(serialization_format, None)
+    if not serializer:
+      raise ValueError(u'Unsupported serialization format: {0!s}'.format(
+          serialization_format))
+
     # On Windows the file can sometimes be in use and we have to wait.
     gzip_file = None
     for attempt in range(1, self._MAXIMUM_NUMBER_OF_LOCKED_FILE_ATTEMPTS):
@@ -328,7 +417,8 @@ class GZIPStorageMergeReader(interface.StorageMergeReader):
     self._data_buffer = None
     self._gzip_file = gzip_file
     self._path = path
-    self._serializer = json_serializer.JSONAttributeContainerSerializer
+    self._serialization_format = serialization_format
+    self._serializer = serializer
     self._serializers_profiler = None
 
   def _DeserializeAttributeContainer(self, container_data, container_type):
@@ -344,16 +434,51 @@ class GZIPStorageMergeReader(interface.StorageMergeReader):
     if not container_data:
       return
 
+    profile_name = None
     if self._serializers_profiler:
-      self._serializers_profiler.StartTiming(container_type)
+      profile_name = u'{0:s}:{1:s}'.format(
+          self._serialization_format, container_type)
+      self._serializers_profiler.StartTiming(profile_name)
 
     attribute_container = self._serializer.ReadSerialized(container_data)
 
     if self._serializers_profiler:
-      self._serializers_profiler.StopTiming(container_type)
+      self._serializers_profiler.StopTiming(profile_name)
 
     return attribute_container
 
+  def _MergeSerializedAttributeContainer(self, line):
+    """Merges a serialized attribute container with a header into the writer.
+
+    The serialized attribute container data, or path specification data
+    in case of a path specification table entry, is passed to the writer
+    as-is without being deserialized.
+
+    Args:
+      line (bytes): line that contains the header and the serialized
+          attribute container data.
+
+    Raises:
+      RuntimeError: if the attribute container type is not supported.
+    """
+    if line.startswith(self._PATH_SPEC_HEADER_PREFIX):
+      _, path_spec_identifier, path_spec_data = line.split(
+          self._HEADER_SEPARATOR, 2)
+
+      self._storage_writer.AddSerializedPathSpec(
+          path_spec_identifier.decode(u'utf-8'), path_spec_data)
+      return
+
+    container_type, timestamp, parser_chain, container_data = line.split(
+        self._HEADER_SEPARATOR, 3)
+
+    if container_type != b'event':
+      raise RuntimeError(u'Unsupported serialized container type: {0:s}'.format(
+          container_type.decode(u'utf-8')))
+
+    self._storage_writer.AddSerializedEvent(
+        int(timestamp, 10), container_data, parser_chain.decode(u'utf-8'))
+
   def MergeAttributeContainers(self, maximum_number_of_containers=0):
     """Reads attribute containers from a task storage file into the writer.
 
@@ -377,6 +502,19 @@ class GZIPStorageMergeReader(interface.StorageMergeReader):
     while self._data_buffer:
       while b'\n' in self._data_buffer:
         line, _, self._data_buffer = self._data_buffer.partition(b'\n')
+
+        if (line.startswith(self._EVENT_HEADER_PREFIX) or
+            line.startswith(self._PATH_SPEC_HEADER_PREFIX)):
+          self._MergeSerializedAttributeContainer(line)
+
+          number_of_containers += 1
+
+          if (maximum_number_of_containers > 0 and
+              number_of_containers >= maximum_number_of_containers):
+            return False
+
+          continue
+
         attribute_container = self._DeserializeAttributeContainer(
             line, u'attribute_container')
 
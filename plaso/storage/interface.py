@@ -2,11 +2,24 @@
 """The storage interface classes."""
 
 import abc
+import hashlib
+
+from dfvfs.serializer import json_serializer as dfvfs_json_serializer
 
 from plaso.lib import definitions
+from plaso.lib import py2to3
+from plaso.serializer import binary_serializer
 from plaso.serializer import json_serializer
 
 
+# The attribute container serializers per serialization format.
+SERIALIZERS = {
+    definitions.SERIALIZER_FORMAT_BINARY: (
+        binary_serializer.BinaryAttributeContainerSerializer),
+    definitions.SERIALIZER_FORMAT_JSON: (
+        json_serializer.JSONAttributeContainerSerializer)}
+
+
 class BaseStorage(object):
   """Class that defines the storage interface."""
 
@@ -181,17 +194,42 @@ class BaseStorage(object):
 
 
 class BaseFileStorage(BaseStorage):
-  """Class that defines a file-based storage."""
+  """Class that defines a file-based storage.
+
+  Attributes:
+    serialization_format (str): serialization format.
+  """
 
   # pylint: disable=abstract-method
 
-  def __init__(self):
-    """Initializes a storage."""
+  # The maximum number of cached path specification objects.
+  _MAXIMUM_NUMBER_OF_CACHED_PATH_SPECS = 4096
+
+  # The name of the event attribute that contains the identifier of
+  # the path specification in the path specification table.
+  _PATH_SPEC_IDENTIFIER_ATTRIBUTE_NAME = u'_pathspec_identifier'
+
+  def __init__(self, serialization_format=definitions.SERIALIZER_FORMAT_JSON):
+    """Initializes a storage.
+
+    Args:
+      serialization_format (Optional[str]): serialization format.
+
+    Raises:
+      ValueError: if the serialization format is not supported.
+    """
     super(BaseFileStorage, self).__init__()
     self._is_open = False
+    self._path_spec_identifiers = {}
+    self._path_specs = {}
+    self._serialized_path_specs = {}
+    self._written_path_spec_identifiers = set()
     self._read_only = True
-    self._serializer = json_serializer.JSONAttributeContainerSerializer
+    self._serializer = None
     self._serializers_profiler = None
+    self.serialization_format = None
+
+    self._SetSerializationFormat(serialization_format)
 
   def _DeserializeAttributeContainer(self, container_data, container_type):
     """Deserializes an attribute container.
@@ -206,19 +244,123 @@ class BaseFileStorage(BaseStorage):
     if not container_data:
       return
 
+    # The serialization format is part of the profile name, so that
+    # the measurements of different serialization formats can be compared
+    # side-by-side.
+    profile_name = None
     if self._serializers_profiler:
-      self._serializers_profiler.StartTiming(container_type)
+      profile_name = u'{0:s}:{1:s}'.format(
+          self.serialization_format, container_type)
+      self._serializers_profiler.StartTiming(profile_name)
 
     attribute_container = self._serializer.ReadSerialized(container_data)
 
     if self._serializers_profiler:
-      self._serializers_profiler.StopTiming(container_type)
+      self._serializers_profiler.StopTiming(profile_name)
+
+    if (attribute_container and
+        attribute_container.CONTAINER_TYPE == u'event'):
+      path_spec_identifier = getattr(
+          attribute_container, self._PATH_SPEC_IDENTIFIER_ATTRIBUTE_NAME, None)
+      if path_spec_identifier:
+        delattr(attribute_container, self._PATH_SPEC_IDENTIFIER_ATTRIBUTE_NAME)
+        # Note that the path specification is shared with other events
+        # and must not be changed.
+        attribute_container.pathspec = self._ReadPathSpec(path_spec_identifier)
 
     return attribute_container
 
+  def _GetPathSpecIdentifier(self, path_spec):
+    """Retrieves the identifier of a path specification.
+
+    The identifier is derived from the comparable of the path specification,
+    hence the same path specification has the same identifier in every
+    storage file, which allows serialized events to be merged from task
+    storage without having to be deserialized.
+
+    Args:
+      path_spec (dfvfs.PathSpec): path specification.
+
+    Returns:
+      str: identifier of the path specification.
+    """
+    # Events of the same file entry typically share the same path
+    # specification object, hence the identifier is cached per object.
+    object_identifier = id(path_spec)
+    cached_path_spec = self._path_spec_identifiers.get(object_identifier, None)
+    if cached_path_spec and cached_path_spec[0] is path_spec:
+      return cached_path_spec[1]
+
+    comparable = path_spec.comparable
+    if isinstance(comparable, py2to3.UNICODE_TYPE):
+      comparable = comparable.encode(u'utf-8')
+
+    path_spec_identifier = u'{0:s}'.format(
+        hashlib.md5(comparable).hexdigest())
+
+    if (len(self._path_spec_identifiers) >=
+        self._MAXIMUM_NUMBER_OF_CACHED_PATH_SPECS):
+      self._path_spec_identifiers = {}
+
+    # The path specification object is stored as well to prevent its object
+    # identifier from being reused while it is cached.
+    self._path_spec_identifiers[object_identifier] = (
+        path_spec, path_spec_identifier)
+
+    return path_spec_identifier
+
+  def _GetSerializedPathSpec(self, path_spec_identifier):
+    """Retrieves a serialized path specification from the table.
+
+    Args:
+      path_spec_identifier (str): identifier of the path specification.
+
+    Returns:
+      bytes: serialized path specification or None if not available.
+    """
+    return self._serialized_path_specs.get(path_spec_identifier, None)
+
+  def _ReadPathSpec(self, path_spec_identifier):
+    """Reads a path specification from the table.
+
+    The decoded path specification objects are cached, so that events of
+    the same file entry share the same path specification object. Hence
+    the path specification object must not be changed by its users.
+
+    Args:
+      path_spec_identifier (str): identifier of the path specification.
+
+    Returns:
+      dfvfs.PathSpec: path specification.
+
+    Raises:
+      IOError: if the path specification is missing from the table.
+    """
+    path_spec = self._path_specs.get(path_spec_identifier, None)
+    if path_spec:
+      return path_spec
+
+    serialized_path_spec = self._GetSerializedPathSpec(path_spec_identifier)
+    if not serialized_path_spec:
+      raise IOError(u'Missing path specification: {0:s}.'.format(
+          path_spec_identifier))
+
+    path_spec = dfvfs_json_serializer.JsonPathSpecSerializer.ReadSerialized(
+        serialized_path_spec)
+
+    if len(self._path_specs) >= self._MAXIMUM_NUMBER_OF_CACHED_PATH_SPECS:
+      self._path_specs = {}
+
+    self._path_specs[path_spec_identifier] = path_spec
+
+    return path_spec
+
   def _SerializeAttributeContainer(self, attribute_container):
     """Serializes an attribute container.
 
+    The path specification of an event is stored in the path specification
+    table and the serialized event only contains its identifier.
+
     Args:
       attribute_container (AttributeContainer): attribute container.
 
@@ -228,9 +370,23 @@ class BaseFileStorage(BaseStorage):
     Raises:
       IOError: if the attribute container cannot be serialized.
     """
+    path_spec = None
+    if attribute_container.CONTAINER_TYPE == u'event':
+      path_spec = getattr(attribute_container, u'pathspec', None)
+
+    if path_spec:
+      path_spec_identifier = self._WritePathSpec(path_spec)
+
+      attribute_container.pathspec = None
+      setattr(
+          attribute_container, self._PATH_SPEC_IDENTIFIER_ATTRIBUTE_NAME,
+          path_spec_identifier)
+
+    profile_name = None
     if self._serializers_profiler:
-      self._serializers_profiler.StartTiming(
-          attribute_container.CONTAINER_TYPE)
+      profile_name = u'{0:s}:{1:s}'.format(
+          self.serialization_format, attribute_container.CONTAINER_TYPE)
+      self._serializers_profiler.StartTiming(profile_name)
 
     try:
       attribute_container_data = self._serializer.WriteSerialized(
@@ -242,11 +398,74 @@ class BaseFileStorage(BaseStorage):
 
     finally:
       if self._serializers_profiler:
-        self._serializers_profiler.StopTiming(
-            attribute_container.CONTAINER_TYPE)
+        self._serializers_profiler.StopTiming(profile_name)
+
+      if path_spec:
+        delattr(attribute_container, self._PATH_SPEC_IDENTIFIER_ATTRIBUTE_NAME)
+        attribute_container.pathspec = path_spec
 
     return attribute_container_data
 
+  def _SetSerializationFormat(self, serialization_format):
+    """Sets the serialization format.
+
+    Args:
+      serialization_format (str): serialization format.
+
+    Raises:
+      ValueError: if the serialization format is not supported.
+    """
+    serializer = SERIALIZERS.get(serialization_format, None)
+    if not serializer:
+      raise ValueError(u'Unsupported serialization format: {0!s}'.format(
+          serialization_format))
+
+    self._serializer = serializer
+    self.serialization_format = serialization_format
+
+  def _WritePathSpec(self, path_spec):
+    """Writes a path specification to the table.
+
+    Path specifications that were previously written are not written again.
+
+    Args:
+      path_spec (dfvfs.PathSpec): path specification.
+
+    Returns:
+      str: identifier of the path specification.
+
+    Raises:
+      IOError: if the path specification cannot be serialized.
+    """
+    path_spec_identifier = self._GetPathSpecIdentifier(path_spec)
+    if path_spec_identifier in self._written_path_spec_identifiers:
+      return path_spec_identifier
+
+    try:
+      serialized_path_spec = (
+          dfvfs_json_serializer.JsonPathSpecSerializer.WriteSerialized(
+              path_spec))
+    except (TypeError, ValueError) as exception:
+      raise IOError(u'Unable to serialize path specification: {0!s}'.format(
+          exception))
+
+    if isinstance(serialized_path_spec, py2to3.UNICODE_TYPE):
+      serialized_path_spec = serialized_path_spec.encode(u'utf-8')
+
+    self._WriteSerializedPathSpec(path_spec_identifier, serialized_path_spec)
+    self._written_path_spec_identifiers.add(path_spec_identifier)
+
+    return path_spec_identifier
+
+  @abc.abstractmethod
+  def _WriteSerializedPathSpec(self, path_spec_identifier, path_spec_data):
+    """Writes a serialized path specification to the table.
+
+    Args:
+      path_spec_identifier (str): identifier of the path specification.
+      path_spec_data (bytes): serialized path specification.
+    """
+
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
 
@@ -340,6 +559,19 @@ class StorageReader(object):
       EventTag: event tag.
     """
 
+  @abc.abstractmethod
+  def GetEventTimeRanges(self, number_of_time_ranges):
+    """Splits the events into consecutive time ranges.
+
+    Args:
+      number_of_time_ranges (int): maximum number of time ranges.
+
+    Returns:
+      list[TimeRange]: consecutive time ranges, in increasing chronological
+          order, that contain all the events or None if the events cannot be
+          split into time ranges.
+    """
+
   @abc.abstractmethod
   def GetNumberOfAnalysisReports(self):
     """Retrieves the number analysis reports.
@@ -425,6 +657,19 @@ class FileStorageReader(StorageReader):
     """
     return self._storage_file.GetEventTags()
 
+  def GetEventTimeRanges(self, number_of_time_ranges):
+    """Splits the events into consecutive time ranges.
+
+    Args:
+      number_of_time_ranges (int): maximum number of time ranges.
+
+    Returns:
+      list[TimeRange]: consecutive time ranges, in increasing chronological
+          order, that contain all the events or None if the events cannot be
+          split into time ranges.
+    """
+    return self._storage_file.GetEventTimeRanges(number_of_time_ranges)
+
   def GetNumberOfAnalysisReports(self):
     """Retrieves the number analysis reports.
 
@@ -28,8 +28,16 @@ There are multiple types of streams:
 * event_timestamps.#
   The event timestamps streams contain the timestamp of the serialized
   events.
+* event_timestamps_summary.#
+  The event timestamps summary streams contain the first and last timestamp
+  of the serialized events.
 * metadata.txt
   Stream that contains the storage metadata.
+* path_spec_data.#
+  The path specification data streams contain the path specification table.
+* path_spec_index.#
+  The path specification index streams contain the stream offset to
+  the serialized path specifications.
 * preprocess.#
   Stream that contains the preprocessing information.
   Only applies to session-based storage.
@@ -85,6 +93,35 @@ An event data stream consists of an array of 64-bit integers:
 | timestamp | timestamp | ... |
 +-----------+-----------+-...-+
 
++ The event timestamps summary stream
+
+The event timestamps summary streams contain the first and last timestamp
+of the serialized events stored in the corresponding event data stream.
+Since the events are stored in ascending timestamp order this is the
+timestamp range of the event data stream, which allows a reader to skip
+streams outside a time range without reading the event timestamps stream.
+
+An event timestamps summary stream consists of two 64-bit integers:
++-----------------+----------------+
+| first timestamp | last timestamp |
++-----------------+----------------+
+
++ The path specification data streams
+
+The path specification data streams contain the path specification table.
+The serialized events do not contain their path specification but
+the identifier of the path specification in the table, which is the MD5
+of the path specification comparable. Since the identifier does not depend
+on the storage file, the serialized events of a task storage file can be
+merged into the session storage as-is.
+
+A path specification data stream consists of entries similar to the event
+data stream, where the entry data consists of:
+<identifier>\t<serialized path specification>
+
+Where the path specification is serialized with the dfVFS JSON path
+specification serializer.
+
 + The event tag index stream
 
 The event tag index streams contain information about the event
@@ -100,6 +137,10 @@ the actual structure of an event tag index value.
 
 + Version information
 
+Added in version 20170108:
+* path_spec_data.#
+* path_spec_index.#
+
 Deprecated in version 20160715:
 * information.dump
   The serialized preprocess objects.
@@ -125,6 +166,7 @@ Deprecated in version 20160511:
   events.
 """
 
+import bisect
 import heapq
 import io
 import logging
@@ -145,9 +187,9 @@ import construct
 from plaso.containers import sessions
 from plaso.lib import definitions
 from plaso.lib import platform_specific
-from plaso.serializer import json_serializer
 from plaso.storage import interface
 from plaso.storage import gzip_file
+from plaso.storage import time_range as storage_time_range
 
 
 class _AttributeContainersList(object):
@@ -725,6 +767,26 @@ class _SerializedDataTimestampTable(object):
     """
     self._timestamps.append(timestamp)
 
+  def GetEntryIndexOfTimestamp(self, timestamp):
+    """Retrieves the index of the first entry at or after a timestamp.
+
+    Since the timestamps are stored in ascending order the entry index
+    is determined using a binary search.
+
+    Args:
+      timestamp (int): event timestamp, which contains the number of
+          micro seconds since January 1, 1970, 00:00:00 UTC.
+
+    Returns:
+      int: table entry index or None if all timestamps in the table are
+          before the timestamp.
+    """
+    entry_index = bisect.bisect_left(self._timestamps, timestamp)
+    if entry_index >= len(self._timestamps):
+      return
+
+    return entry_index
+
   def GetTimestamp(self, entry_index):
     """Retrieves a specific timestamp.
 
@@ -777,6 +839,89 @@ class _SerializedDataTimestampTable(object):
     self._zip_file.writestr(self._stream_name, table_data)
 
 
+class _SerializedDataTimestampSummary(object):
+  """Class that defines a serialized data timestamp summary.
+
+  Attributes:
+    first_timestamp (int): timestamp of the first entry, which contains
+        the number of micro seconds since January 1, 1970, 00:00:00 UTC.
+    last_timestamp (int): timestamp of the last entry, which contains
+        the number of micro seconds since January 1, 1970, 00:00:00 UTC.
+  """
+
+  _SUMMARY = construct.Struct(
+      u'timestamp_summary',
+      construct.SLInt64(u'first_timestamp'),
+      construct.SLInt64(u'last_timestamp'))
+  _SUMMARY_SIZE = _SUMMARY.sizeof()
+
+  def __init__(self, zip_file, stream_name):
+    """Initializes a serialized data timestamp summary.
+
+    Args:
+      zip_file (zipfile.ZipFile): ZIP file that contains the stream.
+      stream_name (str): name of the stream.
+    """
+    super(_SerializedDataTimestampSummary, self).__init__()
+    self._stream_name = stream_name
+    self._zip_file = zip_file
+    self.first_timestamp = None
+    self.last_timestamp = None
+
+  def IsInTimeRange(self, time_range):
+    """Determines if the summarized timestamps overlap with a time range.
+
+    Args:
+      time_range (TimeRange): time range.
+
+    Returns:
+      bool: True if the timestamp range of the summary overlaps with
+          the time range.
+    """
+    return (
+        self.last_timestamp >= time_range.start_timestamp and
+        self.first_timestamp <= time_range.end_timestamp)
+
+  def Read(self):
+    """Reads the serialized data timestamp summary.
+
+    Raises:
+      IOError: if the timestamp summary cannot be read.
+    """
+    try:
+      file_object = self._zip_file.open(self._stream_name, mode='r')
+    except KeyError as exception:
+      raise IOError(
+          u'Unable to open stream with error: {0:s}'.format(exception))
+
+    try:
+      summary_data = file_object.read(self._SUMMARY_SIZE)
+      summary = self._SUMMARY.parse(summary_data)
+
+    except construct.FieldError as exception:
+      raise IOError(
+          u'Unable to read timestamp summary with error: {0:s}'.format(
+              exception))
+
+    finally:
+      file_object.close()
+
+    self.first_timestamp = summary.first_timestamp
+    self.last_timestamp = summary.last_timestamp
+
+  def Write(self):
+    """Writes the timestamp summary.
+
+    Raises:
+      IOError: if the timestamp summary cannot be written.
+    """
+    summary = construct.Container(
+        first_timestamp=self.first_timestamp,
+        last_timestamp=self.last_timestamp)
+    summary_data = self._SUMMARY.build(summary)
+    self._zip_file.writestr(self._stream_name, summary_data)
+
+
 class _SerializedEventTagIndexTable(object):
   """Class that defines a serialized event tag index table."""
 
@@ -993,7 +1138,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
   """
 
   # The format version.
-  _FORMAT_VERSION = 20160715
+  _FORMAT_VERSION = 20170108
 
   # The earliest format version, stored in-file, that this class
   # is able to read.
@@ -1009,12 +1154,17 @@ class ZIPStorageFile(interface.BaseFileStorage):
   # The maximum serialized report size (32 MiB).
   _MAXIMUM_SERIALIZED_REPORT_SIZE = 32 * 1024 * 1024
 
+  # The interval of the entries in the event timestamps tables that are
+  # sampled to determine the event time ranges.
+  _TIME_RANGES_SAMPLE_INTERVAL = 1024
+
   _MAXIMUM_NUMBER_OF_LOCKED_FILE_ATTEMPTS = 5
   _LOCKED_FILE_SLEEP_TIME = 0.5
 
   def __init__(
       self, maximum_buffer_size=0,
-      storage_type=definitions.STORAGE_TYPE_SESSION):
+      storage_type=definitions.STORAGE_TYPE_SESSION,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON):
     """Initializes a ZIP-based storage file.
 
     Args:
@@ -1022,9 +1172,13 @@ class ZIPStorageFile(interface.BaseFileStorage):
           maximum size of a single storage stream. A value of 0 indicates
           the limit is _MAXIMUM_BUFFER_SIZE.
       storage_type (Optional[str]): storage type.
+      serialization_format (Optional[str]): serialization format used when
+          creating a new storage file. The serialization format of an
+          existing storage file is read from its storage metadata.
 
     Raises:
-      ValueError: if the maximum buffer size value is out of bounds.
+      ValueError: if the maximum buffer size value is out of bounds or
+          if the serialization format is not supported.
     """
     if (maximum_buffer_size < 0 or
         maximum_buffer_size > self._MAXIMUM_BUFFER_SIZE):
@@ -1033,7 +1187,8 @@ class ZIPStorageFile(interface.BaseFileStorage):
     if not maximum_buffer_size:
       maximum_buffer_size = self._MAXIMUM_BUFFER_SIZE
 
-    super(ZIPStorageFile, self).__init__()
+    super(ZIPStorageFile, self).__init__(
+        serialization_format=serialization_format)
     self._analysis_report_stream_number = 0
     self._error_stream_number = 1
     self._errors_list = _AttributeContainersList()
@@ -1049,6 +1204,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._event_sources_list = _AttributeContainersList()
     self._event_tag_index = None
     self._event_tag_stream_number = 1
+    self._event_timestamp_summaries = {}
     self._event_timestamp_tables = {}
     self._event_timestamp_tables_lfu = []
     self._event_heap = None
@@ -1056,6 +1212,9 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._last_session = 0
     self._last_task = 0
     self._maximum_buffer_size = maximum_buffer_size
+    self._path_spec_stream_number = 1
+    self._path_spec_table_stream_number = 1
+    self._path_specs_list = _AttributeContainersList()
     self._serialized_event_tags = []
     self._serialized_event_tags_size = 0
     self._serialized_events_heap = _SerializedEventsHeap()
@@ -1064,7 +1223,6 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._zipfile_path = None
 
     self.format_version = self._FORMAT_VERSION
-    self.serialization_format = definitions.SERIALIZER_FORMAT_JSON
     self.storage_type = storage_type
 
   def _BuildTagIndex(self):
@@ -1190,6 +1348,59 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     return event_data, event_entry_index
 
+  def _GetEventEntryIndexInTimeRange(self, stream_number, time_range):
+    """Retrieves the index of the first event of a stream in a time range.
+
+    The timestamp summary of the stream is used to skip streams that do not
+    contain events in the time range without reading the timestamp table.
+    The first matching entry is determined using a binary search of the
+    timestamp table.
+
+    Args:
+      stream_number (int): number of the serialized event object stream.
+      time_range (TimeRange): time range used to filter events that fall
+          in a specific period.
+
+    Returns:
+      int: number of the first serialized event within the stream that falls
+          in the time range, -1 if the entry index could not be determined
+          or None if the stream contains no events in the time range.
+    """
+    try:
+      timestamp_summary = self._GetSerializedEventTimestampSummary(
+          stream_number)
+    except IOError as exception:
+      logging.error((
+          u'Unable to read timestamp summary from stream: {0:d} '
+          u'with error: {1:s}.').format(stream_number, exception))
+      timestamp_summary = None
+
+    if timestamp_summary and not timestamp_summary.IsInTimeRange(time_range):
+      return
+
+    stream_name = u'event_timestamps.{0:06d}'.format(stream_number)
+    if not self._HasStream(stream_name):
+      return -1
+
+    try:
+      timestamp_table = self._GetSerializedEventTimestampTable(stream_number)
+    except IOError as exception:
+      logging.error((
+          u'Unable to read timestamp table from stream: {0:s} '
+          u'with error: {1:s}.').format(stream_name, exception))
+      return -1
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(
+        time_range.start_timestamp)
+    if entry_index is None:
+      return
+
+    timestamp = timestamp_table.GetTimestamp(entry_index)
+    if timestamp > time_range.end_timestamp:
+      return
+
+    return entry_index
+
   def _GetEventSource(self, stream_number, entry_index=-1):
     """Reads an event source from a specific stream.
 
@@ -1488,6 +1699,34 @@ class ZIPStorageFile(interface.BaseFileStorage):
     """
     return self._GetSerializedDataStreamNumbers(u'event_data.')
 
+  def _GetSerializedEventTimestampSummary(self, stream_number):
+    """Retrieves the serialized event stream timestamp summary.
+
+    Args:
+      stream_number (int): number of the stream.
+
+    Returns:
+      _SerializedDataTimestampSummary: serialized data timestamp summary or
+          None if the stream does not contain a timestamp summary.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    if stream_number in self._event_timestamp_summaries:
+      return self._event_timestamp_summaries[stream_number]
+
+    timestamp_summary = None
+
+    stream_name = u'event_timestamps_summary.{0:06d}'.format(stream_number)
+    if self._HasStream(stream_name):
+      timestamp_summary = _SerializedDataTimestampSummary(
+          self._zipfile, stream_name)
+      timestamp_summary.Read()
+
+    self._event_timestamp_summaries[stream_number] = timestamp_summary
+
+    return timestamp_summary
+
   def _GetSerializedEventTimestampTable(self, stream_number):
     """Retrieves the serialized event stream timestamp table.
 
@@ -1522,6 +1761,26 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     return timestamp_table
 
+  def _GetSerializedPathSpec(self, path_spec_identifier):
+    """Retrieves a serialized path specification from the table.
+
+    Args:
+      path_spec_identifier (str): identifier of the path specification.
+
+    Returns:
+      bytes: serialized path specification or None if not available.
+    """
+    path_spec_data = self._serialized_path_specs.get(
+        path_spec_identifier, None)
+    if not path_spec_data:
+      # The path specification can be stored in a stream that was written
+      # after the table was last read.
+      self._ReadPathSpecTable()
+      path_spec_data = self._serialized_path_specs.get(
+          path_spec_identifier, None)
+
+    return path_spec_data
+
   def _GetStreamNames(self):
     """Retrieves the stream names.
 
@@ -1600,27 +1859,10 @@ class ZIPStorageFile(interface.BaseFileStorage):
     for stream_number in number_range:
       entry_index = -1
       if time_range:
-        stream_name = u'event_timestamps.{0:06d}'.format(stream_number)
-        if self._HasStream(stream_name):
-          try:
-            timestamp_table = self._GetSerializedEventTimestampTable(
-                stream_number)
-          except IOError as exception:
-            logging.error((
-                u'Unable to read timestamp table from stream: {0:s} '
-                u'with error: {1:s}.').format(stream_name, exception))
-
-          # If the start timestamp of the time range filter is larger than the
-          # last timestamp in the timestamp table skip this stream.
-          timestamp_compare = timestamp_table.GetTimestamp(-1)
-          if time_range.start_timestamp > timestamp_compare:
-            continue
-
-          for table_index in range(timestamp_table.number_of_timestamps - 1):
-            timestamp_compare = timestamp_table.GetTimestamp(table_index)
-            if time_range.start_timestamp >= timestamp_compare:
-              entry_index = table_index
-              break
+        entry_index = self._GetEventEntryIndexInTimeRange(
+            stream_number, time_range)
+        if entry_index is None:
+          continue
 
       event = self._GetEvent(stream_number, entry_index=entry_index)
       # Check the lower bound in case no timestamp table was available.
@@ -1633,7 +1875,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
           continue
 
         self._event_heap.PushEvent(
-            event, stream_number, event.store_number)
+            event, stream_number, event.store_index)
 
         reference_timestamp = event.timestamp
         while event.timestamp == reference_timestamp:
@@ -1642,7 +1884,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
             break
 
           self._event_heap.PushEvent(
-              event, stream_number, event.store_number)
+              event, stream_number, event.store_index)
 
   def _OpenRead(self):
     """Opens the storage file for reading."""
@@ -1657,11 +1899,10 @@ class ZIPStorageFile(interface.BaseFileStorage):
       if stored_serialization_format:
         self.serialization_format = stored_serialization_format
 
-    if self.serialization_format != definitions.SERIALIZER_FORMAT_JSON:
-      raise IOError(u'Unsupported serialization format: {0:s}'.format(
-          self.serialization_format))
-
-    self._serializer = json_serializer.JSONAttributeContainerSerializer
+    try:
+      self._SetSerializationFormat(self.serialization_format)
+    except ValueError as exception:
+      raise IOError(exception)
 
     self._error_stream_number = self._GetLastStreamNumber(u'error_data.')
     self._event_stream_number = self._GetLastStreamNumber(u'event_data.')
@@ -1669,6 +1910,8 @@ class ZIPStorageFile(interface.BaseFileStorage):
         u'event_source_data.')
     self._event_tag_stream_number = self._GetLastStreamNumber(
         u'event_tag_data.')
+    self._path_spec_stream_number = self._GetLastStreamNumber(
+        u'path_spec_data.')
 
     self._analysis_report_stream_number = self._GetLastStreamNumber(
         u'analysis_report_data.')
@@ -1712,6 +1955,13 @@ class ZIPStorageFile(interface.BaseFileStorage):
     if self._event_stream_number == 1:
       self._WriteStorageMetadata()
 
+    if self._path_spec_stream_number > 1:
+      # Prevent path specifications that are already stored from being
+      # written again.
+      self._ReadPathSpecTable()
+      self._written_path_spec_identifiers.update(
+          self._serialized_path_specs.keys())
+
   def _OpenZIPFile(self, path, read_only):
     """Opens the ZIP file.
 
@@ -1829,6 +2079,34 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
     return self._ReadAttributeContainerFromStreamEntry(data_stream, u'event')
 
+  def _ReadPathSpecTable(self):
+    """Reads the path specification table streams that were not yet read.
+
+    Raises:
+      IOError: if a path specification table entry is not supported.
+    """
+    for stream_number in self._GetSerializedDataStreamNumbers(
+        u'path_spec_data.'):
+      if stream_number < self._path_spec_table_stream_number:
+        continue
+
+      stream_name = u'path_spec_data.{0:06d}'.format(stream_number)
+      data_stream = _SerializedDataStream(
+          self._zipfile, self._zipfile_path, stream_name)
+
+      entry_data = data_stream.ReadEntry()
+      while entry_data:
+        path_spec_identifier, _, path_spec_data = entry_data.partition(b'\t')
+        if not path_spec_data:
+          raise IOError(u'Unsupported path specification table entry.')
+
+        path_spec_identifier = path_spec_identifier.decode(u'utf-8')
+        self._serialized_path_specs[path_spec_identifier] = path_spec_data
+
+        entry_data = data_stream.ReadEntry()
+
+      self._path_spec_table_stream_number = stream_number + 1
+
   def _ReadSerializerStream(self):
     """Reads the serializer stream.
 
@@ -1884,8 +2162,8 @@ class ZIPStorageFile(interface.BaseFileStorage):
               storage_metadata.format_version))
 
     serialization_format = storage_metadata.serialization_format
-    if serialization_format != definitions.SERIALIZER_FORMAT_JSON:
-      raise IOError(u'Unsupported serialization format: {0:s}'.format(
+    if serialization_format not in definitions.SERIALIZER_FORMATS:
+      raise IOError(u'Unsupported serialization format: {0!s}'.format(
           serialization_format))
 
     if storage_metadata.storage_type not in definitions.STORAGE_TYPES:
@@ -1978,6 +2256,11 @@ class ZIPStorageFile(interface.BaseFileStorage):
 
   def _WriteSerializedEvents(self):
     """Writes the serialized events."""
+    # The path specifications are written first, so that the path
+    # specification table contains the path specifications of all the events
+    # that are stored.
+    self._WriteSerializedPathSpecs()
+
     if not self._serialized_events_heap.data_size:
       return
 
@@ -2030,6 +2313,14 @@ class ZIPStorageFile(interface.BaseFileStorage):
     data_stream.WriteFinalize()
     timestamp_table.Write()
 
+    if timestamp_table.number_of_timestamps:
+      stream_name = u'event_timestamps_summary.{0:06d}'.format(stream_number)
+      timestamp_summary = _SerializedDataTimestampSummary(
+          self._zipfile, stream_name)
+      timestamp_summary.first_timestamp = timestamp_table.GetTimestamp(0)
+      timestamp_summary.last_timestamp = timestamp_table.GetTimestamp(-1)
+      timestamp_summary.Write()
+
     if self._serializers_profiler:
       self._serializers_profiler.StopTiming(u'write')
 
@@ -2098,6 +2389,28 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._serialized_event_tags_size = 0
     self._serialized_event_tags = []
 
+  def _WriteSerializedPathSpec(self, path_spec_identifier, path_spec_data):
+    """Writes a serialized path specification to the table.
+
+    Args:
+      path_spec_identifier (str): identifier of the path specification.
+      path_spec_data (bytes): serialized path specification.
+    """
+    entry_data = b'\t'.join([
+        path_spec_identifier.encode(u'utf-8'), path_spec_data])
+    self._path_specs_list.PushAttributeContainer(entry_data)
+
+  def _WriteSerializedPathSpecs(self):
+    """Writes the buffered serialized path specifications."""
+    if not self._path_specs_list.data_size:
+      return
+
+    self._WriteAttributeContainersList(
+        self._path_specs_list, u'path_spec', self._path_spec_stream_number)
+
+    self._path_spec_stream_number += 1
+    self._path_specs_list.Empty()
+
   def _WriteSessionCompletion(self, session_completion):
     """Writes a session completion attribute container.
 
@@ -2309,6 +2622,52 @@ class ZIPStorageFile(interface.BaseFileStorage):
     if self._serialized_events_heap.data_size > self._maximum_buffer_size:
       self._WriteSerializedEvents()
 
+  def AddSerializedEvent(self, timestamp, event_data):
+    """Adds a serialized event.
+
+    Args:
+      timestamp (int): event timestamp, which contains the number of
+          micro seconds since January 1, 1970, 00:00:00 UTC.
+      event_data (bytes): serialized event data.
+
+    Raises:
+      IOError: when the storage file is closed or read-only.
+    """
+    if not self._is_open:
+      raise IOError(u'Unable to write to closed storage file.')
+
+    if self._read_only:
+      raise IOError(u'Unable to write to read-only storage file.')
+
+    self._serialized_events_heap.PushEvent(timestamp, event_data)
+
+    if self._serialized_events_heap.data_size > self._maximum_buffer_size:
+      self._WriteSerializedEvents()
+
+  def AddSerializedPathSpec(self, path_spec_identifier, path_spec_data):
+    """Adds a serialized path specification to the path specification table.
+
+    Path specifications that are already stored are ignored.
+
+    Args:
+      path_spec_identifier (str): identifier of the path specification.
+      path_spec_data (bytes): serialized path specification.
+
+    Raises:
+      IOError: when the storage file is closed or read-only.
+    """
+    if not self._is_open:
+      raise IOError(u'Unable to write to closed storage file.')
+
+    if self._read_only:
+      raise IOError(u'Unable to write to read-only storage file.')
+
+    if path_spec_identifier in self._written_path_spec_identifiers:
+      return
+
+    self._WriteSerializedPathSpec(path_spec_identifier, path_spec_data)
+    self._written_path_spec_identifiers.add(path_spec_identifier)
+
   def AddEventSource(self, event_source):
     """Adds an event source.
 
@@ -2456,6 +2815,7 @@ class ZIPStorageFile(interface.BaseFileStorage):
     self._event_source_offset_tables_lfu = []
     self._event_source_streams = {}
 
+    self._event_timestamp_summaries = {}
     self._event_timestamp_tables = {}
     self._event_timestamp_tables_lfu = []
 
@@ -2648,6 +3008,74 @@ class ZIPStorageFile(interface.BaseFileStorage):
           data_stream, u'event_tag'):
         yield event_tag
 
+  def GetEventTimeRanges(self, number_of_time_ranges):
+    """Splits the events into consecutive time ranges.
+
+    The time ranges are determined by sampling the event timestamps tables,
+    such that every time range contains roughly the same number of events.
+    Events with the same timestamp are always part of the same time range.
+
+    Args:
+      number_of_time_ranges (int): maximum number of time ranges.
+
+    Returns:
+      list[TimeRange]: consecutive time ranges, in increasing chronological
+          order, that contain all the events or None if the events cannot be
+          split into time ranges, for example if the storage file does not
+          contain event timestamps tables.
+    """
+    sampled_timestamps = []
+    for stream_number in self._GetSerializedEventStreamNumbers():
+      stream_name = u'event_timestamps.{0:06d}'.format(stream_number)
+      if not self._HasStream(stream_name):
+        return
+
+      try:
+        timestamp_table = self._GetSerializedEventTimestampTable(stream_number)
+      except IOError as exception:
+        logging.error((
+            u'Unable to read timestamp table from stream: {0:s} '
+            u'with error: {1:s}.').format(stream_name, exception))
+        return
+
+      number_of_timestamps = timestamp_table.number_of_timestamps
+      if not number_of_timestamps:
+        continue
+
+      for entry_index in range(
+          0, number_of_timestamps, self._TIME_RANGES_SAMPLE_INTERVAL):
+        sampled_timestamps.append(timestamp_table.GetTimestamp(entry_index))
+
+      # The timestamps are stored in ascending order, hence the last timestamp
+      # is the upper bound of the events in the stream.
+      sampled_timestamps.append(
+          timestamp_table.GetTimestamp(number_of_timestamps - 1))
+
+    if not sampled_timestamps:
+      return
+
+    sampled_timestamps.sort()
+    number_of_samples = len(sampled_timestamps)
+
+    start_timestamps = [sampled_timestamps[0]]
+    for time_range_index in range(1, number_of_time_ranges):
+      sample_index = (
+          time_range_index * number_of_samples) // number_of_time_ranges
+      start_timestamp = sampled_timestamps[sample_index]
+      if start_timestamp > start_timestamps[-1]:
+        start_timestamps.append(start_timestamp)
+
+    # The time range includes the end timestamp, hence the end timestamp
+    # is the start timestamp of the next time range minus 1.
+    end_timestamps = [
+        start_timestamp - 1 for start_timestamp in start_timestamps[1:]]
+    end_timestamps.append(sampled_timestamps[-1])
+
+    return [
+        storage_time_range.TimeRange(start_timestamp, end_timestamp)
+        for start_timestamp, end_timestamp in zip(
+            start_timestamps, end_timestamps)]
+
   def GetNumberOfAnalysisReports(self):
     """Retrieves the number analysis reports.
 
@@ -2927,7 +3355,8 @@ class ZIPStorageFileWriter(interface.StorageWriter):
 
   def __init__(
       self, session, output_file, buffer_size=0,
-      storage_type=definitions.STORAGE_TYPE_SESSION, task=None):
+      storage_type=definitions.STORAGE_TYPE_SESSION, task=None,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON):
     """Initializes a storage writer.
 
     Args:
@@ -2936,12 +3365,15 @@ class ZIPStorageFileWriter(interface.StorageWriter):
       buffer_size (Optional[int]): estimated size of a protobuf file.
       storage_type (Optional[str]): storage type.
       task(Optional[Task]): task.
+      serialization_format (Optional[str]): serialization format used when
+          creating a new storage file.
     """
     super(ZIPStorageFileWriter, self).__init__(
         session, storage_type=storage_type, task=task)
     self._buffer_size = buffer_size
     self._merge_task_storage_path = u''
     self._output_file = output_file
+    self._serialization_format = serialization_format
     self._storage_file = None
     self._serializers_profiler = None
     self._task_storage_path = None
@@ -2952,11 +3384,24 @@ class ZIPStorageFileWriter(interface.StorageWriter):
     Args:
       event: an event (instance of EventObject).
     """
+    parser_chain = getattr(event, u'parser', u'')
+    self._UpdateParsersCounter(parser_chain)
+
+  def _UpdateParsersCounter(self, parser_chain):
+    """Updates the parsers counter.
+
+    Args:
+      parser_chain (str): parser chain of the event.
+    """
+    # The events of a task storage are counted when they are merged with
+    # the session storage.
+    if self._storage_type == definitions.STORAGE_TYPE_TASK:
+      return
+
     self._session.parsers_counter[u'total'] += 1
 
     # Here we want the name of the parser or plugin not the parser chain.
-    parser_name = getattr(event, u'parser', u'')
-    _, _, parser_name = parser_name.rpartition(u'/')
+    _, _, parser_name = parser_chain.rpartition(u'/')
     if not parser_name:
       parser_name = u'N/A'
     self._session.parsers_counter[parser_name] += 1
@@ -3015,6 +3460,48 @@ class ZIPStorageFileWriter(interface.StorageWriter):
 
     self._UpdateCounters(event)
 
+  def AddSerializedEvent(self, timestamp, event_data, parser_chain):
+    """Adds a serialized event.
+
+    The serialized event data is written to the storage file without being
+    deserialized, which is used to merge events from task storage.
+
+    Args:
+      timestamp (int): event timestamp, which contains the number of
+          micro seconds since January 1, 1970, 00:00:00 UTC.
+      event_data (bytes): serialized event data.
+      parser_chain (str): parser chain of the event.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError(u'Unable to write to closed storage writer.')
+
+    self._storage_file.AddSerializedEvent(timestamp, event_data)
+    self.number_of_events += 1
+
+    self._UpdateParsersCounter(parser_chain)
+
+  def AddSerializedPathSpec(self, path_spec_identifier, path_spec_data):
+    """Adds a serialized path specification to the path specification table.
+
+    The serialized path specification is written to the storage file without
+    being deserialized, which is used to merge events from task storage.
+
+    Args:
+      path_spec_identifier (str): identifier of the path specification.
+      path_spec_data (bytes): serialized path specification.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError(u'Unable to write to closed storage writer.')
+
+    self._storage_file.AddSerializedPathSpec(
+        path_spec_identifier, path_spec_data)
+
   def AddEventSource(self, event_source):
     """Adds an event source.
 
@@ -3117,7 +3604,8 @@ class ZIPStorageFileWriter(interface.StorageWriter):
 
     return ZIPStorageFileWriter(
         self._session, storage_file_path, buffer_size=self._buffer_size,
-        storage_type=definitions.STORAGE_TYPE_TASK, task=task)
+        storage_type=definitions.STORAGE_TYPE_TASK, task=task,
+        serialization_format=self._serialization_format)
 
   def GetEvents(self, time_range=None):
     """Retrieves the events in increasing chronological order.
@@ -3189,17 +3677,23 @@ class ZIPStorageFileWriter(interface.StorageWriter):
 
     if self._storage_type == definitions.STORAGE_TYPE_TASK:
       self._storage_file = gzip_file.GZIPStorageFile(
-          storage_type=self._storage_type)
+          storage_type=self._storage_type,
+          serialization_format=self._serialization_format)
     else:
       self._storage_file = ZIPStorageFile(
           maximum_buffer_size=self._buffer_size,
-          storage_type=self._storage_type)
+          storage_type=self._storage_type,
+          serialization_format=self._serialization_format)
 
     if self._serializers_profiler:
       self._storage_file.SetSerializersProfiler(self._serializers_profiler)
 
     self._storage_file.Open(path=self._output_file, read_only=False)
 
+    # When adding to an existing storage file the serialization format stored
+    # in the file is used, which the task storage must use as well.
+    self._serialization_format = self._storage_file.serialization_format
+
     self._first_written_event_source_index = (
         self._storage_file.GetNumberOfEventSources())
     self._written_event_source_index = self._first_written_event_source_index
@@ -3290,7 +3784,9 @@ class ZIPStorageFileWriter(interface.StorageWriter):
     if not os.path.isfile(storage_file_path):
       raise IOError(u'Merge task storage path is not a file.')
 
-    return gzip_file.GZIPStorageMergeReader(self, storage_file_path)
+    return gzip_file.GZIPStorageMergeReader(
+        self, storage_file_path,
+        serialization_format=self._serialization_format)
 
   def StartTaskStorage(self):
     """Creates a temporary path for the task storage.
@@ -3305,6 +3801,15 @@ class ZIPStorageFileWriter(interface.StorageWriter):
     if self._task_storage_path:
       raise IOError(u'Task storage path already exists.')
 
+    # The task storage is created before the session storage is opened,
+    # hence the serialization format of an existing session storage file
+    # is determined here.
+    if os.path.isfile(self._output_file):
+      storage_file = ZIPStorageFile()
+      storage_file.Open(path=self._output_file)
+      self._serialization_format = storage_file.serialization_format
+      storage_file.Close()
+
     output_directory = os.path.dirname(self._output_file)
     self._task_storage_path = tempfile.mkdtemp(dir=output_directory)
 
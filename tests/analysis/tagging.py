@@ -132,6 +132,33 @@ class TaggingAnalysisPluginTest(test_lib.AnalysisPluginTestCase):
     tag_expression = plugin._ParseTaggingFile(test_path)
     self.assertEqual(len(tag_expression.children), 2)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'test_tag_file.txt'])
+  def testIndexTagRules(self):
+    """Tests the _IndexTagRules function."""
+    plugin = tagging.TaggingAnalysisPlugin()
+    test_path = self._GetTestFilePath([self._TEST_TAG_FILE_NAME])
+
+    tag_rules = plugin._ReadTagRules(test_path)
+    tags_per_data_type, tags_without_data_type = plugin._IndexTagRules(
+        tag_rules)
+
+    expected_data_types = sorted([
+        u'chrome:history:file_downloaded', u'windows:evt:record',
+        u'windows:prefetch'])
+    self.assertEqual(sorted(tags_per_data_type.keys()), expected_data_types)
+
+    # The file_downloaded and text_contains labels have rules that do not
+    # constrain the data type.
+    self.assertEqual(len(tags_without_data_type.children), 2)
+
+    # application_execution and the labels without data type.
+    tag_expression = tags_per_data_type[u'windows:prefetch']
+    self.assertEqual(len(tag_expression.children), 3)
+
+    # login_attempt, security_event and the labels without data type.
+    tag_expression = tags_per_data_type[u'windows:evt:record']
+    self.assertEqual(len(tag_expression.children), 4)
+
 
 if __name__ == '__main__':
   unittest.main()
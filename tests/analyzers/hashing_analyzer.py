@@ -11,6 +11,22 @@ from tests import test_lib as shared_test_lib
 from tests.analyzers.hashers import manager as manager_test
 
 
+class HashResultsCacheTest(shared_test_lib.BaseTestCase):
+  """Tests for the hash results cache."""
+
+  def testGetAndSetResults(self):
+    """Tests the GetResults and SetResults functions."""
+    results_cache = hashing_analyzer.HashResultsCache()
+
+    self.assertIsNone(results_cache.GetResults(u'test'))
+
+    results_cache.SetResults(u'test', [(u'md5_hash', u'abcdef')])
+    self.assertEqual(
+        results_cache.GetResults(u'test'), [(u'md5_hash', u'abcdef')])
+
+    results_cache.Close()
+
+
 class HashingAnalyzerTest(shared_test_lib.BaseTestCase):
   """Test the Hashing analyzer."""
 
@@ -45,6 +61,25 @@ class HashingAnalyzerTest(shared_test_lib.BaseTestCase):
     self.assertEqual(first_result.attribute_value, u'4')
     self.assertEqual(len(results), 1)
 
+  def testGetCachedResults(self):
+    """Tests the CacheResults and GetCachedResults functions."""
+    analyzer = hashing_analyzer.HashingAnalyzer()
+    analyzer.SetHasherNames(u'testhash')
+
+    self.assertIsNone(analyzer.GetCachedResults(u'test'))
+
+    analyzer.SetResultsCache(hashing_analyzer.HashResultsCache())
+    self.assertIsNone(analyzer.GetCachedResults(u'test'))
+
+    analyzer.Analyze(u'test data')
+    analyzer.CacheResults(u'test', analyzer.GetResults())
+
+    results = analyzer.GetCachedResults(u'test')
+    self.assertEqual(len(results), 1)
+    self.assertEqual(results[0].analyzer_name, u'hashing')
+    self.assertEqual(results[0].attribute_name, u'testhash_hash')
+    self.assertEqual(results[0].attribute_value, u'4')
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -17,10 +17,11 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
 
   _EXPECTED_OUTPUT_EXTRACTION_OPTIONS = u'\n'.join([
       (u'usage: extraction_tool_test.py [--hashers HASHER_LIST]'
-       u' [--yara_rules PATH]'),
-      (u'                               [--parsers PARSER_LIST]'
-       u' [--preferred_year YEAR]'),
-      u'                               [-p] [--process_archives]',
+       u' [--reuse_hashes]'),
+      (u'                               [--yara_rules PATH]'
+       u' [--parsers PARSER_LIST]'),
+      u'                               [--preferred_year YEAR] [-p]',
+      u'                               [--process_archives]',
       u'                               [--skip_compressed_streams]',
       u'                               [--temporary_directory DIRECTORY]',
       u'',
@@ -77,6 +78,16 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
       (u'                        such as archive.tar and archive.zip. This '
        u'can make'),
       u'                        processing significantly slower.',
+      u'  --reuse_hashes, --reuse-hashes',
+      (u'                        Reuse the hashes of file content that was '
+       u'already'),
+      (u'                        hashed during extraction, such as a file that '
+       u'is'),
+      (u'                        reachable via multiple paths within the same '
+       u'volume.'),
+      (u'                        Files are matched by volume, inode, size '
+       u'and'),
+      u'                        timestamps, not by content.',
       u'  --skip_compressed_streams, --skip-compressed-streams',
       u'                        Skip processing file content within compressed',
       u'                        streams, such as syslog.gz and syslog.bz2.',
@@ -99,6 +110,7 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
   _EXPECTED_PERFORMANCE_OPTIONS = u'\n'.join([
       u'usage: extraction_tool_test.py [--buffer_size BUFFER_SIZE]',
       u'                               [--queue_size QUEUE_SIZE]',
+      u'                               [--serializer_format FORMAT]',
       u'',
       u'Test argument parser.',
       u'',
@@ -110,6 +122,14 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
       u'  --queue_size QUEUE_SIZE, --queue-size QUEUE_SIZE',
       u'                        The maximum number of queued items per worker',
       u'                        (defaults to 125000)',
+      u'  --serializer_format FORMAT, --serializer-format FORMAT',
+      (u'                        The serializer format used to store the '
+       u'attribute'),
+      (u'                        containers, such as events, in the storage '
+       u'file:'),
+      (u'                        "binary" or "json" (defaults to "json"). The '
+       u'binary'),
+      u'                        format is faster to read and write.',
       u''])
 
   _EXPECTED_PROFILING_OPTIONS = u'\n'.join([
@@ -19,12 +19,16 @@ class ElasticSearchOutputArgumentsHelperTest(
 
   _EXPECTED_OUTPUT = u'\n'.join([
       u'usage: cli_helper.py [--index_name INDEX_NAME] [--doc_type DOC_TYPE]',
-      u'                     [--flush_interval FLUSH_INTERVAL] [--raw_fields]',
+      u'                     [--flush_interval FLUSH_INTERVAL]',
+      u'                     [--bulk_requests BULK_REQUESTS] [--raw_fields]',
       u'                     [--server HOSTNAME] [--port PORT]',
       u'',
       u'Test argument parser.',
       u'',
       u'optional arguments:',
+      u'  --bulk_requests BULK_REQUESTS',
+      u'                        Maximum number of concurrent bulk inserts to',
+      u'                        ElasticSearch.',
       u'  --doc_type DOC_TYPE   Name of the document type that will be used in',
       u'                        ElasticSearch.',
       u'  --flush_interval FLUSH_INTERVAL',
@@ -66,6 +70,11 @@ class ElasticSearchOutputArgumentsHelperTest(
       elastic_output.ElasticSearchOutputArgumentsHelper.ParseOptions(
           options, None)
 
+    options.bulk_requests = -1
+    with self.assertRaises(errors.BadConfigOption):
+      elastic_output.ElasticSearchOutputArgumentsHelper.ParseOptions(
+          options, output_module)
+
 
 if __name__ == '__main__':
   unittest.main()
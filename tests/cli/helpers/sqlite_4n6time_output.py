@@ -20,7 +20,8 @@ class SQLite4n6TimeOutputArgumentsHelperTEst(
   _EXPECTED_OUTPUT = u'\n'.join([
       (u'usage: cli_helper.py [--append] [--evidence EVIDENCE] '
        u'[--fields FIELDS]'),
-      u'                     [--additional_fields ADDITIONAL_FIELDS]',
+      (u'                     [--additional_fields ADDITIONAL_FIELDS] '
+       u'[--fast_load]'),
       u'',
       u'Test argument parser.',
       u'',
@@ -38,6 +39,15 @@ class SQLite4n6TimeOutputArgumentsHelperTEst(
       (u'  --evidence EVIDENCE   Set the evidence field to a specific value, '
        u'defaults'),
       u'                        to empty.',
+      u'  --fast_load, --fast-load',
+      (u'                        Insert the events in batches, without '
+       u'journal and'),
+      (u'                        synchronous writes, and create the indices '
+       u'after all'),
+      (u'                        the events have been inserted. Note that '
+       u'an'),
+      (u'                        interrupted load can leave the database '
+       u'corrupted.'),
       (u'  --fields FIELDS       Defines which fields should be indexed in '
        u'the'), u'                        database.',
       u''])
@@ -92,6 +92,55 @@ class StatusViewToolTest(test_lib.CLIToolTestCase):
         b'']
     self.assertEqual(string.split(b'\n'), expected_lines)
 
+  def testPrintStatusUpdateWithSkippedDuplicateFiles(self):
+    """Tests the PrintStatusUpdate function with skipped duplicate files."""
+    output_writer = test_lib.TestOutputWriter()
+
+    status_view_tool = TestStatusViewTool(output_writer=output_writer)
+
+    process_status = processing_status.ProcessingStatus()
+    process_status.number_of_skipped_duplicate_files = 12
+    process_status.UpdateForemanStatus(
+        u'f_identifier', u'f_status', 123,
+        u'f_test_file', 1, 29, 3, 456, 5, 6, 7,
+        8, 9, 10)
+    status_view_tool._PrintStatusUpdate(process_status)
+
+    string = output_writer.ReadOutput()
+
+    expected_lines = [
+        b'f_identifier\t123\tf_status\t29 (29)\t\t456 (456)\tf_test_file',
+        b'',
+        b'Skipped duplicate files: 12',
+        b'',
+        b'']
+    self.assertEqual(string.split(b'\n')[-5:], expected_lines)
+
+  def testPrintTasksStatus(self):
+    """Tests the _PrintTasksStatus function."""
+    input_reader = tools.StdinInputReader(encoding=u'ascii')
+    output_writer = test_lib.TestOutputWriter()
+
+    status_view_tool = TestStatusViewTool(
+        input_reader=input_reader, output_writer=output_writer)
+
+    tasks_status = processing_status.TasksStatus()
+    tasks_status.number_of_tasks_processing = 4
+    tasks_status.number_of_tasks_pending_merge = 3
+    tasks_status.number_of_tasks_merging = 1
+    tasks_status.total_number_of_tasks = 8
+
+    status_view_tool._PrintTasksStatus(tasks_status)
+
+    string = output_writer.ReadOutput()
+
+    expected_lines = [
+        (b'Tasks: processing: 4 pending merge: 3 merging: 1 abandoned: 0 '
+         b'total: 8'),
+        b'',
+        b'']
+    self.assertEqual(string.split(b'\n'), expected_lines)
+
   def testPrintStatusUpdateStream(self):
     """Tests the PrintStatusUpdateStream function."""
     input_reader = tools.StdinInputReader(encoding=u'ascii')
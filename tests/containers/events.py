@@ -231,6 +231,35 @@ class EventObjectTest(shared_test_lib.BaseTestCase):
     with self.assertRaises(AttributeError):
       getattr(event, u'format_string_short')
 
+  def testGetAttributeNames(self):
+    """Tests the GetAttributeNames function."""
+    event = events.EventObject()
+    event.timestamp = 123
+    event.data_type = u'mock:nothing'
+    event.another_attribute = False
+
+    expected_attribute_names = [
+        u'another_attribute', u'data_type', u'timestamp', u'uuid']
+
+    attribute_names = sorted(event.GetAttributeNames())
+    self.assertEqual(attribute_names, expected_attribute_names)
+
+    # The attributes every event defines are not stored in the instance
+    # dictionary.
+    self.assertEqual(list(event.__dict__.keys()), [u'another_attribute'])
+
+  def testUUID(self):
+    """Tests the uuid property."""
+    event = events.EventObject()
+
+    event_uuid = event.uuid
+    self.assertIsNotNone(event_uuid)
+    self.assertEqual(len(event_uuid), 32)
+    self.assertEqual(event.uuid, event_uuid)
+
+    event.uuid = u'11fca043ea224a688137deaa8d162807'
+    self.assertEqual(event.uuid, u'11fca043ea224a688137deaa8d162807')
+
 
 class EventTagTest(shared_test_lib.BaseTestCase):
   """Tests for the event tag attributes container."""
@@ -33,6 +33,17 @@ class TaskTest(shared_test_lib.BaseTestCase):
 
     self.assertEqual(test_dict, expected_dict)
 
+  def testGetPathSpecs(self):
+    """Tests the GetPathSpecs function."""
+    task = tasks.Task()
+    self.assertEqual(task.GetPathSpecs(), [])
+
+    task.path_spec = u'path_spec1'
+    self.assertEqual(task.GetPathSpecs(), [u'path_spec1'])
+
+    task.path_specs = [u'path_spec1', u'path_spec2']
+    self.assertEqual(task.GetPathSpecs(), [u'path_spec1', u'path_spec2'])
+
   # TODO: add more tests.
 
 
@@ -0,0 +1,137 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the data stream block cache."""
+
+import io
+import os
+import unittest
+
+from plaso.engine import block_cache
+
+from tests import test_lib as shared_test_lib
+
+
+class FakeFileObject(object):
+  """File-like object for testing."""
+
+  def __init__(self, data):
+    """Initializes a file-like object.
+
+    Args:
+      data (bytes): data of the file-like object.
+    """
+    super(FakeFileObject, self).__init__()
+    self._file_object = io.BytesIO(data)
+    self._size = len(data)
+    self.number_of_reads = 0
+
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Closes the file-like object."""
+    self._file_object.close()
+
+  def get_size(self):
+    """Retrieves the size of the file-like object."""
+    return self._size
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object."""
+    self.number_of_reads += 1
+    return self._file_object.read(size)
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks an offset within the file-like object."""
+    self._file_object.seek(offset, whence)
+
+
+class BlockCacheTest(shared_test_lib.BaseTestCase):
+  """Tests for the block cache."""
+
+  def testGetAndSetBlock(self):
+    """Tests the GetBlock and SetBlock functions."""
+    test_cache = block_cache.BlockCache(block_size=4, maximum_size=8)
+
+    self.assertIsNone(test_cache.GetBlock(0))
+    self.assertEqual(test_cache.number_of_misses, 1)
+
+    test_cache.SetBlock(0, b'abcd')
+    test_cache.SetBlock(1, b'efgh')
+
+    self.assertEqual(test_cache.GetBlock(0), b'abcd')
+    self.assertEqual(test_cache.number_of_hits, 1)
+
+    # Block 1 is the least recently used block and is evicted.
+    test_cache.SetBlock(2, b'ijkl')
+
+    self.assertIsNone(test_cache.GetBlock(1))
+    self.assertEqual(test_cache.GetBlock(0), b'abcd')
+    self.assertEqual(test_cache.GetBlock(2), b'ijkl')
+
+    self.assertEqual(test_cache.number_of_hits, 3)
+    self.assertEqual(test_cache.number_of_misses, 2)
+
+
+class BlockCachedFileObjectTest(shared_test_lib.BaseTestCase):
+  """Tests for the block cached file-like object."""
+
+  _TEST_DATA = b'0123456789abcdefghijklmnopqrstuvwxyz'
+
+  def testRead(self):
+    """Tests the read function."""
+    file_object = FakeFileObject(self._TEST_DATA)
+    test_cache = block_cache.BlockCache(block_size=8, maximum_size=64)
+    test_file_object = block_cache.BlockCachedFileObject(
+        file_object, block_cache=test_cache)
+
+    self.assertEqual(test_file_object.get_size(), 36)
+
+    self.assertEqual(test_file_object.read(4), b'0123')
+    self.assertEqual(test_file_object.read(8), b'456789ab')
+    self.assertEqual(test_file_object.tell(), 12)
+
+    test_file_object.seek(0, os.SEEK_SET)
+    self.assertEqual(test_file_object.read(), self._TEST_DATA)
+    self.assertEqual(test_file_object.read(), b'')
+
+    test_file_object.seek(-4, os.SEEK_END)
+    self.assertEqual(test_file_object.read(10), b'wxyz')
+
+    # Every block is read from the file-like object only once.
+    self.assertEqual(file_object.number_of_reads, 5)
+    self.assertEqual(test_cache.number_of_misses, 5)
+
+    test_file_object.close()
+
+    with self.assertRaises(IOError):
+      test_file_object.read(1)
+
+  def testReadLargerThanCache(self):
+    """Tests the read function with a read larger than the cache."""
+    file_object = FakeFileObject(self._TEST_DATA)
+    test_cache = block_cache.BlockCache(block_size=4, maximum_size=8)
+    test_file_object = block_cache.BlockCachedFileObject(
+        file_object, block_cache=test_cache)
+
+    self.assertEqual(test_file_object.read(16), self._TEST_DATA[:16])
+    self.assertEqual(test_cache.number_of_misses, 0)
+
+    test_file_object.close()
+
+  def testSeek(self):
+    """Tests the seek function."""
+    file_object = FakeFileObject(self._TEST_DATA)
+    test_file_object = block_cache.BlockCachedFileObject(file_object)
+
+    test_file_object.seek(10, os.SEEK_SET)
+    test_file_object.seek(2, os.SEEK_CUR)
+    self.assertEqual(test_file_object.get_offset(), 12)
+
+    with self.assertRaises(IOError):
+      test_file_object.seek(-1, os.SEEK_SET)
+
+    test_file_object.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
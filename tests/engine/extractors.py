@@ -19,6 +19,31 @@ from tests import test_lib as shared_test_lib
 # TODO: add EventExtractorTest
 
 
+class DuplicateFileIndexTest(shared_test_lib.BaseTestCase):
+  """Tests for the duplicate file index."""
+
+  # pylint: disable=protected-access
+
+  def testAddFileIdentifier(self):
+    """Tests the AddFileIdentifier function."""
+    duplicate_file_index = extractors._DuplicateFileIndex(
+        maximum_number_of_cached_identifiers=2)
+
+    try:
+      self.assertTrue(duplicate_file_index.AddFileIdentifier(5, 0x1234))
+      self.assertTrue(duplicate_file_index.AddFileIdentifier(5, 0x5678))
+      self.assertTrue(duplicate_file_index.AddFileIdentifier(6, 0x1234))
+
+      # The first 2 file identifiers were moved to the on-disk database.
+      self.assertFalse(duplicate_file_index.AddFileIdentifier(5, 0x1234))
+      self.assertFalse(duplicate_file_index.AddFileIdentifier(6, 0x1234))
+
+      self.assertEqual(duplicate_file_index.number_of_identifiers, 3)
+
+    finally:
+      duplicate_file_index.Close()
+
+
 class PathSpecExtractorTest(shared_test_lib.BaseTestCase):
   """Tests for the path specification extractor."""
 
@@ -90,6 +115,35 @@ class PathSpecExtractorTest(shared_test_lib.BaseTestCase):
 
       self.assertEqual(len(path_specs), 4)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'syslog.bz2'])
+  @shared_test_lib.skipUnlessHasTestFile([u'wtmp.1'])
+  def testExtractPathSpecsFileSystemWithDuplicateFileCheck(self):
+    """Tests the ExtractPathSpecs function with the duplicate file check."""
+    test_files = [
+        self._GetTestFilePath([u'syslog.bz2']),
+        self._GetTestFilePath([u'wtmp.1'])]
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      for a_file in test_files:
+        shutil.copy(a_file, temp_directory)
+
+      source_path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=temp_directory)
+
+      resolver_context = context.Context()
+      test_extractor = extractors.PathSpecExtractor(
+          resolver_context, duplicate_file_check=True)
+
+      # The files of the second source are duplicates of the first.
+      path_specs = list(test_extractor.ExtractPathSpecs(
+          [source_path_spec, source_path_spec]))
+
+      self.assertEqual(len(path_specs), 2)
+      self.assertEqual(test_extractor.number_of_skipped_duplicate_files, 2)
+
+      # pylint: disable=protected-access
+      self.assertIsNone(test_extractor._duplicate_file_index)
+
   @shared_test_lib.skipUnlessHasTestFile([u'System.evtx'])
   @shared_test_lib.skipUnlessHasTestFile([u'testdir', u'filter_1.txt'])
   @shared_test_lib.skipUnlessHasTestFile([u'testdir', u'filter_3.txt'])
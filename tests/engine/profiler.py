@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the profiler classes."""
 
+import os
 import time
 import unittest
 
@@ -32,6 +33,29 @@ class CPUTimeProfilerTest(shared_test_lib.BaseTestCase):
       test_profiler.Write()
 
 
+class ProcessingProfilerTest(shared_test_lib.BaseTestCase):
+  """Tests for the processing profiler."""
+
+  # pylint: disable=protected-access
+
+  def testIncrementCounter(self):
+    """Tests the IncrementCounter and Write functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      test_profiler = profiler.ProcessingProfiler(
+          u'unittest', path=temp_directory)
+
+      test_profiler.IncrementCounter(u'test_counter')
+      test_profiler.IncrementCounter(u'test_counter', value=5)
+
+      self.assertEqual(test_profiler._counters[u'test_counter'], 6)
+
+      test_profiler.Write()
+
+      counters_file = os.path.join(
+          temp_directory, u'processing_counters-unittest.csv')
+      self.assertTrue(os.path.exists(counters_file))
+
+
 # Note that this test can be extremely slow with guppy version 0.1.9
 # use version 0.1.10 or later.
 @unittest.skipIf(not hpy, 'missing guppy.hpy')
@@ -249,6 +249,42 @@ class EventExtractionWorkerTest(shared_test_lib.BaseTestCase):
     for event in storage_writer.events:
       md5_hash = getattr(event, u'md5_hash', None)
       self.assertEqual(md5_hash, empty_file_md5)
+      self.assertFalse(hasattr(event, u'hashing_results_reused'))
+
+  @shared_test_lib.skipUnlessHasTestFile([u'empty_file'])
+  def testExtractionWorkerHashingReuse(self):
+    """Test that the worker reuses hashes of already hashed content."""
+    resolver_context = context.Context()
+    extraction_worker = worker.EventExtractionWorker(resolver_context)
+
+    extraction_worker.SetHashers(u'md5', reuse_hashes=True)
+
+    knowledge_base_values = {u'year': 2016}
+    session = sessions.Session()
+
+    path_spec = self._GetTestFilePathSpec([u'empty_file'])
+    storage_writer = fake_storage.FakeStorageWriter(session)
+    self._TestProcessPathSpec(
+        storage_writer, path_spec, extraction_worker=extraction_worker,
+        knowledge_base_values=knowledge_base_values)
+
+    empty_file_md5 = u'd41d8cd98f00b204e9800998ecf8427e'
+    for event in storage_writer.events:
+      md5_hash = getattr(event, u'md5_hash', None)
+      self.assertEqual(md5_hash, empty_file_md5)
+      self.assertFalse(hasattr(event, u'hashing_results_reused'))
+
+    storage_writer = fake_storage.FakeStorageWriter(session)
+    self._TestProcessPathSpec(
+        storage_writer, path_spec, extraction_worker=extraction_worker,
+        knowledge_base_values=knowledge_base_values)
+
+    for event in storage_writer.events:
+      md5_hash = getattr(event, u'md5_hash', None)
+      self.assertEqual(md5_hash, empty_file_md5)
+      self.assertTrue(getattr(event, u'hashing_results_reused', False))
+
+    extraction_worker.Close()
 
   @shared_test_lib.skipUnlessHasTestFile([u'yara.rules'])
   @shared_test_lib.skipUnlessHasTestFile([u'test_pe.exe'])
@@ -51,6 +51,8 @@ class WrongEventFormatter(interface.EventFormatter):
 class EventFormatterTest(unittest.TestCase):
   """Tests for the event formatter."""
 
+  # pylint: disable=protected-access
+
   def setUp(self):
     """Makes preparations before running an individual test."""
     self._event_objects = containers_test_lib.CreateTestEvents()
@@ -69,6 +71,23 @@ class EventFormatterTest(unittest.TestCase):
     attribute_names = event_formatter.GetFormatStringAttributeNames()
     self.assertEqual(sorted(attribute_names), expected_attribute_names)
 
+  def testGetEventValues(self):
+    """Tests the _GetEventValues function."""
+    event_formatter = test_lib.TestEventFormatter()
+
+    event_object = containers_test_lib.TestEvent(1335791207939596, {
+        u'text': u'My text', u'unused': u'Not used by the formatter'})
+    event_values = event_formatter._GetEventValues(event_object)
+    self.assertEqual(event_values[u'text'], u'My text')
+    self.assertNotIn(u'unused', event_values)
+
+    # If a required attribute is missing all attributes are copied.
+    event_object = containers_test_lib.TestEvent(1335791207939596, {
+        u'unused': u'Not used by the formatter'})
+    event_values = event_formatter._GetEventValues(event_object)
+    self.assertNotIn(u'text', event_values)
+    self.assertIn(u'unused', event_values)
+
   # TODO: add test for GetMessages.
   # TODO: add test for GetSources.
 
@@ -76,6 +95,8 @@ class EventFormatterTest(unittest.TestCase):
 class ConditionalEventFormatterTest(unittest.TestCase):
   """Tests for the conditional event formatter."""
 
+  # pylint: disable=protected-access
+
   def setUp(self):
     """Makes preparations before running an individual test."""
     self._event_object = ConditionalTestEvent(1335791207939596, {
@@ -113,6 +134,21 @@ class ConditionalEventFormatterTest(unittest.TestCase):
         formatter_mediator, self._event_object)
     self.assertEqual(message, expected_message)
 
+    # Test if the cached format string is used for subsequent events.
+    message, _ = event_formatter.GetMessages(
+        formatter_mediator, self._event_object)
+    self.assertEqual(message, expected_message)
+    self.assertEqual(len(event_formatter._format_strings_cache), 1)
+
+    event_object = ConditionalTestEvent(1335791207939596, {
+        u'numeric': 0, u'optional': u'', u'text': u'text'})
+
+    expected_message = u'Comment Value: 0x00 Text: text'
+
+    message, _ = event_formatter.GetMessages(formatter_mediator, event_object)
+    self.assertEqual(message, expected_message)
+    self.assertEqual(len(event_formatter._format_strings_cache), 2)
+
   # TODO: add test for GetSources.
 
 
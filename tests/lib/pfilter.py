@@ -149,6 +149,34 @@ class PFilterTest(unittest.TestCase):
         u'\'bad, bad thing [\\sa-zA-Z\\.]+ evil\'')
     self._RunPlasoTest(event, query, True)
 
+  def testCompileOrdersFiltersByCost(self):
+    """Tests that compiled filters evaluate cheap filters first."""
+    query = u'message contains \'evil\' AND parser is \'Weirdo\''
+    my_parser = pfilter.BaseParser(query).Parse()
+    matcher = my_parser.Compile(pfilter.PlasoAttributeFilterImplementation)
+
+    self.assertIsInstance(matcher, pfilter.PlasoAndFilter)
+
+    filter_costs = [
+        pfilter.GetFilterCost(filter_object) for filter_object in matcher.args]
+    self.assertEqual(filter_costs, [1, 100])
+
+  def testGetFilterCost(self):
+    """Tests the GetFilterCost function."""
+    implementation = pfilter.PlasoAttributeFilterImplementation
+
+    my_parser = pfilter.BaseParser(u'parser is \'Weirdo\'').Parse()
+    matcher = my_parser.Compile(implementation)
+    self.assertEqual(pfilter.GetFilterCost(matcher), 1)
+
+    my_parser = pfilter.BaseParser(u'description contains \'evil\'').Parse()
+    matcher = my_parser.Compile(implementation)
+    self.assertEqual(pfilter.GetFilterCost(matcher), 100)
+
+    my_parser = pfilter.BaseParser(u'source_long regexp \'Fake\'').Parse()
+    matcher = my_parser.Compile(implementation)
+    self.assertEqual(pfilter.GetFilterCost(matcher), 200)
+
 
 if __name__ == "__main__":
   unittest.main()
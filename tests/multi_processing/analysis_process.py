@@ -7,6 +7,24 @@ import unittest
 from plaso.multi_processing import analysis_process
 
 from tests import test_lib as shared_test_lib
+from tests.containers import test_lib as containers_test_lib
+
+
+class EventSerializationTest(shared_test_lib.BaseTestCase):
+  """Tests the event serialization functions of the analysis process."""
+
+  def testSerializeAndDeserializeEvent(self):
+    """Tests the SerializeEvent and DeserializeEvent functions."""
+    event = containers_test_lib.TestEvent(1335791207939596, {
+        u'text': u'My text'})
+
+    serialized_event = analysis_process.SerializeEvent(event)
+    self.assertIsInstance(serialized_event, bytes)
+
+    deserialized_event = analysis_process.DeserializeEvent(serialized_event)
+    self.assertEqual(deserialized_event.timestamp, 1335791207939596)
+    self.assertEqual(deserialized_event.text, u'My text')
+    self.assertEqual(deserialized_event.uuid, event.uuid)
 
 
 class AnalysisProcessTest(shared_test_lib.BaseTestCase):
@@ -11,13 +11,16 @@ from plaso.analysis import tagging
 from plaso.containers import events
 from plaso.containers import sessions
 from plaso.engine import knowledge_base
+from plaso.filters import dynamic_filter
 from plaso.formatters import interface as formatters_interface
 from plaso.formatters import manager as formatters_manager
 from plaso.formatters import mediator as formatters_mediator
+from plaso.frontend import frontend
 from plaso.multi_processing import psort
 from plaso.output import dynamic
 from plaso.output import event_buffer as output_event_buffer
 from plaso.output import interface as output_interface
+from plaso.output import l2t_csv
 from plaso.output import mediator as output_mediator
 from plaso.output import null
 from plaso.storage import zip_file as storage_zip_file
@@ -188,6 +191,47 @@ class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
 
     storage_file.Close()
 
+  def _ExportEventsWithOutputModule(
+      self, storage_file_path, output_module_class,
+      number_of_export_processes=0):
+    """Exports the events of a storage file using an output module.
+
+    Args:
+      storage_file_path (str): path of the storage file.
+      output_module_class (type): output module class.
+      number_of_export_processes (Optional[int]): maximum number of export
+          processes.
+
+    Returns:
+      tuple[bytes, collections.Counter]: output and counter that tracks
+          the number of unique events read from storage.
+    """
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    output_writer = cli_test_lib.TestOutputWriter()
+
+    formatter_mediator = formatters_mediator.FormatterMediator()
+    formatter_mediator.SetPreferredLanguageIdentifier(u'en-US')
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, formatter_mediator)
+
+    output_module = output_module_class(output_mediator_object)
+    output_module.SetOutputWriter(output_writer)
+
+    storage_reader = storage_zip_file.ZIPStorageFileReader(storage_file_path)
+
+    # Sample every event timestamp so that the few events in the test file
+    # are split into multiple time ranges.
+    storage_reader._storage_file._TIME_RANGES_SAMPLE_INTERVAL = 1
+
+    test_engine = psort.PsortMultiProcessEngine()
+    counter = test_engine.ExportEvents(
+        knowledge_base_object, storage_reader, output_module,
+        number_of_export_processes=number_of_export_processes,
+        storage_file_path=storage_file_path)
+
+    return output_writer.ReadOutput(), counter
+
   def testInternalAnalyzeEvents(self):
     """Tests the _AnalyzeEvents function."""
     session = sessions.Session()
@@ -283,6 +327,61 @@ class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
         b'date,time,timezone,MACB,source,sourcetype,type,user,host,short,desc,'
         b'version,filename,inode,notes,format,extra'))
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testInternalGetExportTimeRanges(self):
+    """Tests the _GetExportTimeRanges function."""
+    storage_file_path = self._GetTestFilePath([u'psort_test.json.plaso'])
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    formatter_mediator = formatters_mediator.FormatterMediator()
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, formatter_mediator)
+
+    output_module = dynamic.DynamicOutputModule(output_mediator_object)
+
+    storage_reader = storage_zip_file.ZIPStorageFileReader(storage_file_path)
+    storage_reader._storage_file._TIME_RANGES_SAMPLE_INTERVAL = 1
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    time_ranges = test_engine._GetExportTimeRanges(
+        storage_reader, output_module, 2, storage_file_path=storage_file_path)
+    self.assertIsNotNone(time_ranges)
+    self.assertGreater(len(time_ranges), 1)
+
+    # Test without multiple export processes.
+    time_ranges = test_engine._GetExportTimeRanges(
+        storage_reader, output_module, 1, storage_file_path=storage_file_path)
+    self.assertIsNone(time_ranges)
+
+    # Test without a storage file path.
+    time_ranges = test_engine._GetExportTimeRanges(
+        storage_reader, output_module, 2)
+    self.assertIsNone(time_ranges)
+
+    # Test with a time slice.
+    time_slice = frontend.TimeSlice(1476630823000000)
+    time_ranges = test_engine._GetExportTimeRanges(
+        storage_reader, output_module, 2, storage_file_path=storage_file_path,
+        time_slice=time_slice)
+    self.assertIsNone(time_ranges)
+
+    # Test with a filter limit.
+    test_filter = dynamic_filter.DynamicFilter()
+    test_filter.CompileFilter(u'SELECT datetime, message LIMIT 10')
+    time_ranges = test_engine._GetExportTimeRanges(
+        storage_reader, output_module, 2, event_filter=test_filter,
+        storage_file_path=storage_file_path)
+    self.assertIsNone(time_ranges)
+
+    # Test with an output module that does not support export processes.
+    output_module = null.NullOutputModule(output_mediator_object)
+    time_ranges = test_engine._GetExportTimeRanges(
+        storage_reader, output_module, 2, storage_file_path=storage_file_path)
+    self.assertIsNone(time_ranges)
+
+    storage_reader.Close()
+
   # TODO: add test for _StartAnalysisProcesses.
   # TODO: add test for _StatusUpdateThreadMain.
   # TODO: add test for _StopAnalysisProcesses.
@@ -385,6 +484,27 @@ class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
         u'OS:/tmp/test/test_data/syslog,-')
     self.assertEquals(lines[14], expected_line)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testExportEventsInParallel(self):
+    """Tests the ExportEvents function with multiple export processes."""
+    storage_file_path = self._GetTestFilePath([u'psort_test.json.plaso'])
+
+    for output_module_class in (
+        dynamic.DynamicOutputModule, l2t_csv.L2TCSVOutputModule):
+      expected_output, expected_counter = self._ExportEventsWithOutputModule(
+          storage_file_path, output_module_class)
+
+      output, counter = self._ExportEventsWithOutputModule(
+          storage_file_path, output_module_class,
+          number_of_export_processes=2)
+
+      self.assertEqual(output, expected_output)
+      self.assertEqual(
+          counter[u'Events processed'], expected_counter[u'Events processed'])
+      self.assertEqual(
+          counter[u'Duplicate events removed'],
+          expected_counter[u'Duplicate events removed'])
+
 
 if __name__ == '__main__':
   unittest.main()
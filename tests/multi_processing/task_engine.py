@@ -8,16 +8,222 @@ import unittest
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 
+from plaso.containers import event_sources
 from plaso.containers import sessions
+from plaso.lib import errors
 from plaso.multi_processing import task_engine
 from plaso.storage import zip_file as storage_zip_file
 
 from tests import test_lib as shared_test_lib
 
 
-class TaskMultiProcessEngineTest(shared_test_lib.BaseTestCase):
+class EventSourceTestCase(shared_test_lib.BaseTestCase):
+  """Shared functionality for event source related tests."""
+
+  def _CreateEventSource(self, location, file_entry_type, file_size):
+    """Creates a file entry event source.
+
+    Args:
+      location (str): location of the file entry.
+      file_entry_type (str): dfVFS file entry type.
+      file_size (int): size of the file entry.
+
+    Returns:
+      FileEntryEventSource: event source.
+    """
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=location)
+    event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
+    event_source.file_entry_type = file_entry_type
+    event_source.file_size = file_size
+    return event_source
+
+
+class EventSourceHeapTest(EventSourceTestCase):
+  """Tests for the event source heap."""
+
+  # pylint: disable=protected-access
+
+  def testPopEventSource(self):
+    """Tests the PopEventSource function."""
+    event_source_heap = task_engine._EventSourceHeap()
+
+    event_source = event_source_heap.PopEventSource()
+    self.assertIsNone(event_source)
+
+    event_source_heap.PushEventSource(self._CreateEventSource(
+        u'/tmp/small', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 1024))
+    event_source_heap.PushEventSource(self._CreateEventSource(
+        u'/tmp/unknown', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, None))
+    event_source_heap.PushEventSource(self._CreateEventSource(
+        u'/tmp/large', dfvfs_definitions.FILE_ENTRY_TYPE_FILE,
+        16 * 1024 * 1024))
+    event_source_heap.PushEventSource(self._CreateEventSource(
+        u'/tmp', dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY, 4096))
+    event_source_heap.PushEventSource(self._CreateEventSource(
+        u'/tmp/small2', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 1024))
+
+    expected_locations = [
+        u'/tmp', u'/tmp/large', u'/tmp/small', u'/tmp/small2',
+        u'/tmp/unknown']
+
+    locations = []
+    event_source = event_source_heap.PopEventSource()
+    while event_source:
+      locations.append(event_source.path_spec.location)
+      event_source = event_source_heap.PopEventSource()
+
+    self.assertEqual(locations, expected_locations)
+
+  def testPushEventSource(self):
+    """Tests the PushEventSource function."""
+    event_source_heap = task_engine._EventSourceHeap(
+        maximum_number_of_items=2)
+
+    event_source_heap.PushEventSource(self._CreateEventSource(
+        u'/tmp/small', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 1024))
+
+    with self.assertRaises(errors.HeapFull):
+      event_source_heap.PushEventSource(self._CreateEventSource(
+          u'/tmp/large', dfvfs_definitions.FILE_ENTRY_TYPE_FILE,
+          16 * 1024 * 1024))
+
+
+class TaskMultiProcessEngineTest(EventSourceTestCase):
   """Tests for the task multi-process engine."""
 
+  # pylint: disable=protected-access
+
+  def testCanBatchEventSource(self):
+    """Tests the _CanBatchEventSource function."""
+    test_engine = task_engine.TaskMultiProcessEngine()
+
+    event_source = self._CreateEventSource(
+        u'/tmp/small', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 1024)
+    self.assertTrue(test_engine._CanBatchEventSource(event_source))
+
+    event_source = self._CreateEventSource(
+        u'/tmp/NTUSER.DAT', dfvfs_definitions.FILE_ENTRY_TYPE_FILE,
+        16 * 1024 * 1024)
+    self.assertFalse(test_engine._CanBatchEventSource(event_source))
+
+    event_source = self._CreateEventSource(
+        u'/tmp/unknown', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, None)
+    self.assertFalse(test_engine._CanBatchEventSource(event_source))
+
+    event_source = self._CreateEventSource(
+        u'/tmp', dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY, 0)
+    self.assertFalse(test_engine._CanBatchEventSource(event_source))
+
+  def testCreateTask(self):
+    """Tests the _CreateTask function."""
+    test_engine = task_engine.TaskMultiProcessEngine()
+
+    event_source_heap = task_engine._EventSourceHeap()
+    for index in range(3):
+      event_source = self._CreateEventSource(
+          u'/tmp/small{0:d}'.format(index),
+          dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 1024)
+      event_source_heap.PushEventSource(event_source)
+
+    event_source = self._CreateEventSource(
+        u'/tmp/small', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 1024)
+
+    task, next_event_source = test_engine._CreateTask(
+        event_source, event_source_heap)
+    self.assertIsNotNone(task)
+    self.assertEqual(task.path_spec, event_source.path_spec)
+    self.assertEqual(len(task.GetPathSpecs()), 4)
+    self.assertIsNone(next_event_source)
+
+    large_event_source = self._CreateEventSource(
+        u'/tmp/large', dfvfs_definitions.FILE_ENTRY_TYPE_FILE,
+        16 * 1024 * 1024)
+    event_source_heap.PushEventSource(large_event_source)
+
+    task, next_event_source = test_engine._CreateTask(
+        event_source, event_source_heap)
+    self.assertIsNotNone(task)
+    self.assertIsNone(task.path_specs)
+    self.assertEqual(next_event_source, large_event_source)
+
+    task, next_event_source = test_engine._CreateTask(
+        next_event_source, event_source_heap)
+    self.assertIsNotNone(task)
+    self.assertIsNone(task.path_specs)
+    self.assertEqual(task.GetPathSpecs(), [large_event_source.path_spec])
+    self.assertIsNone(next_event_source)
+
+  @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
+  def testCollectorThread(self):
+    """Tests the collector thread functions."""
+    test_engine = task_engine.TaskMultiProcessEngine()
+
+    source_path = self._GetTestFilePath([u'ímynd.dd'])
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    source_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=os_path_spec)
+
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_writer = storage_zip_file.ZIPStorageFileWriter(
+          session, temp_file)
+      storage_writer.Open()
+
+      try:
+        test_engine._StartCollectorThread([source_path_spec], storage_writer)
+        test_engine._collector_thread.join()
+
+        self.assertFalse(test_engine._collector_thread_active)
+        self.assertEqual(test_engine._number_of_produced_sources, 1)
+
+        test_engine._StopCollectorThread()
+        self.assertIsNone(test_engine._collector_thread)
+        self.assertFalse(test_engine._abort)
+
+        event_source = storage_writer.GetFirstWrittenEventSource()
+        self.assertIsNotNone(event_source)
+
+      finally:
+        storage_writer.Close()
+
+  def testCollectorThreadError(self):
+    """Tests the collector thread functions when the collection fails."""
+    test_engine = task_engine.TaskMultiProcessEngine()
+
+    # Iterating the source path specifications raises a TypeError.
+    test_engine._StartCollectorThread(None, None)
+    test_engine._collector_thread.join()
+
+    self.assertFalse(test_engine._collector_thread_active)
+    self.assertTrue(test_engine._abort)
+
+    test_engine._StopCollectorThread()
+    self.assertIsNone(test_engine._collector_thread)
+
+  def testMergeThread(self):
+    """Tests the merge thread functions."""
+    test_engine = task_engine.TaskMultiProcessEngine()
+
+    def _FailMergeTaskStorage(
+        unused_storage_writer, maximum_number_of_containers=0):
+      """Fails to merge task storage."""
+      raise IOError(u'Corrupt task storage.')
+
+    test_engine._MergeTaskStorage = _FailMergeTaskStorage
+
+    test_engine._StartMergeThread()
+    test_engine._merge_thread.join()
+
+    self.assertTrue(test_engine._abort)
+
+    test_engine._StopMergeThread()
+    self.assertIsNone(test_engine._merge_thread)
+
   @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
   def testProcessSources(self):
     """Tests the PreprocessSources and ProcessSources function."""
@@ -48,6 +254,49 @@ class TaskMultiProcessEngineTest(shared_test_lib.BaseTestCase):
     # on multi-process primitives e.g. by writing to a file.
     # self.assertEqual(len(storage_writer.events), 15)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
+  def testProcessSourcesScheduleMergedEventSources(self):
+    """Tests that ProcessSources schedules the merged event sources.
+
+    The event sources of the file system are written by the merge thread
+    when it merges the task of the root directory, which can be the last
+    active task. Processing is repeated since this depends on the timing
+    of the merge thread.
+    """
+    source_path = self._GetTestFilePath([u'ímynd.dd'])
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    source_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=os_path_spec)
+
+    for _ in range(5):
+      test_engine = task_engine.TaskMultiProcessEngine(
+          maximum_number_of_tasks=100)
+      test_engine.PreprocessSources([source_path_spec])
+
+      session = sessions.Session()
+
+      with shared_test_lib.TempDirectory() as temp_directory:
+        temp_file = os.path.join(temp_directory, u'storage.plaso')
+        storage_writer = storage_zip_file.ZIPStorageFileWriter(
+            session, temp_file)
+
+        processing_status = test_engine.ProcessSources(
+            session.identifier, [source_path_spec], storage_writer,
+            parser_filter_expression=u'filestat')
+        self.assertFalse(processing_status.aborted)
+
+        storage_file = storage_zip_file.ZIPStorageFile()
+        storage_file.Open(path=temp_file)
+        try:
+          # The root directory is the only collected event source, the other
+          # event sources are written by the merge thread.
+          self.assertGreater(len(list(storage_file.GetEventSources())), 1)
+          self.assertGreater(len(list(storage_file.GetEvents())), 1)
+        finally:
+          storage_file.Close()
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -81,6 +81,41 @@ class TaskManagerTestCase(shared_test_lib.BaseTestCase):
     merging_task = manager.GetTaskPendingMerge(small_task)
     self.assertEqual(merging_task, small_task)
 
+  def testGetStatusInformation(self):
+    """Tests the GetStatusInformation function."""
+    manager = task_manager.TaskManager()
+
+    tasks_status = manager.GetStatusInformation()
+    self.assertEqual(tasks_status.total_number_of_tasks, 0)
+
+    task = manager.CreateTask(self._TEST_SESSION_IDENTIFIER)
+    task.storage_file_size = 10
+    manager.UpdateTaskAsProcessing(task)
+
+    tasks_status = manager.GetStatusInformation()
+    self.assertEqual(tasks_status.number_of_tasks_processing, 1)
+    self.assertEqual(tasks_status.number_of_tasks_pending_merge, 0)
+    self.assertEqual(tasks_status.total_number_of_tasks, 1)
+
+    manager.UpdateTaskAsPendingMerge(task)
+
+    tasks_status = manager.GetStatusInformation()
+    self.assertEqual(tasks_status.number_of_tasks_processing, 0)
+    self.assertEqual(tasks_status.number_of_tasks_pending_merge, 1)
+    self.assertEqual(tasks_status.number_of_tasks_merging, 0)
+
+    manager.GetTaskPendingMerge(None)
+
+    tasks_status = manager.GetStatusInformation()
+    self.assertEqual(tasks_status.number_of_tasks_pending_merge, 0)
+    self.assertEqual(tasks_status.number_of_tasks_merging, 1)
+
+    manager.CompleteTask(task)
+
+    tasks_status = manager.GetStatusInformation()
+    self.assertEqual(tasks_status.number_of_tasks_merging, 0)
+    self.assertEqual(tasks_status.total_number_of_tasks, 0)
+
   # TODO: Add tests for rescheduling, updating and abandoning tasks.
 
 
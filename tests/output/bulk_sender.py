@@ -0,0 +1,225 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the background bulk sender."""
+
+import threading
+import unittest
+
+try:
+  import BaseHTTPServer
+except ImportError:
+  import http.server as BaseHTTPServer  # pylint: disable=import-error
+
+try:
+  import httplib
+except ImportError:
+  import http.client as httplib  # pylint: disable=import-error
+
+from plaso.output import bulk_sender
+
+from tests import test_lib as shared_test_lib
+
+
+class StandInBulkRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+  """Request handler of a stand-in bulk insert HTTP server."""
+
+  def do_POST(self):  # pylint: disable=invalid-name
+    """Handles a POST request."""
+    content_length = int(self.headers.get(u'Content-Length', 0))
+    body = self.rfile.read(content_length)
+
+    with self.server.lock:
+      if self.server.response_codes:
+        response_code = self.server.response_codes.pop(0)
+      else:
+        response_code = 200
+
+      if response_code == 200:
+        self.server.received_lines.extend(body.splitlines())
+
+    self.send_response(response_code)
+    self.send_header(u'Content-Length', u'0')
+    self.end_headers()
+
+  def log_message(self, *unused_args):  # pylint: disable=arguments-differ
+    """Suppresses the request logging."""
+    return
+
+
+class BulkRequestError(Exception):
+  """Error raised when the stand-in HTTP server rejects a bulk request."""
+
+  def __init__(self, status_code):
+    """Initializes a bulk request error.
+
+    Args:
+      status_code (int): HTTP status code.
+    """
+    super(BulkRequestError, self).__init__(
+        u'HTTP status code: {0:d}'.format(status_code))
+    self.status_code = status_code
+
+
+class BulkSenderTest(shared_test_lib.BaseTestCase):
+  """Tests for the background bulk sender."""
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._server = BaseHTTPServer.HTTPServer(
+        (u'127.0.0.1', 0), StandInBulkRequestHandler)
+    self._server.lock = threading.Lock()
+    self._server.received_lines = []
+    self._server.response_codes = []
+
+    self._server_thread = threading.Thread(target=self._server.serve_forever)
+    self._server_thread.daemon = True
+    self._server_thread.start()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    self._server.shutdown()
+    self._server.server_close()
+    self._server_thread.join()
+
+  def _IsRetryable(self, exception):
+    """Determines if a bulk request should be retried.
+
+    Args:
+      exception (Exception): exception raised by the bulk request.
+
+    Returns:
+      bool: True if the stand-in HTTP server was overloaded.
+    """
+    return getattr(exception, u'status_code', None) == 429
+
+  def _SendBatch(self, batch):
+    """Sends a batch to the stand-in HTTP server.
+
+    Args:
+      batch (list[bytes]): documents.
+
+    Raises:
+      BulkRequestError: if the stand-in HTTP server rejects the batch.
+    """
+    host, port = self._server.server_address
+    connection = httplib.HTTPConnection(host, port, timeout=10)
+    try:
+      connection.request(u'POST', u'/_bulk', body=b'\n'.join(batch))
+      response = connection.getresponse()
+      response.read()
+    finally:
+      connection.close()
+
+    if response.status != 200:
+      raise BulkRequestError(response.status)
+
+  def testAddBatch(self):
+    """Tests the AddBatch and Stop functions."""
+    test_sender = bulk_sender.BulkSender(
+        self._SendBatch, is_retryable_function=self._IsRetryable,
+        maximum_number_of_queued_batches=2, number_of_senders=3,
+        retry_delay=0.01)
+
+    expected_lines = []
+    for batch_index in range(10):
+      batch = [
+          u'{0:d}-{1:d}'.format(batch_index, document_index).encode(u'ascii')
+          for document_index in range(5)]
+      expected_lines.extend(batch)
+      test_sender.AddBatch(batch, len(batch))
+
+    test_sender.Stop()
+
+    self.assertEqual(test_sender.number_of_batches, 10)
+    self.assertEqual(test_sender.number_of_documents, 50)
+    self.assertEqual(test_sender.number_of_failed_batches, 0)
+    self.assertEqual(test_sender.number_of_retries, 0)
+    self.assertEqual(
+        sorted(self._server.received_lines), sorted(expected_lines))
+
+    self.assertGreater(test_sender.GetAverageLatency(), 0.0)
+    self.assertGreater(test_sender.GetDocumentsPerSecond(), 0.0)
+
+  def testAddBatchWithRetry(self):
+    """Tests the AddBatch function with a server that is overloaded."""
+    self._server.response_codes = [429, 429]
+
+    test_sender = bulk_sender.BulkSender(
+        self._SendBatch, is_retryable_function=self._IsRetryable,
+        number_of_senders=1, retry_delay=0.01)
+
+    test_sender.AddBatch([b'document1', b'document2'], 2)
+    test_sender.Flush()
+
+    self.assertEqual(test_sender.number_of_batches, 1)
+    self.assertEqual(test_sender.number_of_documents, 2)
+    self.assertEqual(test_sender.number_of_retries, 2)
+    self.assertEqual(
+        self._server.received_lines, [b'document1', b'document2'])
+
+    test_sender.Stop()
+
+  def testAddBatchWithRejectedDocuments(self):
+    """Tests the AddBatch function with documents that are rejected."""
+    sent_batches = []
+
+    def _SendBatch(batch):
+      """Sends a batch of which the documents with a 2 are rejected.
+
+      Args:
+        batch (list[bytes]): documents.
+
+      Returns:
+        SendResult: result of the documents that were not sent.
+      """
+      sent_batches.append(batch)
+
+      rejected_batch = [document for document in batch if b'2' in document]
+      number_of_failed_documents = len([
+          document for document in batch if b'3' in document])
+      return bulk_sender.SendResult(
+          number_of_failed_documents=number_of_failed_documents,
+          number_of_rejected_documents=len(rejected_batch),
+          rejected_batch=rejected_batch or None)
+
+    test_sender = bulk_sender.BulkSender(
+        _SendBatch, maximum_number_of_retries=2, number_of_senders=1,
+        retry_delay=0.01)
+
+    test_sender.AddBatch([b'document1', b'document2', b'document3'], 3)
+    test_sender.Stop()
+
+    # Only the rejected document is resent.
+    self.assertEqual(sent_batches, [
+        [b'document1', b'document2', b'document3'], [b'document2'],
+        [b'document2']])
+
+    self.assertEqual(test_sender.number_of_batches, 1)
+    self.assertEqual(test_sender.number_of_documents, 1)
+    self.assertEqual(test_sender.number_of_failed_batches, 0)
+    self.assertEqual(test_sender.number_of_failed_documents, 2)
+    self.assertEqual(test_sender.number_of_retries, 2)
+
+  def testAddBatchWithError(self):
+    """Tests the AddBatch function with a server that rejects a batch."""
+    self._server.response_codes = [400]
+
+    test_sender = bulk_sender.BulkSender(
+        self._SendBatch, is_retryable_function=self._IsRetryable,
+        number_of_senders=1, retry_delay=0.01)
+
+    test_sender.AddBatch([b'document1'], 1)
+
+    with self.assertRaises(RuntimeError):
+      test_sender.Stop()
+
+    self.assertEqual(test_sender.number_of_batches, 0)
+    self.assertEqual(test_sender.number_of_failed_batches, 1)
+    self.assertEqual(test_sender.number_of_retries, 0)
+
+    with self.assertRaises(RuntimeError):
+      test_sender.AddBatch([b'document2'], 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the date and time rendering cache."""
+
+import unittest
+
+import pytz  # pylint: disable=wrong-import-order
+
+from plaso.output import date_time_cache
+
+from tests import test_lib as shared_test_lib
+
+
+class DateTimeCacheTest(shared_test_lib.BaseTestCase):
+  """Tests for the date and time rendering cache."""
+
+  def testGetDateString(self):
+    """Tests the GetDateString function."""
+    test_cache = date_time_cache.DateTimeCache()
+
+    date_string = test_cache.GetDateString(1340821021123456)
+    self.assertEqual(date_string, u'2012-06-27')
+
+    date_string = test_cache.GetDateString(-1)
+    self.assertEqual(date_string, u'1969-12-31')
+
+    test_cache.SetTimezone(pytz.timezone(u'Europe/Amsterdam'))
+
+    date_string = test_cache.GetDateString(-1)
+    self.assertEqual(date_string, u'1970-01-01')
+
+    with self.assertRaises(OverflowError):
+      test_cache.GetDateString(2 ** 62)
+
+  def testGetDateTimeValues(self):
+    """Tests the GetDateTimeValues function."""
+    test_cache = date_time_cache.DateTimeCache(
+        timezone=pytz.timezone(u'America/New_York'))
+
+    date_time_values = test_cache.GetDateTimeValues(1340821021123456)
+    self.assertEqual(date_time_values.year, 2012)
+    self.assertEqual(date_time_values.month, 6)
+    self.assertEqual(date_time_values.day_of_month, 27)
+    self.assertEqual(date_time_values.hours, 14)
+    self.assertEqual(date_time_values.minutes, 17)
+    self.assertEqual(date_time_values.seconds, 1)
+    self.assertEqual(date_time_values.utc_offset_string, u'-04:00')
+
+    # The date and time values are cached per second.
+    other_date_time_values = test_cache.GetDateTimeValues(1340821021999999)
+    self.assertIs(other_date_time_values, date_time_values)
+
+  def testGetISO8601String(self):
+    """Tests the GetISO8601String function."""
+    test_cache = date_time_cache.DateTimeCache()
+
+    iso_string = test_cache.GetISO8601String(1340821021000000)
+    self.assertEqual(iso_string, u'2012-06-27T18:17:01+00:00')
+
+    iso_string = test_cache.GetISO8601String(1340821021123456)
+    self.assertEqual(iso_string, u'2012-06-27T18:17:01.123456+00:00')
+
+    iso_string = test_cache.GetISO8601String(-1)
+    self.assertEqual(iso_string, u'1969-12-31T23:59:59.999999+00:00')
+
+    test_cache.SetTimezone(pytz.timezone(u'Europe/Amsterdam'))
+
+    iso_string = test_cache.GetISO8601String(1340821021123456)
+    self.assertEqual(iso_string, u'2012-06-27T20:17:01.123456+02:00')
+
+    iso_string = test_cache.GetISO8601String(1325376000000000)
+    self.assertEqual(iso_string, u'2012-01-01T01:00:00+01:00')
+
+    # The transition to daylight saving time.
+    iso_string = test_cache.GetISO8601String(1332637199999999)
+    self.assertEqual(iso_string, u'2012-03-25T01:59:59.999999+01:00')
+
+    iso_string = test_cache.GetISO8601String(1332637200000000)
+    self.assertEqual(iso_string, u'2012-03-25T03:00:00+02:00')
+
+    test_cache.SetTimezone(pytz.timezone(u'America/New_York'))
+
+    iso_string = test_cache.GetISO8601String(1325376000000000)
+    self.assertEqual(iso_string, u'2011-12-31T19:00:00-05:00')
+
+  def testGetTimeString(self):
+    """Tests the GetTimeString function."""
+    test_cache = date_time_cache.DateTimeCache()
+
+    time_string = test_cache.GetTimeString(1340821021123456)
+    self.assertEqual(time_string, u'18:17:01')
+
+    test_cache.SetTimezone(pytz.timezone(u'Europe/Amsterdam'))
+
+    time_string = test_cache.GetTimeString(1340821021123456)
+    self.assertEqual(time_string, u'20:17:01')
+
+
+if __name__ == '__main__':
+  unittest.main()
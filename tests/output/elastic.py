@@ -79,6 +79,57 @@ class ElasticSearchHelperTest(test_lib.OutputModuleTestCase):
     self.assertIsInstance(event_dict, dict)
     self.assertDictContainsSubset(expected_dict, event_dict)
 
+  def testIsRetryableError(self):
+    """Tests the _IsRetryableError function."""
+    output_mediator = self._CreateOutputMediator()
+
+    elasticsearch_helper = elastic.ElasticSearchHelper(
+        output_mediator, u'127.0.0.1', 9200, 1000, u'test', {}, u'test_type')
+
+    exception = RuntimeError(u'Too many requests')
+    exception.status_code = 429
+    self.assertTrue(elasticsearch_helper._IsRetryableError(exception))
+
+    exception.status_code = 400
+    self.assertFalse(elasticsearch_helper._IsRetryableError(exception))
+
+    exception = ValueError(u'Invalid event')
+    self.assertFalse(elasticsearch_helper._IsRetryableError(exception))
+
+  def testSendBulkRequest(self):
+    """Tests the _SendBulkRequest function."""
+    output_mediator = self._CreateOutputMediator()
+
+    elasticsearch_helper = elastic.ElasticSearchHelper(
+        output_mediator, u'127.0.0.1', 9200, 1000, u'test', {}, u'test_type')
+    elasticsearch_helper.client = MagicMock()
+
+    events = [
+        {u'index': {}}, {u'message': u'event1'},
+        {u'index': {}}, {u'message': u'event2'},
+        {u'index': {}}, {u'message': u'event3'}]
+
+    elasticsearch_helper.client.bulk.return_value = {
+        u'errors': False, u'items': [
+            {u'index': {u'status': 201}}, {u'index': {u'status': 201}},
+            {u'index': {u'status': 201}}]}
+
+    send_result = elasticsearch_helper._SendBulkRequest(events)
+    self.assertIsNone(send_result)
+
+    elasticsearch_helper.client.bulk.return_value = {
+        u'errors': True, u'items': [
+            {u'index': {u'status': 201}},
+            {u'index': {u'error': u'Rejected', u'status': 429}},
+            {u'index': {u'error': u'Mapper parsing error', u'status': 400}}]}
+
+    send_result = elasticsearch_helper._SendBulkRequest(events)
+    self.assertIsNotNone(send_result)
+    self.assertEqual(send_result.number_of_failed_documents, 1)
+    self.assertEqual(send_result.number_of_rejected_documents, 1)
+    self.assertEqual(
+        send_result.rejected_batch, [{u'index': {}}, {u'message': u'event2'}])
+
 
 if __name__ == '__main__':
   unittest.main()
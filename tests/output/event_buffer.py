@@ -76,6 +76,33 @@ class EventBufferTest(test_lib.OutputModuleTestCase):
     event_buffer_object.Append(TestEvent(123457, u'Now is different'))
     self._CheckBufferLength(event_buffer_object, 1)
 
+  def testWriteHeaderAndFooter(self):
+    """Tests writing the header and footer."""
+    output_mediator = self._CreateOutputMediator()
+    output_writer = cli_test_lib.TestOutputWriter()
+    output_module = test_lib.TestOutputModule(output_mediator)
+    output_module.SetOutputWriter(output_writer)
+
+    event_buffer_object = event_buffer.EventBuffer(output_module, False)
+    event_buffer_object.End()
+
+    output = output_writer.ReadOutput()
+    self.assertEqual(output, b'<EventFile>\n</EventFile>\n')
+
+    output_writer = cli_test_lib.TestOutputWriter()
+    output_module = test_lib.TestOutputModule(output_mediator)
+    output_module.SetOutputWriter(output_writer)
+
+    event_buffer_object = event_buffer.EventBuffer(
+        output_module, False, write_header_and_footer=False)
+    event_buffer_object.Append(TestEvent(123456, u'Now is now'))
+    event_buffer_object.End()
+
+    output = output_writer.ReadOutput()
+    self.assertEqual(output, (
+        b'<Event>\n\t<Date>03/01/2012</Date>\n\t<Time>123456</Time>\n'
+        b'\t<Entry>Now is now</Entry>\n</Event>\n'))
+
 
 if __name__ == '__main__':
   unittest.main()
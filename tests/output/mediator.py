@@ -61,6 +61,25 @@ class OutputMediatorTest(unittest.TestCase):
     formatters_manager.FormattersManager.DeregisterFormatter(
         TestEventFormatter)
 
+  def testGetEventValues(self):
+    """Tests the GetEventValues function."""
+    event_object = TestEvent()
+
+    event_values = self._output_mediator.GetEventValues(event_object)
+    self.assertEqual(event_values[u'hostname'], u'ubuntu')
+    self.assertEqual(event_values[u'username'], u'root')
+
+    self._output_mediator.StartEventRendering(event_object)
+
+    event_values = self._output_mediator.GetEventValues(event_object)
+    other_event_values = self._output_mediator.GetEventValues(event_object)
+    self.assertIs(other_event_values, event_values)
+
+    self._output_mediator.StopEventRendering()
+
+    other_event_values = self._output_mediator.GetEventValues(event_object)
+    self.assertIsNot(other_event_values, event_values)
+
   def testGetFormattedMessages(self):
     """Tests the GetFormattedMessages function."""
     event_object = TestEvent()
@@ -80,6 +99,31 @@ class OutputMediatorTest(unittest.TestCase):
     formatters_manager.FormattersManager.DeregisterFormatter(
         TestEventFormatter)
 
+  def testGetFormattedMessagesWhileRendering(self):
+    """Tests the GetFormattedMessages function while rendering an event."""
+    event_object = TestEvent()
+    other_event_object = TestEvent()
+    other_event_object.text = u'Other text'
+
+    formatters_manager.FormattersManager.RegisterFormatter(
+        TestEventFormatter)
+
+    self._output_mediator.StartEventRendering(event_object)
+
+    messages = self._output_mediator.GetFormattedMessages(event_object)
+    other_messages = self._output_mediator.GetFormattedMessages(event_object)
+    self.assertIs(other_messages, messages)
+
+    # Other events are formatted without the render context.
+    message, _ = self._output_mediator.GetFormattedMessages(
+        other_event_object)
+    self.assertEqual(message, u'Other text')
+
+    self._output_mediator.StopEventRendering()
+
+    formatters_manager.FormattersManager.DeregisterFormatter(
+        TestEventFormatter)
+
   def testGetFormattedSources(self):
     """Tests the GetFormattedSources function."""
     event_object = TestEvent()
@@ -106,6 +106,40 @@ class SqliteOutputModuleTest(test_lib.OutputModuleTestCase):
       row_dict = dict_from_row(res.fetchone())
       self.assertDictContainsSubset(expected_dict, row_dict)
 
+  def testOutputFastLoad(self):
+    """Tests for the sqlite output in fast load mode."""
+    timestamp = timelib.Timestamp.CopyFromString(
+        u'2012-06-27 18:17:01+00:00')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      output_mediator = self._CreateOutputMediator()
+      sqlite_output = sqlite_4n6time.SQLite4n6TimeOutputModule(
+          output_mediator)
+
+      sqlite_file = os.path.join(temp_directory, u'4n6time.db')
+      sqlite_output.SetFastLoad(True)
+      sqlite_output.SetFilename(sqlite_file)
+
+      sqlite_output.Open()
+      for _ in range(3):
+        sqlite_output.WriteEventBody(SQLiteTestEvent(timestamp))
+      sqlite_output.Close()
+
+      sqlite_connection = sqlite3.connect(sqlite_file)
+
+      res = sqlite_connection.execute(u'SELECT COUNT(*) FROM log2timeline')
+      self.assertEqual(res.fetchone()[0], 3)
+
+      res = sqlite_connection.execute(u'SELECT * FROM l2t_hosts')
+      self.assertEqual(res.fetchall(), [(u'ubuntu', 3)])
+
+      res = sqlite_connection.execute(
+          u'SELECT name FROM sqlite_master WHERE type = "index"')
+      index_names = sorted([row[0] for row in res.fetchall()])
+      self.assertEqual(index_names, [
+          u'datetime_idx', u'host_idx', u'source_idx', u'sourcetype_idx',
+          u'type_idx', u'user_idx'])
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -18,6 +18,20 @@ __author__ = 'Ashley Holtz (ashley.a.holtz@gmail.com)'
 class WinIISUnitTest(test_lib.ParserTestCase):
   """Tests for the Windows IIS parser."""
 
+  @shared_test_lib.skipUnlessHasTestFile([u'iis.log'])
+  def testMatchesFileHeader(self):
+    """Tests the MatchesFileHeader function."""
+    parser_object = iis.WinIISParser()
+
+    test_file = self._GetTestFilePath([u'iis.log'])
+    with open(test_file, 'rb') as file_object:
+      file_header = file_object.read(4096)
+
+    self.assertTrue(parser_object.MatchesFileHeader(file_header, False))
+
+    file_header = b'#Software: Apache\n'
+    self.assertFalse(parser_object.MatchesFileHeader(file_header, True))
+
   @shared_test_lib.skipUnlessHasTestFile([u'iis.log'])
   def testParse(self):
     """Tests the Parse function."""
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the SQLite database parser."""
 
+import os
 import sys
 import unittest
 
@@ -112,6 +113,50 @@ class SQLiteParserTest(test_lib.ParserTestCase):
 
     self.assertEqual(expected_results, row_results)
 
+  @shared_test_lib.skipUnlessHasTestFile([u'wal_database.db'])
+  def testOpenWithLocalPath(self):
+    """Tests the Open function with a path on the local file system."""
+    database_file = self._GetTestFilePath([u'wal_database.db'])
+
+    database = sqlite.SQLiteDatabase(u'wal_database.db')
+    with open(database_file, u'rb') as database_file_object:
+      database.Open(database_file_object, local_path=database_file)
+
+    self.assertIn(u'MyTable', database.tables)
+    if database._SUPPORTS_IMMUTABLE:
+      self.assertEqual(database.local_path, database_file)
+    else:
+      self.assertNotEqual(database.local_path, database_file)
+
+    cursor = database.Query(u'SELECT COUNT(*) FROM MyTable')
+    self.assertEqual(cursor.fetchone()[0], 10)
+
+    database.Close()
+    self.assertEqual(database.local_path, u'')
+    self.assertTrue(os.path.exists(database_file))
+
+  @shared_test_lib.skipUnlessHasTestFile([u'wal_database.db'])
+  @shared_test_lib.skipUnlessHasTestFile([u'wal_database.db-wal'])
+  def testOpenWithLocalPathAndWAL(self):
+    """Tests the Open function with a local path and a WAL file."""
+    database_file = self._GetTestFilePath([u'wal_database.db'])
+    wal_file = self._GetTestFilePath([u'wal_database.db-wal'])
+
+    database = sqlite.SQLiteDatabase(u'wal_database.db')
+    with open(database_file, 'rb') as database_file_object:
+      with open(wal_file, 'rb') as wal_file_object:
+        database.Open(
+            database_file_object, wal_file_object=wal_file_object,
+            local_path=database_file)
+
+    self.assertNotEqual(database.local_path, database_file)
+
+    cursor = database.Query(u'SELECT COUNT(*) FROM MyTable')
+    self.assertEqual(cursor.fetchone()[0], 11)
+
+    database.Close()
+    self.assertTrue(os.path.exists(database_file))
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -79,5 +79,60 @@ class PyparsingConstantsTest(test_lib.ParserTestCase):
           u'a9', parseAll=True)
 
 
+class TestPyparsingSingleLineTextParser(
+    text_parser.PyparsingSingleLineTextParser):
+  """Single line text parser for testing."""
+
+  NAME = u'test_single_line_text'
+
+  MAX_LINE_LENGTH = 16
+
+  def ParseRecord(self, unused_parser_mediator, unused_key, unused_structure):
+    """Parses a log record structure and produces events."""
+    return
+
+  def VerifyStructure(self, unused_parser_mediator, unused_line):
+    """Verify the structure of the file."""
+    return True
+
+
+class PyparsingSingleLineTextParserTest(test_lib.ParserTestCase):
+  """Tests for the single line text parser."""
+
+  # pylint: disable=protected-access
+
+  def testGetFirstLine(self):
+    """Tests the _GetFirstLine function."""
+    parser_object = TestPyparsingSingleLineTextParser()
+
+    line = parser_object._GetFirstLine(b'first\nsecond\n', False)
+    self.assertEqual(line, u'first')
+
+    line = parser_object._GetFirstLine(b'\n\r\nfirst\n', True)
+    self.assertEqual(line, u'first')
+
+    line = parser_object._GetFirstLine(b'0123456789abcdefghij', False)
+    self.assertEqual(line, u'0123456789abcdef')
+
+    line = parser_object._GetFirstLine(b'first', False)
+    self.assertIsNone(line)
+
+    line = parser_object._GetFirstLine(b'first', True)
+    self.assertEqual(line, u'first')
+
+    line = parser_object._GetFirstLine(b'', True)
+    self.assertEqual(line, u'')
+
+  def testMatchesFileHeader(self):
+    """Tests the MatchesFileHeader function."""
+    parser_object = TestPyparsingSingleLineTextParser()
+
+    self.assertTrue(parser_object.MatchesFileHeader(b'first\n', True))
+    self.assertTrue(parser_object.MatchesFileHeader(b'first', False))
+    self.assertFalse(parser_object.MatchesFileHeader(b'', True))
+    self.assertFalse(parser_object.MatchesFileHeader(b'\n\n  \n', True))
+    self.assertFalse(parser_object.MatchesFileHeader(b'\xff\xfe\x00\n', True))
+
+
 if __name__ == u'__main__':
   unittest.main()
@@ -0,0 +1,177 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the binary serializer object implementation."""
+
+import collections
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import fake_path_spec
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.containers import event_sources
+from plaso.containers import events
+from plaso.containers import reports
+from plaso.serializer import binary_serializer
+
+from tests import test_lib as shared_test_lib
+
+
+class BinarySerializerTest(shared_test_lib.BaseTestCase):
+  """Tests for the binary serializer object."""
+
+  def testReadAndWriteSerializedAnalysisReport(self):
+    """Test ReadSerialized and WriteSerialized of AnalysisReport."""
+    expected_report_dict = {
+        u'dude': [
+            [u'Google Keep - notes and lists',
+             u'hmjkmjkepdijhoojdojkdfohbdgmmhki']
+        ],
+        u'frank': [
+            [u'YouTube', u'blpcfgokakmgnkcojhhkbfbldkacnbeo'],
+            [u'Google Play Music', u'icppfcnhkcmnfdhfhphakoifcfokfdhg']
+        ]
+    }
+
+    expected_analysis_report = reports.AnalysisReport(
+        plugin_name=u'chrome_extension_test', text=u'[\nTest report\n]')
+    expected_analysis_report.report_dict = expected_report_dict
+    expected_analysis_report.time_compiled = 1431978243000000
+
+    serialized_data = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_analysis_report))
+
+    self.assertIsNotNone(serialized_data)
+    self.assertNotIn(b'\n', serialized_data)
+
+    analysis_report = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIsNotNone(analysis_report)
+    self.assertIsInstance(analysis_report, reports.AnalysisReport)
+    self.assertEqual(analysis_report.plugin_name, u'chrome_extension_test')
+    self.assertEqual(analysis_report.report_dict, expected_report_dict)
+    self.assertEqual(analysis_report.text, u'[\nTest report\n]')
+    self.assertEqual(analysis_report.time_compiled, 1431978243000000)
+
+  @shared_test_lib.skipUnlessHasTestFile([u'ímynd.dd'])
+  def testReadAndWriteSerializedEventObject(self):
+    """Test ReadSerialized and WriteSerialized of EventObject."""
+    test_file = self._GetTestFilePath([u'ímynd.dd'])
+
+    volume_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=volume_path_spec)
+
+    expected_event_object = events.EventObject()
+
+    expected_event_object.data_type = u'test:event2'
+    expected_event_object.pathspec = path_spec
+    expected_event_object.timestamp = 1234124
+    expected_event_object.timestamp_desc = u'Written'
+    # Prevent the event object for generating its own UUID.
+    expected_event_object.uuid = u'5a78777006de4ddb8d7bbe12ab92ccf8'
+
+    expected_event_object.binary_string = b'\xc0\x90\x90binary\n\\n\r'
+    expected_event_object.counter = collections.Counter({u'test': 2})
+    expected_event_object.empty_string = u''
+    expected_event_object.zero_integer = 0
+    expected_event_object.integer = 34
+    expected_event_object.string = u'Normal string'
+    expected_event_object.unicode_string = u'And I am a unicorn.'
+    expected_event_object.my_list = [u'asf', 4234, 2, 54, u'asf']
+    expected_event_object.my_dict = {
+        u'a': u'not b', u'c': 34, u'list': [u'sf', 234], u'an': [234, 32]}
+    expected_event_object.a_tuple = (
+        u'some item', [234, 52, 15], {u'a': u'not a', u'b': u'not b'}, 35)
+    expected_event_object.null_value = None
+
+    serialized_data = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_event_object))
+
+    self.assertIsNotNone(serialized_data)
+    self.assertNotIn(b'\n', serialized_data)
+    self.assertNotIn(b'\r', serialized_data)
+
+    event_object = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIsNotNone(event_object)
+    self.assertIsInstance(event_object, events.EventObject)
+
+    expected_event_object_dict = {
+        u'a_tuple': (
+            u'some item', [234, 52, 15], {u'a': u'not a', u'b': u'not b'}, 35),
+        u'binary_string': b'\xc0\x90\x90binary\n\\n\r',
+        u'counter': collections.Counter({u'test': 2}),
+        u'data_type': u'test:event2',
+        u'empty_string': u'',
+        u'integer': 34,
+        u'my_dict': {
+            u'a': u'not b',
+            u'an': [234, 32],
+            u'c': 34,
+            u'list': [u'sf', 234]
+        },
+        u'my_list': [u'asf', 4234, 2, 54, u'asf'],
+        u'pathspec': path_spec.comparable,
+        u'string': u'Normal string',
+        u'timestamp_desc': u'Written',
+        u'timestamp': 1234124,
+        u'uuid': u'5a78777006de4ddb8d7bbe12ab92ccf8',
+        u'unicode_string': u'And I am a unicorn.',
+        u'zero_integer': 0
+    }
+
+    event_object_dict = event_object.CopyToDict()
+    path_spec = event_object_dict.get(u'pathspec', None)
+    if path_spec:
+      event_object_dict[u'pathspec'] = path_spec.comparable
+
+    self.assertEqual(
+        sorted(event_object_dict.items()),
+        sorted(expected_event_object_dict.items()))
+
+  def testReadAndWriteSerializedEventSource(self):
+    """Test ReadSerialized and WriteSerialized of EventSource."""
+    test_path_spec = fake_path_spec.FakePathSpec(location=u'/opt/plaso.txt')
+
+    expected_event_source = event_sources.EventSource(path_spec=test_path_spec)
+
+    serialized_data = (
+        binary_serializer.BinaryAttributeContainerSerializer.WriteSerialized(
+            expected_event_source))
+
+    self.assertIsNotNone(serialized_data)
+
+    event_source = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIsNotNone(event_source)
+    self.assertIsInstance(event_source, event_sources.EventSource)
+    self.assertEqual(
+        event_source.path_spec.comparable, test_path_spec.comparable)
+
+    # The path specification is interned.
+    other_event_source = (
+        binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+            serialized_data))
+
+    self.assertIs(other_event_source.path_spec, event_source.path_spec)
+
+  def testReadSerializedWithUnsupportedFormatVersion(self):
+    """Test ReadSerialized with an unsupported format version."""
+    with self.assertRaises(ValueError):
+      binary_serializer.BinaryAttributeContainerSerializer.ReadSerialized(
+          b'{"__type__": "AttributeContainer"}')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -2,9 +2,12 @@
 # -*- coding: utf-8 -*-
 """This file contains the tests for the gzip-based storage."""
 
+import gzip
 import os
 import unittest
 
+from dfvfs.path import fake_path_spec
+
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import reports
@@ -64,6 +67,14 @@ class GZIPStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+      with gzip.open(temp_file, 'rb') as file_object:
+        line = file_object.readline()
+
+      container_type, timestamp, parser_chain, _ = line.split(b'\t', 3)
+      self.assertEqual(container_type, b'event')
+      self.assertEqual(int(timestamp, 10), test_events[0].timestamp)
+      self.assertEqual(parser_chain, b'UNKNOWN')
+
   def testAddEventSource(self):
     """Tests the AddEventSource function."""
     event_source = event_sources.EventSource()
@@ -161,6 +172,71 @@ class GZIPStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+  def testGetEventsWithBinarySerializationFormat(self):
+    """Tests the GetEvents function with the binary serialization format."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = gzip_file.GZIPStorageFile(
+          serialization_format=definitions.SERIALIZER_FORMAT_BINARY)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = gzip_file.GZIPStorageFile(
+          serialization_format=definitions.SERIALIZER_FORMAT_BINARY)
+      storage_file.Open(path=temp_file)
+
+      test_events = list(storage_file.GetEvents())
+      self.assertEqual(len(test_events), 4)
+
+      storage_file.Close()
+
+  def testGetEventsWithPathSpec(self):
+    """Tests the GetEvents function with events that have a path spec."""
+    test_path_spec = fake_path_spec.FakePathSpec(location=u'/opt/plaso.txt')
+
+    test_events = self._CreateTestEvents()
+    for event in test_events:
+      event.pathspec = test_path_spec
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = gzip_file.GZIPStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      # The path specification is stored once in the path specification table.
+      with gzip.open(temp_file, 'rb') as gzip_file_object:
+        lines = gzip_file_object.read().splitlines()
+
+      path_spec_lines = [
+          line for line in lines if line.startswith(b'path_spec\t')]
+      self.assertEqual(len(path_spec_lines), 1)
+
+      storage_file = gzip_file.GZIPStorageFile()
+      storage_file.Open(path=temp_file)
+
+      test_events = list(storage_file.GetEvents())
+      self.assertEqual(len(test_events), 4)
+
+      for event in test_events:
+        self.assertEqual(event.pathspec.comparable, test_path_spec.comparable)
+        self.assertFalse(hasattr(event, u'_pathspec_identifier'))
+
+      # The decoded path specification is shared by the events.
+      self.assertIs(test_events[0].pathspec, test_events[1].pathspec)
+
+      storage_file.Close()
+
   def testGetEventSources(self):
     """Tests the GetEventSources function."""
     event_source = event_sources.EventSource()
@@ -6,6 +6,9 @@ import os
 import unittest
 import zipfile
 
+from dfvfs.path import fake_path_spec
+from dfvfs.serializer import json_serializer as dfvfs_json_serializer
+
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import reports
@@ -139,6 +142,30 @@ class SerializedDataTimestampTable(test_lib.StorageTestCase):
 
   # pylint: disable=protected-access
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetEntryIndexOfTimestamp(self):
+    """Tests the GetEntryIndexOfTimestamp function."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+    zip_file_object = zipfile.ZipFile(
+        test_file, 'r', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    stream_name = u'event_timestamps.000002'
+    timestamp_table = zip_file._SerializedDataTimestampTable(
+        zip_file_object, stream_name)
+    timestamp_table.Read()
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(0)
+    self.assertEqual(entry_index, 0)
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(1453449153000000)
+    self.assertEqual(entry_index, 0)
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(1483206872000000)
+    self.assertEqual(entry_index, 18)
+
+    entry_index = timestamp_table.GetEntryIndexOfTimestamp(1483206872000001)
+    self.assertIsNone(entry_index)
+
   @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
   def testGetTimestamp(self):
     """Tests the GetTimestamp function."""
@@ -183,6 +210,65 @@ class SerializedDataTimestampTable(test_lib.StorageTestCase):
       offset_table.Read()
 
 
+class SerializedDataTimestampSummary(test_lib.StorageTestCase):
+  """Tests for the serialized data timestamp summary object."""
+
+  # pylint: disable=protected-access
+
+  def testIsInTimeRange(self):
+    """Tests the IsInTimeRange function."""
+    timestamp_summary = zip_file._SerializedDataTimestampSummary(
+        None, u'event_timestamps_summary.000001')
+    timestamp_summary.first_timestamp = 1453449153000000
+    timestamp_summary.last_timestamp = 1483206872000000
+
+    test_time_range = time_range.TimeRange(
+        1453449153000000, 1453449153000000)
+    self.assertTrue(timestamp_summary.IsInTimeRange(test_time_range))
+
+    test_time_range = time_range.TimeRange(0, 1453449152999999)
+    self.assertFalse(timestamp_summary.IsInTimeRange(test_time_range))
+
+    test_time_range = time_range.TimeRange(
+        1483206872000001, 1583206872000000)
+    self.assertFalse(timestamp_summary.IsInTimeRange(test_time_range))
+
+  def testReadAndWrite(self):
+    """Tests the Read and Write functions."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.zip')
+      zip_file_object = zipfile.ZipFile(
+          temp_file, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+      stream_name = u'event_timestamps_summary.000001'
+      timestamp_summary = zip_file._SerializedDataTimestampSummary(
+          zip_file_object, stream_name)
+      timestamp_summary.first_timestamp = 1453449153000000
+      timestamp_summary.last_timestamp = 1483206872000000
+      timestamp_summary.Write()
+
+      zip_file_object.close()
+
+      zip_file_object = zipfile.ZipFile(
+          temp_file, 'r', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+      timestamp_summary = zip_file._SerializedDataTimestampSummary(
+          zip_file_object, stream_name)
+      timestamp_summary.Read()
+
+      self.assertEqual(timestamp_summary.first_timestamp, 1453449153000000)
+      self.assertEqual(timestamp_summary.last_timestamp, 1483206872000000)
+
+      stream_name = u'bogus'
+      timestamp_summary = zip_file._SerializedDataTimestampSummary(
+          zip_file_object, stream_name)
+
+      with self.assertRaises(IOError):
+        timestamp_summary.Read()
+
+      zip_file_object.close()
+
+
 class ZIPStorageFileTest(test_lib.StorageTestCase):
   """Tests for the ZIP-based storage file object."""
 
@@ -350,6 +436,37 @@ class ZIPStorageFileTest(test_lib.StorageTestCase):
 
     storage_file.Close()
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetEventEntryIndexInTimeRange(self):
+    """Tests the _GetEventEntryIndexInTimeRange function."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+    storage_file = zip_file.ZIPStorageFile()
+    storage_file.Open(path=test_file)
+
+    test_time_range = time_range.TimeRange(0, 1483206872000000)
+    entry_index = storage_file._GetEventEntryIndexInTimeRange(
+        2, test_time_range)
+    self.assertEqual(entry_index, 0)
+
+    test_time_range = time_range.TimeRange(
+        1483206872000000, 1583206872000000)
+    entry_index = storage_file._GetEventEntryIndexInTimeRange(
+        2, test_time_range)
+    self.assertEqual(entry_index, 18)
+
+    test_time_range = time_range.TimeRange(
+        1483206872000001, 1583206872000000)
+    entry_index = storage_file._GetEventEntryIndexInTimeRange(
+        2, test_time_range)
+    self.assertIsNone(entry_index)
+
+    test_time_range = time_range.TimeRange(0, 1453449152999999)
+    entry_index = storage_file._GetEventEntryIndexInTimeRange(
+        2, test_time_range)
+    self.assertIsNone(entry_index)
+
+    storage_file.Close()
+
   @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
   def testGetEventSource(self):
     """Tests the _GetEventSource function."""
@@ -588,6 +705,39 @@ class ZIPStorageFileTest(test_lib.StorageTestCase):
 
     storage_file.Close()
 
+  def testGetSerializedEventTimestampSummary(self):
+    """Tests the _GetSerializedEventTimestampSummary function."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file)
+
+      timestamp_summary = storage_file._GetSerializedEventTimestampSummary(1)
+      self.assertIsNotNone(timestamp_summary)
+
+      expected_timestamp = timelib.Timestamp.CopyFromString(
+          u'2009-04-05 12:27:39')
+      self.assertEqual(timestamp_summary.first_timestamp, expected_timestamp)
+
+      expected_timestamp = timelib.Timestamp.CopyFromString(
+          u'2012-05-02 13:43:26.929596')
+      self.assertEqual(timestamp_summary.last_timestamp, expected_timestamp)
+
+      timestamp_summary = storage_file._GetSerializedEventTimestampSummary(99)
+      self.assertIsNone(timestamp_summary)
+
+      storage_file.Close()
+
   @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
   def testGetSerializedEventTimestampTable(self):
     """Tests the _GetSerializedEventTimestampTable function."""
@@ -948,6 +1098,95 @@ class ZIPStorageFileTest(test_lib.StorageTestCase):
 
     # TODO: add test for exceeding buffer limit in AddEvent.
 
+  def testAddEventWithPathSpec(self):
+    """Tests the AddEvent function with events that have a path spec."""
+    test_path_spec = fake_path_spec.FakePathSpec(location=u'/opt/plaso.txt')
+
+    test_events = self._CreateTestEvents()
+    for event in test_events:
+      event.pathspec = test_path_spec
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      # The path specification of the event is restored after serialization.
+      self.assertEqual(test_events[0].pathspec, test_path_spec)
+
+      storage_file.Close()
+
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file)
+
+      self.assertTrue(storage_file._HasStream(u'path_spec_data.000001'))
+
+      events = list(storage_file.GetEvents())
+      self.assertEqual(len(events), 4)
+
+      for event in events:
+        self.assertEqual(event.pathspec.comparable, test_path_spec.comparable)
+
+      storage_file.Close()
+
+  def testAddSerializedEvent(self):
+    """Tests the AddSerializedEvent function."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        event_data = storage_file._SerializeAttributeContainer(event)
+        storage_file.AddSerializedEvent(event.timestamp, event_data)
+
+      storage_file.Close()
+
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file)
+
+      timestamps = [event.timestamp for event in storage_file.GetEvents()]
+      self.assertEqual(timestamps, sorted(
+          event.timestamp for event in test_events))
+
+      storage_file.Close()
+
+  def testAddSerializedPathSpec(self):
+    """Tests the AddSerializedPathSpec function."""
+    test_path_spec = fake_path_spec.FakePathSpec(location=u'/opt/plaso.txt')
+    path_spec_data = (
+        dfvfs_json_serializer.JsonPathSpecSerializer.WriteSerialized(
+            test_path_spec)).encode(u'utf-8')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, u'storage.plaso')
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      path_spec_identifier = storage_file._GetPathSpecIdentifier(
+          test_path_spec)
+
+      storage_file.AddSerializedPathSpec(path_spec_identifier, path_spec_data)
+      storage_file.AddSerializedPathSpec(path_spec_identifier, path_spec_data)
+
+      self.assertEqual(
+          storage_file._path_specs_list.number_of_attribute_containers, 1)
+
+      storage_file.Close()
+
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=temp_file)
+
+      path_spec = storage_file._ReadPathSpec(path_spec_identifier)
+      self.assertEqual(path_spec.comparable, test_path_spec.comparable)
+
+      storage_file.Close()
+
   def testAddEventSource(self):
     """Tests the AddEventSource function."""
     event_source = event_sources.EventSource()
@@ -1045,6 +1284,38 @@ class ZIPStorageFileTest(test_lib.StorageTestCase):
 
     storage_file.Close()
 
+  @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
+  def testGetEventTimeRanges(self):
+    """Tests the GetEventTimeRanges function."""
+    test_file = self._GetTestFilePath([u'psort_test.json.plaso'])
+    storage_file = zip_file.ZIPStorageFile()
+    storage_file.Open(path=test_file)
+
+    time_ranges = storage_file.GetEventTimeRanges(4)
+    self.assertIsNotNone(time_ranges)
+    self.assertGreaterEqual(len(time_ranges), 1)
+    self.assertLessEqual(len(time_ranges), 4)
+
+    # The time ranges are consecutive.
+    for time_range_index in range(1, len(time_ranges)):
+      self.assertEqual(
+          time_ranges[time_range_index].start_timestamp,
+          time_ranges[time_range_index - 1].end_timestamp + 1)
+
+    storage_file.Close()
+
+    # The time ranges contain all the events. The storage file is opened per
+    # time range, the same way as the export processes do.
+    number_of_events = 0
+    for time_range in time_ranges:
+      storage_file = zip_file.ZIPStorageFile()
+      storage_file.Open(path=test_file)
+      number_of_events += len(list(storage_file.GetEvents(
+          time_range=time_range)))
+      storage_file.Close()
+
+    self.assertEqual(number_of_events, 38)
+
   @shared_test_lib.skipUnlessHasTestFile([u'psort_test.json.plaso'])
   @shared_test_lib.skipUnlessHasTestFile([u'pinfo_test.json.plaso'])
   def testGetEvents(self):
@@ -1647,6 +1918,8 @@ class ZIPStorageFileWriterTest(test_lib.StorageTestCase):
       self.assertTrue(fully_merged)
 
       self.assertEqual(session_storage_writer.number_of_events, 4)
+      self.assertEqual(session.parsers_counter[u'total'], 4)
+      self.assertEqual(session.parsers_counter[u'UNKNOWN'], 4)
 
       merge_ready = session_storage_writer.CheckTaskReadyForMerge(task)
       self.assertFalse(merge_ready)
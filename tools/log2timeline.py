@@ -525,7 +525,8 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         preferred_year=self._preferred_year)
 
     storage_writer = self._front_end.CreateStorageWriter(
-        session, self._output)
+        session, self._output,
+        serialization_format=self._storage_serializer_format)
     # TODO: handle errors.BadConfigOption
 
     processing_status = self._front_end.ProcessSources(
@@ -536,6 +537,7 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         number_of_extraction_workers=self._number_of_extraction_workers,
         process_archives=self._process_archives,
         process_compressed_streams=self._process_compressed_streams,
+        reuse_hashes=self._reuse_hashes,
         single_process_mode=self._single_process_mode,
         status_update_callback=status_update_callback,
         timezone=self._timezone, yara_rules_string=self._yara_rules_string)
@@ -74,6 +74,7 @@ class PsortTool(analysis_tool.AnalysisTool):
     self._event_filter_expression = None
     self._front_end = psort.PsortFrontend()
     self._number_of_analysis_reports = 0
+    self._number_of_export_processes = 0
     self._options = None
     self._output_filename = None
     self._output_format = None
@@ -249,10 +250,19 @@ class PsortTool(analysis_tool.AnalysisTool):
 
     Args:
       options (argparse.Namespace): command line arguments.
+
+    Raises:
+      BadConfigOption: if the options are invalid.
     """
     use_zeromq = getattr(options, u'use_zeromq', True)
     self._front_end.SetUseZeroMQ(use_zeromq)
 
+    self._number_of_export_processes = getattr(
+        options, u'export_processes', 0)
+    if self._number_of_export_processes < 0:
+      raise errors.BadConfigOption(
+          u'Invalid number of export processes value cannot be negative.')
+
   def _PrintAnalysisReportsDetails(self, storage):
     """Prints the details of the analysis reports.
 
@@ -447,6 +457,15 @@ class PsortTool(analysis_tool.AnalysisTool):
             u'Disable queueing using ZeroMQ. A Multiprocessing queue will be '
             u'used instead.'))
 
+    argument_group.add_argument(
+        u'--export_processes', u'--export-processes', dest=u'export_processes',
+        action=u'store', type=int, default=0, help=(
+            u'The number of processes used to export events in parallel. '
+            u'Only supported by output formats that write an event per line '
+            u'and not in combination with a time slice or a filter limit '
+            u'[defaults to 0, which represents exporting without export '
+            u'processes].'))
+
   def ListAnalysisPlugins(self):
     """Lists the analysis modules."""
     analysis_plugin_info = self._front_end.GetAnalysisPluginInfo()
@@ -805,7 +824,9 @@ class PsortTool(analysis_tool.AnalysisTool):
       events_counter = self._front_end.ExportEvents(
           storage_reader, output_module,
           deduplicate_events=self._deduplicate_events,
+          number_of_export_processes=self._number_of_export_processes,
           status_update_callback=status_update_callback,
+          storage_file_path=self._storage_file_path,
           time_slice=self._time_slice, use_time_slicer=self._use_time_slicer)
 
       counter += events_counter
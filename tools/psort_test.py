@@ -241,7 +241,8 @@ class PsortToolTest(cli_test_lib.CLIToolTestCase):
       u''])
 
   _EXPECTED_PROCESSING_OPTIONS = u'\n'.join([
-      u'usage: psort_test.py [--disable_zeromq]',
+      (u'usage: psort_test.py [--disable_zeromq] '
+       u'[--export_processes EXPORT_PROCESSES]'),
       u'',
       u'Test argument parser.',
       u'',
@@ -250,6 +251,18 @@ class PsortToolTest(cli_test_lib.CLIToolTestCase):
       (u'                        Disable queueing using ZeroMQ. A '
        u'Multiprocessing queue'),
       u'                        will be used instead.',
+      (u'  --export_processes EXPORT_PROCESSES, --export-processes '
+       u'EXPORT_PROCESSES'),
+      (u'                        The number of processes used to export '
+       u'events in'),
+      (u'                        parallel. Only supported by output formats '
+       u'that write'),
+      (u'                        an event per line and not in combination '
+       u'with a time'),
+      (u'                        slice or a filter limit [defaults to 0, '
+       u'which'),
+      (u'                        represents exporting without export '
+       u'processes].'),
       u''])
 
   # TODO: add test for _FormatStatusTableRow.